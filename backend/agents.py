@@ -1,9 +1,15 @@
-from typing import Optional
+from typing import Callable, Optional
 from langchain_core.messages import SystemMessage, HumanMessage
 from backend.models import InterviewState, Evaluation
-from backend.llm import question_llm, evaluation_with_feedback_llm, hint_llm, closing_llm, transition_llm
+from backend.llm import (
+    question_llm, evaluation_with_feedback_llm, hint_llm, closing_llm, transition_llm, fused_turn_llm,
+)
+from backend.degrade import degradation
+from backend.stopping import question_limit, should_stop
+from backend.prescreen import UNANSWERED_TOPIC
 from backend.config import (
     MAX_QUESTIONS,
+    ADAPTIVE_STOPPING,
     WEAK_ANSWER_THRESHOLD,
     STRONG_ANSWER_THRESHOLD,
     SCORE_EXCELLENT,
@@ -17,6 +23,97 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Shared by the question prompt and the fused-turn prompt
+QUESTION_GUIDELINES = (
+    "Question Types (Vary question types across the interview):\n"
+    "1. BEHAVIORAL: Ask about past experiences, decisions, conflicts, or lessons learned (e.g., 'Tell me about a time when...')\n"
+    "2. TECHNICAL CONCEPT: Ask about fundamental concepts, principles, or theory (e.g., 'What is...', 'Explain...')\n"
+    "3. PROBLEM-SOLVING: Ask how to approach a challenge, design system, or solve a problem (e.g., 'How would you...')\n"
+    "4. SCENARIO-BASED: Present a real-world situation and ask how they'd handle it (e.g., 'If you were...')\n"
+    "5. DEEP-DIVE: Dig deeper into previously mentioned topics (e.g., 'Why did you choose...', 'What were the trade-offs...')\n"
+    "6. BEST PRACTICES: Ask about standards, conventions, or methodologies (e.g., 'What are best practices for...')\n"
+    "7. EXPERIENCE-FOCUSED: Ask about their hands-on experience and projects (e.g., 'What's the most complex...', 'Describe a project where...')\n\n"
+    "Rules:\n"
+    "- Ask only ONE thing.\n"
+    "- Use at most ONE interrogative word (what OR why OR how OR tell OR explain OR describe).\n"
+    "- Do NOT combine multiple sub-questions.\n"
+    "- Do NOT use conjunctions like 'and', 'also', 'as well as', 'furthermore'.\n"
+    "- Do NOT ask for definitions and examples in the same question.\n"
+    "- Do NOT ask follow-up parts in the same turn.\n"
+    "- Make questions conversational and engaging, not robotic.\n"
+    "- Avoid overly technical jargon unless appropriate for the role.\n"
+    "- Vary sentence structure and question styles.\n\n"
+    "Adaptation:\n"
+    "- Use 'Role Description' to tailor domain, stack, and context.\n"
+    "- If difficulty is 'easy': Focus on fundamentals and foundational concepts.\n"
+    "- If difficulty is 'hard': Push on edge cases, optimization, system design, trade-offs, and advanced concepts.\n"
+    "- Avoid topics in 'Weak Topics' or address them from a different angle to help improvement.\n"
+    "- Build on previously asked questions without repetition - ask about different topics.\n"
+    "- Vary question types throughout the interview - don't ask similar types consecutively.\n"
+    "- Mix behavioral, technical, and scenario-based questions.\n\n"
+)
+
+# Shared by the evaluation prompt and the fused-turn prompt
+EVALUATION_GUIDELINES = (
+    "PART 1: EVALUATION\n"
+    "Assessment Dimensions:\n"
+    "1. CORRECTNESS: Is the core concept/answer right?\n"
+    "2. CLARITY: Is it well-explained and easy to follow?\n"
+    "3. DEPTH: Does it show genuine understanding or go beyond basics?\n\n"
+    "Scoring Bands (0–10):\n"
+    "0–2: Incorrect or irrelevant. Fundamental misunderstandings.\n"
+    "3–4: Very weak. Vague, shallow, or mostly incorrect.\n"
+    "5–6: Basic. Core idea correct but shallow or incomplete.\n"
+    "7–8: Strong. Correct, clear, structured, with relevant examples.\n"
+    "9–10: Excellent. Fully correct, well-structured, examples, nuances, and insightful.\n\n"
+    "Scoring Rules:\n"
+    "- Do NOT average scores. Choose the closest single band.\n"
+    "- Do NOT give 7+ without at least one concrete example or applied reasoning.\n"
+    "- Do NOT give 9–10 unless explanation is complete, nuanced, and demonstrates deep understanding.\n"
+    "- Consider if answer is practical and applicable to real-world scenarios.\n\n"
+    "Instructions:\n"
+    "1. Identify the primary topic of the question.\n"
+    "2. List 2-3 concrete strengths (what was done well).\n"
+    "3. List 2-3 concrete weaknesses (what needs improvement).\n\n"
+    "PART 2: FEEDBACK\n"
+    "Generate professional, constructive interview feedback.\n\n"
+    "Your Role:\n"
+    "You are a seasoned technical interviewer providing honest, direct feedback.\n"
+    "Be encouraging but truthful - do not sugarcoat weak performance.\n"
+    "Be specific and actionable.\n\n"
+    "Guidelines:\n"
+    "1. Start with what went WELL (strengths).\n"
+    "2. Address areas for IMPROVEMENT (weaknesses) constructively.\n"
+    "3. Do NOT provide full model answers or solutions.\n"
+    "4. Do NOT repeat the numeric score.\n"
+    "5. Suggest direction for improvement (e.g., 'Consider exploring X concept').\n"
+    "6. Keep tone professional, supportive, and respectful.\n"
+    "7. If score is low, acknowledge it directly but encourage learning.\n\n"
+    "Tone:\n"
+    "- Be honest: If answer was weak, say so.\n"
+    "- Be helpful: Give direction without spoiling the learning.\n"
+    "- Be professional: Sound like a real interviewer, not a machine.\n\n"
+)
+
+# Compact rubric used instead of the full prompt when the model server is overloaded
+SHORT_EVALUATION_PROMPT = (
+    "Score the candidate's answer 0-10 for correctness, clarity and depth "
+    "(0-2 wrong, 3-4 weak, 5-6 basic, 7-8 strong with examples, 9-10 excellent and nuanced). "
+    "Name the question's topic, 2 strengths, 2 weaknesses, and 2-3 sentences of direct, "
+    "constructive feedback without repeating the score or giving the full answer.\n"
+    'Return JSON only: {"score": number, "topic": string, "feedback": string, '
+    '"strengths": [string], "weaknesses": [string]}'
+)
+
+# Spoken closings by verdict when closing generation is shed
+CANNED_CLOSINGS = {
+    "Excellent performance": "Excellent work today. Thank you for your time, and keep building on these strengths.",
+    "Good performance": "Good job today. Thank you for your time; your summary shows where to push further.",
+    "Satisfactory performance": "Thank you for your time. You have a solid base; the summary highlights what to strengthen next.",
+    "Needs improvement": "Thank you for your time. Review the areas for improvement in your summary and keep practising.",
+    "Significant gaps identified": "Thank you for your time. Focus on the fundamentals listed in your summary and try again soon.",
+}
+
 
 def ask_question_agent(state: InterviewState):
     """
@@ -26,7 +123,7 @@ def ask_question_agent(state: InterviewState):
     and previously asked questions to produce
     exactly one professional interview question.
     """
-    weak_topics = ", ".join(state["weak_topics"]) if state["weak_topics"] else "None"
+    weak_topics = ", ".join(sorted(state["weak_topics"])) if state["weak_topics"] else "None"
     prev_qs = "\n".join(f"- {q}" for q in state["asked_questions"]) or "None"
     role_desc = state.get("role_description") or ""
     question_count = state.get("question_count", 0)
@@ -39,33 +136,8 @@ def ask_question_agent(state: InterviewState):
                 "You are an experienced technical interviewer.\n"
                 "Ask questions relevant to the role, experience level, and the provided role description.\n"
                 "Sound natural, not scripted. Focus on real-world competency.\n\n"
-                "Question Types (Vary question types across the interview):\n"
-                "1. BEHAVIORAL: Ask about past experiences, decisions, conflicts, or lessons learned (e.g., 'Tell me about a time when...')\n"
-                "2. TECHNICAL CONCEPT: Ask about fundamental concepts, principles, or theory (e.g., 'What is...', 'Explain...')\n"
-                "3. PROBLEM-SOLVING: Ask how to approach a challenge, design system, or solve a problem (e.g., 'How would you...')\n"
-                "4. SCENARIO-BASED: Present a real-world situation and ask how they'd handle it (e.g., 'If you were...')\n"
-                "5. DEEP-DIVE: Dig deeper into previously mentioned topics (e.g., 'Why did you choose...', 'What were the trade-offs...')\n"
-                "6. BEST PRACTICES: Ask about standards, conventions, or methodologies (e.g., 'What are best practices for...')\n"
-                "7. EXPERIENCE-FOCUSED: Ask about their hands-on experience and projects (e.g., 'What's the most complex...', 'Describe a project where...')\n\n"
-                "Rules:\n"
-                "- Ask only ONE thing.\n"
-                "- Use at most ONE interrogative word (what OR why OR how OR tell OR explain OR describe).\n"
-                "- Do NOT combine multiple sub-questions.\n"
-                "- Do NOT use conjunctions like 'and', 'also', 'as well as', 'furthermore'.\n"
-                "- Do NOT ask for definitions and examples in the same question.\n"
-                "- Do NOT ask follow-up parts in the same turn.\n"
-                "- Make questions conversational and engaging, not robotic.\n"
-                "- Avoid overly technical jargon unless appropriate for the role.\n"
-                "- Vary sentence structure and question styles.\n\n"
-                "Adaptation:\n"
-                "- Use 'Role Description' to tailor domain, stack, and context.\n"
-                "- If difficulty is 'easy': Focus on fundamentals and foundational concepts.\n"
-                "- If difficulty is 'hard': Push on edge cases, optimization, system design, trade-offs, and advanced concepts.\n"
-                "- Avoid topics in 'Weak Topics' or address them from a different angle to help improvement.\n"
-                "- Build on previously asked questions without repetition - ask about different topics.\n"
-                "- Vary question types throughout the interview - don't ask similar types consecutively.\n"
-                "- Mix behavioral, technical, and scenario-based questions.\n\n"
-                'Return JSON only using the schema: {"question": "string"}'
+                + QUESTION_GUIDELINES
+                + 'Return JSON only using the schema: {"question": "string"}'
             )
         ),
         HumanMessage(
@@ -73,7 +145,7 @@ def ask_question_agent(state: InterviewState):
 Role: {state["role"]}
 Experience: {state["experience"]}
 Difficulty: {state["difficulty"]}
-Question Number: {question_count + 1} of 5
+Question Number: {question_count + 1} of {question_limit()}
 Weak Topics: {weak_topics}
 
 Role Description:
@@ -89,69 +161,97 @@ Vary the question type for better interview quality.
     ])
 
 
-def evaluate_with_feedback_agent(state: InterviewState):
+def evaluate_with_feedback_agent(state: InterviewState, on_text: Optional[Callable[[str], None]] = None):
     """
     Evaluate the candidate's answer AND generate feedback in a single LLM call.
     
     Assess correctness, clarity, depth, and provide professional feedback.
     This reduces two separate LLM calls into one optimized call.
+    With `on_text`, the raw reply is streamed to it as it is generated.
+    """
+    if degradation.sheds("short_evaluation"):
+        system_prompt = SHORT_EVALUATION_PROMPT
+    else:
+        system_prompt = (
+            "Evaluate the candidate's answer and provide professional feedback in one response.\n\n"
+            + EVALUATION_GUIDELINES
+            + 'Return JSON only using the schema: '
+            '{"score": number, "topic": string, "feedback": string, '
+            '"strengths": [string], "weaknesses": [string]}'
+        )
+
+    messages = [
+        SystemMessage(content=system_prompt),
+        HumanMessage(
+            content=f"""
+Question:
+{state["current_question"]}
+
+Candidate Answer:
+{state["last_answer_text"]}
+"""
+        )
+    ]
+    if on_text:
+        return evaluation_with_feedback_llm.invoke_streaming(messages, on_text)
+    return evaluation_with_feedback_llm.invoke(messages)
+
+
+def fused_turn_agent(state: InterviewState):
+    """
+    Evaluate the answer, give feedback, and produce the transition and next
+    question in a single LLM call (fused-turn mode).
+
+    The difficulty and weak-topic rules of `decision_agent` are stated as
+    conditional guidance on the model's own score; the caller re-checks them
+    locally and regenerates the question when the model got them wrong.
     """
-    return evaluation_with_feedback_llm.invoke([
+    weak_topics = ", ".join(sorted(state["weak_topics"])) if state["weak_topics"] else "None"
+    prev_qs = "\n".join(f"- {q}" for q in state["asked_questions"]) or "None"
+    role_desc = state.get("role_description") or ""
+    question_count = state.get("question_count", 0)
+
+    return fused_turn_llm.invoke([
         SystemMessage(
             content=(
-                "Evaluate the candidate's answer and provide professional feedback in one response.\n\n"
-                
-                "PART 1: EVALUATION\n"
-                "Assessment Dimensions:\n"
-                "1. CORRECTNESS: Is the core concept/answer right?\n"
-                "2. CLARITY: Is it well-explained and easy to follow?\n"
-                "3. DEPTH: Does it show genuine understanding or go beyond basics?\n\n"
-
-                "Scoring Bands (0–10):\n"
-                "0–2: Incorrect or irrelevant. Fundamental misunderstandings.\n"
-                "3–4: Very weak. Vague, shallow, or mostly incorrect.\n"
-                "5–6: Basic. Core idea correct but shallow or incomplete.\n"
-                "7–8: Strong. Correct, clear, structured, with relevant examples.\n"
-                "9–10: Excellent. Fully correct, well-structured, examples, nuances, and insightful.\n\n"
-
-                "Scoring Rules:\n"
-                "- Do NOT average scores. Choose the closest single band.\n"
-                "- Do NOT give 7+ without at least one concrete example or applied reasoning.\n"
-                "- Do NOT give 9–10 unless explanation is complete, nuanced, and demonstrates deep understanding.\n"
-                "- Consider if answer is practical and applicable to real-world scenarios.\n\n"
-
-                "Instructions:\n"
-                "1. Identify the primary topic of the question.\n"
-                "2. List 2-3 concrete strengths (what was done well).\n"
-                "3. List 2-3 concrete weaknesses (what needs improvement).\n\n"
-                
-                "PART 2: FEEDBACK\n"
-                "Generate professional, constructive interview feedback.\n\n"
-                "Your Role:\n"
-                "You are a seasoned technical interviewer providing honest, direct feedback.\n"
-                "Be encouraging but truthful - do not sugarcoat weak performance.\n"
-                "Be specific and actionable.\n\n"
-                "Guidelines:\n"
-                "1. Start with what went WELL (strengths).\n"
-                "2. Address areas for IMPROVEMENT (weaknesses) constructively.\n"
-                "3. Do NOT provide full model answers or solutions.\n"
-                "4. Do NOT repeat the numeric score.\n"
-                "5. Suggest direction for improvement (e.g., 'Consider exploring X concept').\n"
-                "6. Keep tone professional, supportive, and respectful.\n"
-                "7. If score is low, acknowledge it directly but encourage learning.\n\n"
-                "Tone:\n"
-                "- Be honest: If answer was weak, say so.\n"
-                "- Be helpful: Give direction without spoiling the learning.\n"
-                "- Be professional: Sound like a real interviewer, not a machine.\n\n"
-                
-                'Return JSON only using the schema: '
-                '{"score": number, "topic": string, '
-                '"strengths": [string], "weaknesses": [string], "feedback": string}'
+                "You are an experienced technical interviewer running one turn of an interview.\n"
+                "In one response: evaluate the candidate's answer, give feedback, say a short spoken "
+                "transition, and ask the next question.\n\n"
+                + EVALUATION_GUIDELINES
+                + "PART 3: NEXT DIFFICULTY\n"
+                "Decide from the score you gave in PART 1:\n"
+                f"- Score below {WEAK_ANSWER_THRESHOLD}: next_difficulty is 'easy'. The question's topic becomes "
+                "a weak topic: do not ask about it directly again.\n"
+                f"- Score {STRONG_ANSWER_THRESHOLD} or higher: next_difficulty is 'hard'.\n"
+                "- Otherwise: keep the current difficulty.\n\n"
+                "PART 4: TRANSITION\n"
+                "One short spoken sentence leading into the next question. "
+                "No feedback or advice, and no question.\n\n"
+                "PART 5: NEXT QUESTION\n"
+                "Ask exactly ONE professional interview question at next_difficulty, "
+                "relevant to the role, experience level and role description.\n\n"
+                + QUESTION_GUIDELINES
+                + 'Return JSON only using the schema: '
+                '{"score": number, "topic": string, "strengths": [string], "weaknesses": [string], '
+                '"feedback": string, "next_difficulty": "easy" | "hard", "transition": string, '
+                '"next_question": string}'
             )
         ),
         HumanMessage(
             content=f"""
-Question:
+Role: {state["role"]}
+Experience: {state["experience"]}
+Current Difficulty: {state["difficulty"]}
+Next Question Number: {question_count + 2} of {question_limit()}
+Weak Topics: {weak_topics}
+
+Role Description:
+{role_desc}
+
+Previously asked questions (AVOID REPEATING THESE TOPICS):
+{prev_qs}
+
+Current Question:
 {state["current_question"]}
 
 Candidate Answer:
@@ -240,10 +340,11 @@ def decision_agent(state: InterviewState, evaluation: Evaluation):
 
     # Adaptive difficulty based on performance
     if evaluation.score < WEAK_ANSWER_THRESHOLD:
-        # Weak answer - go easier, track topic as weak
+        # Weak answer - go easier, track topic as weak (a pre-screened non-answer has no real topic)
         difficulty = DIFFICULTY_EASY
-        add_weak = True
-        logger.info(f"Low score ({evaluation.score}), marking '{evaluation.topic}' as weak topic and going easier")
+        add_weak = evaluation.topic != UNANSWERED_TOPIC
+        logger.info(f"Low score ({evaluation.score}), going easier" +
+                    (f", marking '{evaluation.topic}' as weak topic" if add_weak else ""))
     elif evaluation.score >= STRONG_ANSWER_THRESHOLD:
         # Strong answer - increase challenge
         difficulty = DIFFICULTY_HARD
@@ -252,8 +353,14 @@ def decision_agent(state: InterviewState, evaluation: Evaluation):
         # Adequate answer - maintain current difficulty
         logger.info(f"Adequate score ({evaluation.score}), maintaining difficulty")
 
-    # End after MAX_QUESTIONS (check >= MAX_QUESTIONS-1 because count increments after this check)
-    end_interview = state["question_count"] >= MAX_QUESTIONS - 1
+    if ADAPTIVE_STOPPING:
+        # End as soon as the verdict band is settled (within the min/max question range)
+        end_interview = should_stop(state["score_history"])
+        if end_interview and len(state["score_history"]) < question_limit():
+            logger.info(f"Verdict settled after {len(state['score_history'])} answers, ending early")
+    else:
+        # End after MAX_QUESTIONS (check >= MAX_QUESTIONS-1 because count increments after this check)
+        end_interview = state["question_count"] >= MAX_QUESTIONS - 1
 
     return {
         "difficulty": difficulty,
@@ -262,7 +369,7 @@ def decision_agent(state: InterviewState, evaluation: Evaluation):
     }
 
 
-def end_interview_agent(state: InterviewState):
+def end_interview_agent(state: InterviewState, on_closing_text: Optional[Callable[[str], None]] = None):
     """
     Generate interview closing with structured feedback for the results page.
 
@@ -271,6 +378,7 @@ def end_interview_agent(state: InterviewState):
     - average_score, weak_topics, verdict
     - what_went_well: list[str] - aggregated from all answers
     - areas_for_improvement: list[str] - aggregated from all answers
+    With `on_closing_text`, the closing call's raw reply is streamed to it.
     """
 
     # Compute average score and verdict
@@ -280,7 +388,10 @@ def end_interview_agent(state: InterviewState):
         else 0.0
     )
 
-    if avg >= SCORE_EXCELLENT:
+    if not state.get("score_history"):
+        # Ended before any answer was evaluated
+        verdict = "Interview ended before any answers were evaluated"
+    elif avg >= SCORE_EXCELLENT:
         verdict = "Excellent performance"
     elif avg >= SCORE_GOOD:
         verdict = "Good performance"
@@ -330,7 +441,9 @@ def end_interview_agent(state: InterviewState):
         all_weaknesses = unique_weaknesses[:3]
 
     # If we have meaningful feedback, use it; otherwise generate contextual defaults
-    if not all_strengths:
+    if not state.get("score_history"):
+        all_weaknesses = all_weaknesses or ["Answer at least one question to receive personalised feedback"]
+    elif not all_strengths:
         if avg >= SCORE_GOOD:
             all_strengths = [
                 "Demonstrated understanding of core concepts",
@@ -360,14 +473,20 @@ def end_interview_agent(state: InterviewState):
 
     summary = {
         "average_score": round(avg, 2),
-        "weak_topics": list(state.get("weak_topics") or []),
+        "weak_topics": sorted(state.get("weak_topics") or []),
         "verdict": verdict,
         "what_went_well": all_strengths[:3],
         "areas_for_improvement": all_weaknesses[:3]
     }
 
+    if degradation.sheds("canned_closing"):
+        return {
+            "summary": summary,
+            "spoken_closing": CANNED_CLOSINGS.get(verdict, "Session ended. Thank you for the interview!"),
+        }
+
     # Keep spoken closing generation for audio
-    closing = closing_llm.invoke([
+    messages = [
         SystemMessage(
             content=(
                 "Generate a concise professional closing (1–2 sentences) that reflects the verdict "
@@ -381,7 +500,11 @@ def end_interview_agent(state: InterviewState):
                 f"Weak Topics: {', '.join(summary['weak_topics']) if summary['weak_topics'] else 'None'}"
             )
         )
-    ])
+    ]
+    if on_closing_text:
+        closing = closing_llm.invoke_streaming(messages, on_closing_text)
+    else:
+        closing = closing_llm.invoke(messages)
 
     spoken = getattr(closing, "spoken_closing", None) or "Session ended. Thank you for the interview!"
 
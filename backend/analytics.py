@@ -0,0 +1,450 @@
+"""
+Columnar store of completed interviews with vectorized cohort analytics.
+
+Finished interviews are queued from the request path and appended in batches
+by a background thread to NumPy column chunks, persisted as .npz segments.
+Segments are written to a temporary file and renamed into place, and once
+there are many they are compacted into one base file. String columns (role,
+topic, ...) are dictionary-encoded so every query is a handful of array
+operations over integer and float columns.
+"""
+
+from typing import Dict, List, Optional
+from backend.config import (
+    DIFFICULTY_EASY,
+    DIFFICULTY_HARD,
+    WEAK_ANSWER_THRESHOLD,
+    STRONG_ANSWER_THRESHOLD,
+)
+from backend.topics import canonical_topic
+
+import numpy as np
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+DIFFICULTIES = [DIFFICULTY_EASY, DIFFICULTY_HARD]
+GROUP_COLUMNS = ("role", "experience", "persona")
+
+INTERVIEW_COLUMNS = {
+    "ts": np.float64,
+    "role": np.int32,
+    "experience": np.int32,
+    "persona": np.int32,
+    "verdict": np.int32,
+    "avg_score": np.float32,
+    "n_questions": np.int16,
+}
+TURN_COLUMNS = {
+    "interview": np.int64,
+    "turn": np.int16,
+    "score": np.float32,
+    "topic": np.int32,
+    "difficulty_from": np.int8,
+    "difficulty_to": np.int8,
+    "transition": np.int16,  # (turn * k + from) * k + to, precomputed for bincount
+}
+WEAK_TOPIC_COLUMNS = {
+    "interview": np.int64,
+    "topic": np.int32,
+}
+TABLES = (("interviews", INTERVIEW_COLUMNS), ("turns", TURN_COLUMNS), ("weak_topics", WEAK_TOPIC_COLUMNS))
+
+# base-N.npz holds every interview of segments below N; segment-N.npz one flushed batch
+_FILE_RE = re.compile(r"^(base|segment)-(\d+)\.npz$")
+
+
+class _Dictionary:
+    """Append-only string ↔ integer code mapping."""
+
+    def __init__(self, values: Optional[List[str]] = None):
+        self.values: List[str] = list(values or [])
+        self.codes: Dict[str, int] = {v: i for i, v in enumerate(self.values)}
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value: str) -> Optional[int]:
+        return self.codes.get(value)
+
+
+class _Table:
+    """Columns stored as lists of chunks, concatenated lazily for queries."""
+
+    def __init__(self, columns: Dict[str, type]):
+        self.columns = columns
+        self._chunks: Dict[str, List[np.ndarray]] = {name: [] for name in columns}
+        self._view: Optional[Dict[str, np.ndarray]] = None
+        self.rows = 0
+
+    def extend(self, data: Dict[str, np.ndarray]):
+        n = len(next(iter(data.values())))
+        if n == 0:
+            return
+        for name, dtype in self.columns.items():
+            self._chunks[name].append(np.asarray(data[name], dtype=dtype))
+        self.rows += n
+        self._view = None
+
+    def view(self) -> Dict[str, np.ndarray]:
+        if self._view is None:
+            self._view = {
+                name: (np.concatenate(chunks) if chunks else np.empty(0, dtype=self.columns[name]))
+                for name, chunks in self._chunks.items()
+            }
+            # Keep a single chunk so later concatenations stay cheap
+            for name, column in self._view.items():
+                self._chunks[name] = [column] if len(column) else []
+        return self._view
+
+
+def _normalize(value: Optional[str]) -> str:
+    return " ".join((value or "unknown").lower().split())
+
+
+def _difficulty_path(scores: List[float]):
+    """Replay decision_agent's difficulty rule over a score sequence."""
+    current = DIFFICULTIES.index(DIFFICULTY_EASY)
+    before, after = [], []
+    for score in scores:
+        before.append(current)
+        if score < WEAK_ANSWER_THRESHOLD:
+            current = DIFFICULTIES.index(DIFFICULTY_EASY)
+        elif score >= STRONG_ANSWER_THRESHOLD:
+            current = DIFFICULTIES.index(DIFFICULTY_HARD)
+        after.append(current)
+    return before, after
+
+
+class ResultsStore:
+    """
+    Append-only interview results store.
+
+    `record` is safe to call on the request path: it only enqueues. A
+    background writer groups records into batches, appends them to the
+    in-memory columns and persists each batch as one segment file. After
+    `compact_after` segments, everything is rewritten as one base file and
+    the segments are removed, so startup reads a bounded number of files.
+    """
+
+    def __init__(self, directory: Optional[str], flush_interval: float = 2.0, batch_size: int = 512,
+                 compact_after: int = 64):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.compact_after = compact_after
+        self.dicts = {name: _Dictionary() for name in ("role", "experience", "persona", "verdict", "topic")}
+        self.interviews = _Table(INTERVIEW_COLUMNS)
+        self.turns = _Table(TURN_COLUMNS)
+        self.weak_topics = _Table(WEAK_TOPIC_COLUMNS)
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[dict]" = queue.Queue()
+        self._next_segment = 0
+        self._segment_files: List[str] = []  # Segments written since the current base
+        self._base_file: Optional[str] = None
+        self._persisted_dicts: Dict[str, int] = {}  # Dictionary sizes in dictionaries.json
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load()
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="results-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ---------------- writes ----------------
+
+    def record(self, context: Dict, final_state: Dict):
+        """Queue a completed interview (session context + final graph state)."""
+        summary = final_state.get("summary") or {}
+        evaluations = final_state.get("evaluations_history") or []
+        self._queue.put({
+            "ts": time.time(),
+            "role": _normalize(context.get("role") or final_state.get("role")),
+            "experience": _normalize(context.get("experience") or final_state.get("experience")),
+            "persona": _normalize(context.get("persona") or final_state.get("persona")),
+            "verdict": summary.get("verdict", "unknown"),
+            "avg_score": summary.get("average_score", 0.0),
+            "scores": [float(e.score) for e in evaluations],
+            # Already canonical for new interviews; this covers states checkpointed before canonicalization
+            "topics": [_normalize(canonical_topic(e.topic)) for e in evaluations],
+            "weak_topics": sorted({_normalize(canonical_topic(t)) for t in summary.get("weak_topics", [])}),
+        })
+
+    def flush(self):
+        """Drain queued records into the columns, one segment per batch_size records."""
+        while True:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            self.ingest(batch)
+
+    def ingest(self, batch: List[dict]):
+        with self._lock:
+            base = self.interviews.rows
+            interviews = {name: [] for name in INTERVIEW_COLUMNS}
+            turns = {name: [] for name in TURN_COLUMNS}
+            weak = {name: [] for name in WEAK_TOPIC_COLUMNS}
+
+            for i, rec in enumerate(batch):
+                idx = base + i
+                interviews["ts"].append(rec["ts"])
+                for name in ("role", "experience", "persona", "verdict"):
+                    interviews[name].append(self.dicts[name].encode(rec[name]))
+                interviews["avg_score"].append(rec["avg_score"])
+                interviews["n_questions"].append(len(rec["scores"]))
+
+                before, after = _difficulty_path(rec["scores"])
+                for turn, (score, topic) in enumerate(zip(rec["scores"], rec["topics"])):
+                    turns["interview"].append(idx)
+                    turns["turn"].append(turn)
+                    turns["score"].append(score)
+                    turns["topic"].append(self.dicts["topic"].encode(topic))
+                    turns["difficulty_from"].append(before[turn])
+                    turns["difficulty_to"].append(after[turn])
+                    turns["transition"].append((turn * len(DIFFICULTIES) + before[turn]) * len(DIFFICULTIES) + after[turn])
+
+                for topic in rec["weak_topics"]:
+                    weak["interview"].append(idx)
+                    weak["topic"].append(self.dicts["topic"].encode(topic))
+
+            self.interviews.extend(interviews)
+            self.turns.extend(turns)
+            self.weak_topics.extend(weak)
+
+            if self.directory:
+                self._persist_dictionaries()
+                tables = {"interviews": interviews, "turns": turns, "weak_topics": weak}
+                name = f"segment-{self._next_segment:06d}.npz"
+                self._write_file(name, tables, base=base)
+                self._next_segment += 1
+                self._segment_files.append(name)
+                if len(self._segment_files) >= self.compact_after:
+                    self._compact()
+
+    def _persist_dictionaries(self):
+        # Dictionaries are append-only, so persisting them first keeps every segment decodable
+        sizes = {name: len(d.values) for name, d in self.dicts.items()}
+        if sizes == self._persisted_dicts:
+            return
+        dict_path = os.path.join(self.directory, "dictionaries.json")
+        with open(dict_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({name: d.values for name, d in self.dicts.items()}, f)
+        os.replace(dict_path + ".tmp", dict_path)
+        self._persisted_dicts = sizes
+
+    def _write_file(self, name: str, tables: Dict[str, dict], base: int):
+        """Write columns as one .npz, atomically: a crash leaves either no file or a complete one."""
+        arrays = {"base": np.asarray(base, dtype=np.int64)}
+        for prefix, columns in TABLES:
+            for column, dtype in columns.items():
+                arrays[f"{prefix}.{column}"] = np.asarray(tables[prefix][column], dtype=dtype)
+        path = os.path.join(self.directory, name)
+        with open(path + ".tmp", "wb") as f:
+            np.savez(f, **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+
+    def _compact(self):
+        """Rewrite all rows as base-N.npz (N = next segment number), then drop the files it replaces."""
+        tables = {"interviews": self.interviews.view(), "turns": self.turns.view(),
+                  "weak_topics": self.weak_topics.view()}
+        name = f"base-{self._next_segment:06d}.npz"
+        self._write_file(name, tables, base=0)
+        for old in self._segment_files + ([self._base_file] if self._base_file else []):
+            self._remove(old)
+        logger.info(f"Compacted {len(self._segment_files)} result segments into {name}")
+        self._segment_files = []
+        self._base_file = name
+
+    def _remove(self, name: str):
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError as e:
+            logger.warning(f"Could not remove result file {name}: {e}")
+
+    def _load(self):
+        dict_path = os.path.join(self.directory, "dictionaries.json")
+        if not os.path.exists(dict_path):
+            return
+        with open(dict_path, encoding="utf-8") as f:
+            stored = json.load(f)
+        self.dicts = {name: _Dictionary(stored.get(name)) for name in self.dicts}
+        self._persisted_dicts = {name: len(d.values) for name, d in self.dicts.items()}
+
+        files = {"base": [], "segment": []}
+        for name in os.listdir(self.directory):
+            match = _FILE_RE.match(name)
+            if match:
+                files[match.group(1)].append((int(match.group(2)), name))
+            elif name.endswith(".npz.tmp"):
+                self._remove(name)  # Left by a crash mid-write
+        bases, segments = sorted(files["base"]), sorted(files["segment"])
+        self._next_segment = max((n for n, _ in bases + segments), default=-1) + 1
+
+        # The newest readable base covers every segment numbered below it
+        covered = 0
+        for number, name in reversed(bases):
+            if self._load_file(name):
+                self._base_file, covered = name, number
+                break
+        for number, name in bases + segments:
+            if number < covered:
+                self._remove(name)  # Superseded by the base; left by a crash during compaction
+        for number, name in segments:
+            if number >= covered and self._load_file(name):
+                self._segment_files.append(name)
+        logger.info(f"Loaded {self.interviews.rows} interviews from "
+                    f"{len(self._segment_files) + bool(self._base_file)} result files")
+
+    def _load_file(self, name: str) -> bool:
+        """Append one file's rows; unreadable files are skipped (and kept) with a warning."""
+        try:
+            with np.load(os.path.join(self.directory, name)) as data:
+                tables = {prefix: {c: data[f"{prefix}.{c}"] for c in columns} for prefix, columns in TABLES}
+                base = int(data["base"]) if "base" in data.files else self.interviews.rows
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile) as e:
+            logger.warning(f"Skipping unreadable result file {name}: {e}")
+            return False
+        # Interview references are rebased, so a skipped file does not shift later ones
+        offset = self.interviews.rows - base
+        for prefix in ("turns", "weak_topics"):
+            tables[prefix]["interview"] = tables[prefix]["interview"] + offset
+        for (prefix, _), table in zip(TABLES, (self.interviews, self.turns, self.weak_topics)):
+            table.extend(tables[prefix])
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Results store flush failed: {e}")
+
+    def close(self):
+        self._stop.set()
+        self.flush()
+
+    # ---------------- queries ----------------
+
+    def _mask(self, view: Dict[str, np.ndarray], filters: Dict[str, Optional[str]]) -> np.ndarray:
+        mask = np.ones(len(view["ts"]), dtype=bool)
+        for name, value in filters.items():
+            if value is None:
+                continue
+            code = self.dicts[name].lookup(_normalize(value))
+            if code is None:
+                return np.zeros_like(mask)
+            mask &= view[name] == code
+        return mask
+
+    def score_percentiles(
+        self,
+        group_by: str = "role",
+        percentiles=(10, 25, 50, 75, 90),
+        **filters,
+    ) -> Dict[str, dict]:
+        """Average-score percentiles per role, experience or persona."""
+        if group_by not in GROUP_COLUMNS:
+            raise ValueError(f"group_by must be one of {GROUP_COLUMNS}")
+        with self._lock:
+            view = self.interviews.view()
+            # Interviews ended before any evaluated answer have no meaningful score
+            mask = self._mask(view, filters) & (view["n_questions"] > 0)
+            groups = view[group_by][mask]
+            scores = view["avg_score"][mask]
+            labels = self.dicts[group_by].values
+
+        if len(scores) == 0:
+            return {}
+        # One float sort orders by group, then score (scores are within 0..10)
+        keyed = np.sort(groups.astype(np.float64) * 16.0 + scores)
+        groups = (keyed // 16.0).astype(np.int64)
+        scores = keyed - groups * 16.0
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(groups)) + 1))
+        counts = np.diff(np.append(starts, len(groups)))
+        codes = groups[starts]
+
+        result = {labels[c]: {"count": int(n), "mean": 0.0} for c, n in zip(codes, counts)}
+        means = np.add.reduceat(scores.astype(np.float64), starts) / counts
+        for c, mean in zip(codes, means):
+            result[labels[c]]["mean"] = round(float(mean), 2)
+        for p in percentiles:
+            values = scores[starts + np.round(p / 100 * (counts - 1)).astype(np.int64)]
+            for c, v in zip(codes, values):
+                result[labels[c]][f"p{p}"] = round(float(v), 2)
+        return result
+
+    def weak_topic_frequencies(self, top: int = 20, **filters) -> List[dict]:
+        """Most frequent weak topics, as counts and share of matching interviews."""
+        with self._lock:
+            interviews = self.interviews.view()
+            weak = self.weak_topics.view()
+            mask = self._mask(interviews, filters)
+            labels = self.dicts["topic"].values
+
+        total = int(mask.sum())
+        if total == 0 or len(weak["topic"]) == 0:
+            return []
+        topics = weak["topic"][mask[weak["interview"]]]
+        counts = np.bincount(topics, minlength=len(labels))
+        best = np.argsort(counts)[::-1][:top]
+        return [
+            {"topic": labels[i], "count": int(counts[i]), "share": round(float(counts[i]) / total, 4)}
+            for i in best
+            if counts[i] > 0
+        ]
+
+    def difficulty_transitions(self, **filters) -> Dict[str, object]:
+        """Counts of difficulty moves (easy/hard → easy/hard), overall and per turn."""
+        with self._lock:
+            interviews = self.interviews.view()
+            turns = self.turns.view()
+            mask = self._mask(interviews, filters)
+
+        k = len(DIFFICULTIES)
+        codes = turns["transition"]
+        if any(v is not None for v in filters.values()):
+            codes = codes[mask[turns["interview"]]]
+
+        per_turn = np.bincount(codes, minlength=k * k)
+        per_turn = per_turn[: len(per_turn) // (k * k) * (k * k)].reshape(-1, k * k)
+        overall = per_turn.sum(axis=0)
+
+        def label(flat):
+            return {
+                f"{DIFFICULTIES[i // k]}->{DIFFICULTIES[i % k]}": int(n)
+                for i, n in enumerate(flat)
+            }
+
+        return {
+            "overall": label(overall),
+            "by_turn": [label(row) for row in per_turn],
+        }
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "interviews": self.interviews.rows,
+            "turns": self.turns.rows,
+            "queued": self._queue.qsize(),
+            "segments": len(self._segment_files),
+        }
@@ -0,0 +1,185 @@
+"""
+Cross-session micro-batching of LLM calls.
+
+When many candidates answer at once, their evaluation and question calls
+reach the model server one request each. A self-hosted server decodes a
+batch of prompts in about the time of one, so `MicroBatcher` holds calls of
+the same kind for a few milliseconds (or until the batch is full), sends
+them as one request, and hands each caller its own result.
+`CompletionsClient` is the dispatch for an OpenAI-compatible
+`/v1/completions` endpoint, which takes a list of prompts per request.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Hashable, List, Optional
+from backend.metrics import metrics
+import logging
+import threading
+import time
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class _Pending:
+    __slots__ = ("item", "future", "queued_at")
+
+    def __init__(self, item: Any):
+        self.item = item
+        self.future: Future = Future()
+        self.queued_at = time.monotonic()
+
+
+class MicroBatcher:
+    """
+    Collects concurrent calls per key and dispatches them in batches.
+
+    `dispatch(key, items)` returns one result per item, in order; an
+    Exception in the list fails only that call. A batch leaves when it has
+    `max_batch` calls or its first call has waited `window_ms`. At most
+    `max_inflight` batches run at once; while they do, new calls keep
+    joining the next batch, so batches grow with load. A call whose caller
+    has timed out is dropped if its batch has not been dispatched yet.
+    """
+
+    def __init__(self, dispatch: Callable[[Hashable, List[Any]], List[Any]], window_ms: float = 5.0,
+                 max_batch: int = 8, max_inflight: int = 2):
+        self.dispatch = dispatch
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queues: Dict[Hashable, List[_Pending]] = {}
+        self._cond = threading.Condition()
+        self._slots = threading.Semaphore(max_inflight)
+        self._executor = ThreadPoolExecutor(max_workers=max_inflight, thread_name_prefix="llm-batch")
+        threading.Thread(target=self._collect, name="llm-batch-collector", daemon=True).start()
+
+    def submit(self, key: Hashable, item: Any, timeout: Optional[float] = None) -> Any:
+        """Queue one call and block until its batch has been answered."""
+        pending = _Pending(item)
+        with self._cond:
+            self._queues.setdefault(key, []).append(pending)
+            self._cond.notify()
+        try:
+            return pending.future.result(timeout)
+        except FutureTimeout:
+            # The caller falls back to another model; don't generate the prompt twice
+            with self._cond:
+                if pending.future.cancel():
+                    queue = self._queues.get(key, [])
+                    if pending in queue:
+                        queue.remove(pending)
+                        if not queue:
+                            del self._queues[key]
+            raise
+
+    def _collect(self):
+        while True:
+            self._slots.acquire()
+            key, batch = self._next_batch()
+            self._executor.submit(self._run, key, batch)
+
+    def _next_batch(self):
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                wait = None
+                for key, queue in self._queues.items():
+                    remaining = queue[0].queued_at + self.window - now
+                    if len(queue) >= self.max_batch or remaining <= 0:
+                        batch = queue[:self.max_batch]
+                        del queue[:self.max_batch]
+                        if not queue:
+                            del self._queues[key]
+                        return key, batch
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._cond.wait(wait)
+
+    def _run(self, key: Hashable, batch: List[_Pending]):
+        started = time.monotonic()
+        # Calls that timed out after the batch left the queue
+        batch = [pending for pending in batch if pending.future.set_running_or_notify_cancel()]
+        if not batch:
+            self._slots.release()
+            return
+        try:
+            for pending in batch:
+                metrics.observe("llm.batch.queue_ms", (started - pending.queued_at) * 1000)
+            metrics.observe("llm.batch.size", len(batch))
+            metrics.incr("llm.batch.batches")
+            metrics.incr("llm.batch.calls", len(batch))
+            results = self.dispatch(key, [pending.item for pending in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"{len(results)} results for a batch of {len(batch)}")
+        except Exception as e:
+            metrics.incr("llm.batch.errors")
+            logger.warning(f"Batch of {len(batch)} failed: {e}")
+            results = [e] * len(batch)
+        finally:
+            self._slots.release()
+        for pending, result in zip(batch, results):
+            if isinstance(result, Exception):
+                pending.future.set_exception(result)
+            else:
+                pending.future.set_result(result)
+
+    def stats(self) -> Dict[str, object]:
+        batches = metrics.counter("llm.batch.batches")
+        return {
+            "batches": batches,
+            "calls": metrics.counter("llm.batch.calls"),
+            "mean_size": round(metrics.counter("llm.batch.calls") / batches, 2) if batches else 0.0,
+            "errors": metrics.counter("llm.batch.errors"),
+            "fallbacks": metrics.counter("llm.batch.fallbacks"),
+            "queue_ms": metrics.timing("llm.batch.queue_ms"),
+        }
+
+
+_ROLES = {"system": "system", "human": "user", "ai": "assistant"}
+
+
+def _chatml(messages) -> str:
+    # Qwen and many fine-tunes
+    parts = [f"<|im_start|>{_ROLES.get(m.type, 'user')}\n{m.content}<|im_end|>\n" for m in messages]
+    return "".join(parts) + "<|im_start|>assistant\n"
+
+
+def _llama3(messages) -> str:
+    # The server's tokenizer adds <|begin_of_text|> itself
+    parts = [f"<|start_header_id|>{_ROLES.get(m.type, 'user')}<|end_header_id|>\n\n{m.content}<|eot_id|>"
+             for m in messages]
+    return "".join(parts) + "<|start_header_id|>assistant<|end_header_id|>\n\n"
+
+
+def _gemma(messages) -> str:
+    # No system role: system text is sent as a user turn
+    parts = [f"<start_of_turn>{'model' if m.type == 'ai' else 'user'}\n{m.content}<end_of_turn>\n" for m in messages]
+    return "".join(parts) + "<start_of_turn>model\n"
+
+
+# Completion prompts in the chat template of the batch server's model
+CHAT_TEMPLATES: Dict[str, Callable[[list], str]] = {"chatml": _chatml, "llama3": _llama3, "gemma": _gemma}
+
+
+def render_prompt(messages, template: str) -> str:
+    """Chat messages as one completion prompt in the named chat template."""
+    return CHAT_TEMPLATES[template](messages)
+
+
+class CompletionsClient:
+    """Multi-prompt requests to an OpenAI-compatible /v1/completions endpoint."""
+
+    def __init__(self, base_url: str, timeout: float = 120.0):
+        self.url = base_url.rstrip("/") + "/v1/completions"
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def complete(self, model: str, prompts: List[str], temperature: float, max_tokens: int,
+                 json_schema: Optional[dict] = None) -> List[str]:
+        body = {"model": model, "prompt": prompts, "temperature": temperature, "max_tokens": max_tokens}
+        if json_schema is not None:
+            body["guided_json"] = json_schema  # Constrained decoding, as vLLM names it
+        response = self._session.post(self.url, json=body, timeout=self.timeout)
+        response.raise_for_status()
+        choices = sorted(response.json()["choices"], key=lambda c: c["index"])
+        return [choice["text"] for choice in choices]
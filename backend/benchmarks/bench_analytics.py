@@ -0,0 +1,67 @@
+"""
+Query latency of the columnar results store over synthetic interviews.
+
+    python -m backend.benchmarks.bench_analytics --interviews 300000
+"""
+
+import argparse
+import random
+import time
+
+from backend.analytics import ResultsStore
+
+ROLES = ["backend engineer", "frontend engineer", "data scientist", "devops engineer", "product manager"]
+EXPERIENCE = ["entry", "mid", "senior", "staff"]
+PERSONAS = ["strict", "coach"]
+TOPICS = [f"topic {i}" for i in range(400)]
+
+
+def synthetic_batch(n: int, rng: random.Random):
+    batch = []
+    for _ in range(n):
+        skill = rng.uniform(2, 9)
+        scores = [min(max(rng.gauss(skill, 1.5), 0), 10) for _ in range(5)]
+        topics = [rng.choice(TOPICS) for _ in scores]
+        batch.append({
+            "ts": time.time(),
+            "role": rng.choice(ROLES),
+            "experience": rng.choice(EXPERIENCE),
+            "persona": rng.choice(PERSONAS),
+            "verdict": "synthetic",
+            "avg_score": sum(scores) / len(scores),
+            "scores": scores,
+            "topics": topics,
+            "weak_topics": [t for t, s in zip(topics, scores) if s < 5],
+        })
+    return batch
+
+
+def timed(label, fn, repeat=20):
+    fn()  # Warm the concatenated view
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    print(f"{label:<42} {(time.perf_counter() - start) / repeat * 1000:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark results-store queries")
+    parser.add_argument("--interviews", type=int, default=300000)
+    args = parser.parse_args()
+
+    store = ResultsStore(None)
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(0, args.interviews, 10000):
+        store.ingest(synthetic_batch(10000, rng))
+    print(f"Ingested {store.interviews.rows} interviews in {time.perf_counter() - start:.1f}s")
+
+    timed("score percentiles by role", lambda: store.score_percentiles("role"))
+    timed("score percentiles by experience (coach)", lambda: store.score_percentiles("experience", persona="coach"))
+    timed("weak topic frequencies (top 20)", lambda: store.weak_topic_frequencies(20))
+    timed("weak topics for senior backend", lambda: store.weak_topic_frequencies(20, role="backend engineer", experience="senior"))
+    timed("difficulty transitions", lambda: store.difficulty_transitions())
+
+
+if __name__ == "__main__":
+    main()
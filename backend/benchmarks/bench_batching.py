@@ -0,0 +1,101 @@
+"""
+Throughput and latency of question and evaluation calls, per call versus micro-batched.
+
+Concurrent sessions (threads) call `ask_question_agent` and
+`evaluate_with_feedback_agent` back to back for `--seconds` at each
+concurrency level. The stand-in server has one generation slot, like a
+CPU-bound local server:
+
+- per call: each call is its own /api/chat request
+- batched: calls go through the micro-batcher to /v1/completions, where a
+  batch costs one prefill per prompt plus `--batch-cost` of a single
+  decode per extra sequence
+
+Reported per level: completed calls per second, call latency p50/p99, and
+the mean number of prompts per server request.
+
+    python -m backend.benchmarks.bench_batching --concurrency 1 2 4 8 16 --seconds 10
+"""
+
+import argparse
+import os
+import statistics
+import threading
+import time
+
+from backend.benchmarks.replay import percentile
+from backend.benchmarks.stub_ollama import StubOllamaServer
+
+STATE = {
+    "role": "Backend Engineer", "experience": "3 years", "difficulty": "easy", "question_count": 1,
+    "weak_topics": set(), "asked_questions": ["How would you design a rate limiter?"], "role_description": "",
+    "current_question": "How would you design a rate limiter?",
+    "last_answer_text": "A token bucket per client in Redis, refilled lazily on each request, with a Lua script "
+                        "so the check and the decrement are atomic.",
+}
+
+
+def run_level(agents, concurrency: int, seconds: float):
+    latencies, lock = [], threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def session():
+        calls = (agents.ask_question_agent, agents.evaluate_with_feedback_agent)
+        n = 0
+        while time.perf_counter() < deadline:
+            t = time.perf_counter()
+            calls[n % 2](STATE)
+            with lock:
+                latencies.append((time.perf_counter() - t) * 1000)
+            n += 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=session) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cross-session LLM micro-batching")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--seconds", type=float, default=10.0, help="Per level and mode")
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    parser.add_argument("--max-batch", type=int, default=8)
+    parser.add_argument("--stub-ttft-ms", type=float, default=50.0)
+    parser.add_argument("--stub-tokens-per-sec", type=float, default=200.0)
+    parser.add_argument("--batch-cost", type=float, default=0.15)
+    args = parser.parse_args()
+
+    with StubOllamaServer(ttft_ms=args.stub_ttft_ms, tokens_per_sec=args.stub_tokens_per_sec, parallel=1,
+                          batch_cost=args.batch_cost) as stub:
+        # Read by backend.config and backend.llm on import
+        os.environ.update({
+            "LLM_BASE_URL_LARGE": stub.url, "LLM_BASE_URL_SMALL": stub.url, "DEGRADE_ENABLED": "false",
+            "LLM_BATCH_URL": "",
+        })
+        from backend import agents, llm
+
+        print(f"Server: one slot, {args.stub_ttft_ms:.0f} ms prefill per prompt, "
+              f"{args.stub_tokens_per_sec:.0f} tokens/s, +{args.batch_cost:.0%} decode time per extra sequence; "
+              f"batching window {args.window_ms:g} ms, up to {args.max_batch} per batch")
+        print(f"{'sessions':>8} {'mode':<9} {'calls/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'prompts/request':>16}")
+        for concurrency in args.concurrency:
+            for mode in ("per call", "batched"):
+                llm.configure_batching(stub.url if mode == "batched" else None, model="stub", template="chatml",
+                                       window_ms=args.window_ms, max_batch=args.max_batch)
+                stub.batch_sizes.clear()
+                requests_before = stub.requests
+                latencies, elapsed = run_level(agents, concurrency, args.seconds)
+                requests = stub.requests - requests_before
+                per_request = statistics.mean(stub.batch_sizes) if stub.batch_sizes else 1.0
+                print(f"{concurrency:>8} {mode:<9} {len(latencies) / elapsed:>8.1f} "
+                      f"{statistics.median(latencies):>8.0f} {percentile(latencies, 99):>8.0f} "
+                      f"{per_request:>16.2f}" + ("" if requests else "  (no requests)"))
+        llm.configure_batching(None)
+
+
+if __name__ == "__main__":
+    main()
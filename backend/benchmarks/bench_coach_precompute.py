@@ -0,0 +1,95 @@
+"""
+/interview/continue latency for the coach persona, with and without next-turn precomputation.
+
+Coach interviews run to completion on a stand-in LLM server; after each
+feedback step the client waits `--pause` seconds (reading or listening)
+before pressing Proceed. Some interviews end early from the feedback pause
+instead, to check that a discarded preparation doesn't get in the way.
+The backend is started once per mode.
+
+    python -m backend.benchmarks.bench_coach_precompute --interviews 6 --pause 3
+"""
+
+import argparse
+import statistics
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from backend.benchmarks.replay import percentile, spawn_backend
+from backend.benchmarks.stub_ollama import StubOllamaServer
+
+ANSWER = "I would put a queue in front of the writer, batch the inserts and make the consumer idempotent."
+
+
+def run_interview(url: str, pause: float, end_after: int, latencies, statuses):
+    with httpx.Client(base_url=url, timeout=120) as client:
+        sid = client.post("/interview/start", json={
+            "role": "Backend Engineer", "experience": "3 years", "persona": "coach",
+        }).json()["session_id"]
+        answered = 0
+        while True:
+            reply = client.post("/interview/answer", json={"session_id": sid, "answer": ANSWER}).json()
+            answered += 1
+            if reply.get("final"):
+                return
+            time.sleep(pause)
+            if end_after and answered >= end_after:
+                t = time.perf_counter()
+                resp = client.post("/interview/end", json={"session_id": sid})
+                latencies["end"].append((time.perf_counter() - t) * 1000)
+                statuses[resp.status_code] += 1
+                return
+            t = time.perf_counter()
+            resp = client.post("/interview/continue", json={"session_id": sid})
+            kind = "continue (final)" if resp.json().get("final") else "continue"
+            latencies[kind].append((time.perf_counter() - t) * 1000)
+            statuses[resp.status_code] += 1
+            if kind == "continue (final)":
+                return
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark coach next-turn precomputation")
+    parser.add_argument("--interviews", type=int, default=6, help="Per mode; every third one ends early")
+    parser.add_argument("--concurrency", type=int, default=3)
+    parser.add_argument("--pause", type=float, default=3.0, help="Seconds spent on each feedback screen")
+    parser.add_argument("--stub-ttft-ms", type=float, default=400.0)
+    parser.add_argument("--stub-tokens-per-sec", type=float, default=60.0)
+    parser.add_argument("--port", type=int, default=8772)
+    args = parser.parse_args()
+
+    print(f"{args.interviews} coach interviews per mode, {args.pause:.1f}s feedback pause")
+    print(f"{'precompute':<11} {'request':<17} {'p50 ms':>8} {'p99 ms':>8} {'n':>4}")
+    with StubOllamaServer(ttft_ms=args.stub_ttft_ms, tokens_per_sec=args.stub_tokens_per_sec, parallel=16) as stub:
+        for label, flag in (("off", "false"), ("on", "true")):
+            proc = spawn_backend(args.port, stub.url, {
+                "COACH_PRECOMPUTE": flag, "RATE_LIMIT_ENABLED": "false", "DEGRADE_ENABLED": "false",
+                "TRANSCRIPT_LOG_DIR": "", "RESULTS_STORE_DIR": "",
+            })
+            latencies, statuses = defaultdict(list), defaultdict(int)
+            try:
+                with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                    list(pool.map(
+                        lambda i: run_interview(f"http://127.0.0.1:{args.port}", args.pause,
+                                                2 if i % 3 == 2 else 0, latencies, statuses),
+                        range(args.interviews),
+                    ))
+                stats = httpx.get(f"http://127.0.0.1:{args.port}/metrics").json()["coach_precompute"]
+            finally:
+                proc.terminate()
+                proc.wait()
+            for kind in ("continue", "continue (final)", "end"):
+                values = latencies[kind]
+                if values:
+                    print(f"{label:<11} {kind:<17} {statistics.median(values):>8.0f} "
+                          f"{percentile(values, 99):>8.0f} {len(values):>4}")
+            errors = sum(n for status, n in statuses.items() if status != 200)
+            print(f"{'':<11} {errors} non-200 responses; hits {stats['hits']:.0f}, "
+                  f"discarded {stats['discarded']:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Framework overhead per turn and memory per session: LangGraph versus the native engine.
+
+The scripted LLMs of `engine_parity` answer instantly, so what is left is
+node code plus the engine. Node time is measured by wrapping every node
+(the `projected` wrapper both engines use) and subtracted from the invoke's
+wall time. Reported per flow and engine:
+
+- overhead per turn: invoke time outside the nodes, for one answer
+  (strict) or one answer plus Proceed (coach), p50 and p99
+- memory per paused session, after 0, 2 and 4 answered turns (tracemalloc,
+  everything each engine retains for its threads)
+
+    python -m backend.benchmarks.bench_engine --sessions 100
+"""
+
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+from uuid import uuid4
+
+from langgraph.types import Command
+
+from backend import graph as graph_module
+from backend.benchmarks.engine_parity import AVERAGE, STRONG, WEAK, initial_state, install_scripted_llms
+from backend.benchmarks.replay import percentile
+from backend.sessionstate import session_states
+
+ANSWERS = [STRONG, AVERAGE, WEAK]
+
+_node_seconds = [0.0]
+_projected = graph_module.projected
+
+
+def _timed_projected(node, step):
+    run = _projected(node, step)
+
+    def timed(state, config):
+        t = time.perf_counter()
+        try:
+            return run(state, config)
+        finally:
+            _node_seconds[0] += time.perf_counter() - t
+
+    return timed
+
+FLOWS = {
+    "strict": ("strict", graph_module.build_graph_strict, graph_module.build_native_strict),
+    "strict fused": ("strict", graph_module.build_graph_strict_fused, graph_module.build_native_strict_fused),
+    "coach": ("coach", graph_module.build_graph_coach, graph_module.build_native_coach),
+}
+
+
+def play_turn(engine, config, persona: str, n: int):
+    """One answered turn; returns (wall seconds, seconds inside nodes)."""
+    _node_seconds[0] = 0.0
+    t = time.perf_counter()
+    engine.invoke(Command(resume=ANSWERS[n % len(ANSWERS)]), config=config)
+    if persona == "coach":
+        engine.invoke(Command(resume="[Proceed]"), config=config)
+    return time.perf_counter() - t, _node_seconds[0]
+
+
+def overhead(engine, persona: str, sessions: int, turns: int):
+    per_turn = []
+    for _ in range(sessions):
+        thread_id = str(uuid4())
+        config = {"configurable": {"thread_id": thread_id}}
+        engine.invoke(initial_state(persona), config=config)
+        for n in range(turns):
+            wall, inside = play_turn(engine, config, persona, n)
+            per_turn.append((wall - inside) * 1e6)
+        engine.checkpointer.delete_thread(thread_id)
+        session_states.discard(thread_id)
+    return per_turn
+
+
+def memory_per_session(build, persona: str, sessions: int, turns: int) -> float:
+    engine = build()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(sessions):
+        config = {"configurable": {"thread_id": str(uuid4())}}
+        engine.invoke(initial_state(persona), config=config)
+        for n in range(turns):
+            play_turn(engine, config, persona, n)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / sessions / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark interview engine overhead")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=4, help="Answered turns per session for the overhead run")
+    parser.add_argument("--memory-sessions", type=int, default=100)
+    args = parser.parse_args()
+
+    install_scripted_llms()
+    graph_module.projected = _timed_projected
+
+    print(f"{'flow':<13} {'engine':<10} {'overhead p50':>13} {'p99':>9}   KB/session after 0 / 2 / 4 turns")
+    for flow, (persona, build_graph, build_native) in FLOWS.items():
+        for label, build in (("langgraph", build_graph), ("native", build_native)):
+            engine = build()
+            overhead(engine, persona, 20, args.turns)  # Warm-up
+            values = overhead(engine, persona, args.sessions, args.turns)
+            memory = [memory_per_session(build, persona, args.memory_sessions, turns) for turns in (0, 2, 4)]
+            print(f"{flow:<13} {label:<10} {statistics.median(values):>10.0f} us {percentile(values, 99):>6.0f} us   "
+                  + " / ".join(f"{kb:.1f}" for kb in memory))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Per-turn latency and output quality: fused turns versus the three-call strict graph.
+
+The same scripted interviews (a strong, an average and a weak answer, in
+rotation) run through `build_graph_strict` and `build_graph_strict_fused`.
+Reported per mode:
+
+- turn latency: answer submitted → next question ready (final turn excluded)
+- LLM calls per turn
+- structured-output failure rate
+- next questions breaking the single-question rules (more than one
+  interrogative word, or a joining conjunction), and repeats within an interview
+- fused mode only: how often the fused question was rejected locally
+  (wrong difficulty, empty, repeat) and regenerated
+- mean score per answer band, to spot the fused prompt scoring differently
+
+A stand-in server is used by default, so its quality numbers only check the
+plumbing. Point --base-url at a real Ollama server for meaningful scores.
+
+    python -m backend.benchmarks.bench_fused --interviews 12 --concurrency 4
+    python -m backend.benchmarks.bench_fused --base-url http://localhost:11434 --interviews 4
+"""
+
+import argparse
+import itertools
+import logging
+import re
+import statistics
+import threading
+import time
+from collections import defaultdict
+from uuid import uuid4
+
+from langgraph.types import Command
+
+from backend import llm as llm_module
+from backend.benchmarks.replay import percentile
+from backend.benchmarks.stub_ollama import StubOllamaServer
+from backend.config import MODEL_LARGE, MODEL_SMALL
+from backend.graph import build_graph_strict, build_graph_strict_fused
+from backend.metrics import metrics
+from backend.structured import parse_failure_rates
+
+ANSWERS = {
+    "strong": (
+        "I would put a write-through cache in front of the profile service, keyed by user id with a short TTL. "
+        "For example at my last job we cut p95 from 180 ms to 25 ms that way; the trade-off is staleness, so "
+        "writes invalidate the key and we accept up to five seconds of lag for non-critical fields."
+    ),
+    "average": "I would add caching and maybe an index, then check whether it got faster.",
+    "weak": "I am not sure, probably restart the server.",
+}
+INTERROGATIVES = re.compile(r"\b(what|why|how|tell|explain|describe)\b", re.IGNORECASE)
+CONJUNCTIONS = re.compile(r"\b(and|also|as well as|furthermore)\b", re.IGNORECASE)
+
+
+def breaks_question_rules(question: str) -> bool:
+    return len(INTERROGATIVES.findall(question)) > 1 or bool(CONJUNCTIONS.search(question))
+
+
+def initial_state():
+    return {
+        "role": "Backend Engineer", "experience": "3 years", "role_description": None, "persona": "strict",
+        "current_question": None, "last_answer_text": None, "evaluation": None, "feedback": None,
+        "evaluations_history": [], "score_history": [], "weak_topics": set(), "difficulty": "easy",
+        "question_count": 0, "end_interview": False, "asked_questions": [], "summary": None,
+        "spoken_transition": None, "spoken_closing": None,
+    }
+
+
+def run_interview(graph, n: int, stats):
+    config = {"configurable": {"thread_id": str(uuid4())}}
+    result = graph.invoke(initial_state(), config=config)
+    bands = list(ANSWERS)
+    for turn in itertools.count():
+        if "__interrupt__" not in result:
+            break
+        band = bands[(n + turn) % len(bands)]
+        start = time.perf_counter()
+        result = graph.invoke(Command(resume=ANSWERS[band]), config=config)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        with stats["lock"]:
+            stats["scores"][band].append(result["score_history"][-1])
+            if "__interrupt__" in result:
+                stats["turn_ms"].append(elapsed)
+                question = result["current_question"]
+                stats["questions"] += 1
+                stats["rule_breaks"] += breaks_question_rules(question)
+    asked = [q.lower() for q in result.get("asked_questions", [])]
+    with stats["lock"]:
+        stats["repeats"] += len(asked) - len(set(asked))
+
+
+def run_mode(build, interviews: int, concurrency: int):
+    metrics.reset()
+    graph = build()
+    stats = {
+        "lock": threading.Lock(), "turn_ms": [], "scores": defaultdict(list),
+        "questions": 0, "rule_breaks": 0, "repeats": 0,
+    }
+    counter = itertools.count()
+
+    def worker():
+        while (n := next(counter)) < interviews:
+            run_interview(graph, n, stats)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats["parse"] = parse_failure_rates()
+    stats["corrected"] = {
+        name.rsplit(".", 1)[-1]: value
+        for name, value in metrics.snapshot()["counters"].items() if name.startswith("fused.corrected.")
+    }
+    stats["fused_turns"] = metrics.counter("fused.turns")
+    return stats
+
+
+def report(label: str, stats, interviews: int):
+    turns = len(stats["turn_ms"])
+    failures = sum(s["failed"] for s in stats["parse"].values())
+    calls = sum(s["calls"] for s in stats["parse"].values())
+    print(f"\n[{label}]")
+    print(f"  turn latency     p50 {statistics.median(stats['turn_ms']):.0f} ms   "
+          f"p95 {percentile(stats['turn_ms'], 95):.0f} ms   ({turns} turns)")
+    # Outside the measured turns each interview makes a first-question, a final-evaluation and a closing call
+    print(f"  LLM calls/turn   {(calls - 3 * interviews) / max(turns, 1):.2f}")
+    print(f"  parse failures   {failures}/{calls}")
+    print(f"  rule breaks      {stats['rule_breaks']}/{stats['questions']} questions, {stats['repeats']} repeats")
+    if stats["fused_turns"]:
+        corrected = sum(stats["corrected"].values())
+        detail = ", ".join(f"{k} {v:.0f}" for k, v in sorted(stats["corrected"].items())) or "none"
+        print(f"  fused questions  {stats['fused_turns'] - corrected:.0f}/{stats['fused_turns']:.0f} kept "
+              f"(regenerated: {detail})")
+    print("  mean score       " + "   ".join(
+        f"{band} {statistics.mean(values):.1f}" for band, values in stats["scores"].items() if values
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare fused turns with the three-call strict graph")
+    parser.add_argument("--interviews", type=int, default=12)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--base-url", help="Real Ollama server (default: local stand-in)")
+    parser.add_argument("--stub-ttft-ms", type=float, default=400.0)
+    parser.add_argument("--stub-tokens-per-sec", type=float, default=80.0)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    stub = None
+    if args.base_url:
+        url = args.base_url
+    else:
+        stub = StubOllamaServer(ttft_ms=args.stub_ttft_ms, tokens_per_sec=args.stub_tokens_per_sec, parallel=16).start()
+        url = stub.url
+    llm_module.MODEL_BASE_URLS[MODEL_LARGE] = url
+    llm_module.MODEL_BASE_URLS[MODEL_SMALL] = url
+    llm_module.set_routing_profile(llm_module.LLM_ROUTING_PROFILE)
+
+    print(f"{args.interviews} interviews, concurrency {args.concurrency}, server {url}")
+    for label, build in (("three calls", build_graph_strict), ("fused", build_graph_strict_fused)):
+        report(label, run_mode(build, args.interviews, args.concurrency), args.interviews)
+
+    if stub:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Hint latency with and without background pre-generation.
+
+The backend is started twice on a stand-in LLM server, with HINT_PREGENERATE
+off and on. Each simulated candidate reads the question for --think seconds,
+asks for a hint, then answers, through a full interview. Hint and next-question
+latencies are reported for both runs, along with how often the pre-generated
+hint was already waiting.
+
+    python -m backend.benchmarks.bench_hints --interviews 16 --think 1.5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import defaultdict
+
+import httpx
+
+from backend.benchmarks.replay import percentile, spawn_backend
+from backend.benchmarks.stub_ollama import StubOllamaServer
+
+ANSWER = (
+    "I would profile the endpoint first, add an index for the filtered column, cache hot reads, "
+    "and compare p95 latency before and after each change."
+)
+
+
+async def run_interview(client, think: float, latencies):
+    resp = await client.post("/interview/start", json={"role": "Backend Engineer", "experience": "3 years"})
+    sid = resp.json()["session_id"]
+    while True:
+        await asyncio.sleep(think)
+        start = time.perf_counter()
+        resp = await client.post("/interview/hint", json={"session_id": sid})
+        if resp.status_code == 200:
+            latencies["hint"].append((time.perf_counter() - start) * 1000)
+        else:
+            latencies["hint_refused"].append(resp.status_code)
+
+        start = time.perf_counter()
+        resp = await client.post("/interview/answer", json={"session_id": sid, "answer": ANSWER})
+        latencies["answer"].append((time.perf_counter() - start) * 1000)
+        if resp.status_code != 200 or resp.json().get("final"):
+            return
+
+
+async def run_load(url: str, interviews: int, concurrency: int, think: float):
+    latencies = defaultdict(list)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            # One client per candidate, like a browser
+            async with httpx.AsyncClient(base_url=url, timeout=120, headers={"x-api-key": f"bench-{i}"}) as client:
+                await run_interview(client, think, latencies)
+
+    await asyncio.gather(*(one(i) for i in range(interviews)))
+    async with httpx.AsyncClient(base_url=url) as client:
+        counters = (await client.get("/metrics")).json()["counters"]
+    return latencies, counters
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hint latency with background pre-generation")
+    parser.add_argument("--interviews", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--think", type=float, default=1.5, help="Seconds between question and hint request")
+    parser.add_argument("--stub-ttft-ms", type=float, default=400.0)
+    parser.add_argument("--stub-tokens-per-sec", type=float, default=80.0)
+    parser.add_argument("--port", type=int, default=8768)
+    args = parser.parse_args()
+
+    print(f"{args.interviews} interviews, concurrency {args.concurrency}, think time {args.think}s")
+    print(f"{'pre-generate':<13} {'endpoint':<8} {'p50 ms':>8} {'p99 ms':>8} {'n':>5}")
+    with StubOllamaServer(ttft_ms=args.stub_ttft_ms, tokens_per_sec=args.stub_tokens_per_sec, parallel=16) as stub:
+        for label, flag in (("off", "false"), ("on", "true")):
+            proc = spawn_backend(args.port, stub.url, {
+                "HINT_PREGENERATE": flag, "TRANSCRIPT_LOG_DIR": "", "RESULTS_STORE_DIR": "",
+                # Shedding would refuse hints mid-run and skew the comparison
+                "DEGRADE_ENABLED": "false",
+            })
+            try:
+                latencies, counters = asyncio.run(
+                    run_load(f"http://127.0.0.1:{args.port}", args.interviews, args.concurrency, args.think)
+                )
+            finally:
+                proc.terminate()
+                proc.wait()
+            for endpoint in ("hint", "answer"):
+                values = latencies[endpoint]
+                print(f"{label:<13} {endpoint:<8} {statistics.median(values):>8.1f} "
+                      f"{percentile(values, 99):>8.1f} {len(values):>5}")
+            if latencies["hint_refused"]:
+                print(f"{'':<13} {len(latencies['hint_refused'])} hint requests refused")
+            if flag == "true":
+                print(f"{'':<13} served ready {counters.get('hints.served_ready', 0):.0f}, "
+                      f"waited {counters.get('hints.served_waited', 0):.0f}, "
+                      f"live {counters.get('hints.live', 0):.0f}, "
+                      f"generated {counters.get('hints.pregenerated', 0):.0f}")
+
+
+if __name__ == "__main__":
+    main()
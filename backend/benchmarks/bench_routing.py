@@ -0,0 +1,112 @@
+"""
+Compare per-turn latency and throughput across LLM routing profiles.
+
+Two stand-in Ollama servers are started locally: a slow "large" one and a
+faster, narrower CPU-like "small" one. Each profile then runs the same set
+of simulated interviews through the real agents.
+
+    python -m backend.benchmarks.bench_routing --interviews 16 --concurrency 8
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend import llm as llm_module
+from backend.agents import ask_question_agent, evaluate_with_feedback_agent, transition_agent, hint_agent, end_interview_agent
+from backend.benchmarks.stub_ollama import StubOllamaServer
+from backend.config import MAX_QUESTIONS, MODEL_LARGE, MODEL_SMALL, ROUTING_PROFILES
+from backend.models import Evaluation
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    idx = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[idx]
+
+
+def run_interview(seed: int, hint_every: int = 3):
+    """Drive one interview through the agents; return per-turn latencies in ms."""
+    state = {
+        "role": "Backend Engineer",
+        "experience": "3 years",
+        "role_description": "Python services, PostgreSQL, Kubernetes",
+        "difficulty": "easy",
+        "weak_topics": set(),
+        "asked_questions": [],
+        "question_count": 0,
+        "score_history": [],
+        "evaluations_history": [],
+        "evaluation": None,
+    }
+    turns = []
+    question = ask_question_agent(state).question
+    for i in range(MAX_QUESTIONS):
+        start = time.perf_counter()
+        state["current_question"] = question
+        state["last_answer_text"] = "I would shard by tenant and add read replicas for reporting queries."
+        if (seed + i) % hint_every == 0:
+            hint_agent(question, state["role"], state["experience"])
+        ev = evaluate_with_feedback_agent(state)
+        state["evaluation"] = Evaluation(score=ev.score, topic=ev.topic, strengths=ev.strengths, weaknesses=ev.weaknesses)
+        state["score_history"].append(ev.score)
+        state["evaluations_history"].append(state["evaluation"])
+        state["asked_questions"].append(question)
+        state["question_count"] += 1
+        if i < MAX_QUESTIONS - 1:
+            transition_agent(state)
+            question = ask_question_agent(state).question
+        else:
+            end_interview_agent(state)
+        turns.append((time.perf_counter() - start) * 1000)
+    return turns
+
+
+def run_profile(name: str, routes: dict, interviews: int, concurrency: int):
+    llm_module.set_routing_profile(routes)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(run_interview, range(interviews)))
+    elapsed = time.perf_counter() - start
+    turns = [t for r in results for t in r]
+    return {
+        "profile": name,
+        "turn_p50_ms": statistics.median(turns),
+        "turn_p95_ms": percentile(turns, 95),
+        "turns_per_sec": len(turns) / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--interviews", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    large = StubOllamaServer(ttft_ms=250, tokens_per_sec=60, parallel=4).start()
+    small = StubOllamaServer(ttft_ms=40, tokens_per_sec=120, parallel=2).start()
+    llm_module.MODEL_BASE_URLS[MODEL_LARGE] = large.url
+    llm_module.MODEL_BASE_URLS[MODEL_SMALL] = small.url
+
+    try:
+        rows = [
+            run_profile(name, routes, args.interviews, args.concurrency)
+            for name, routes in ROUTING_PROFILES.items()
+        ]
+    finally:
+        large.stop()
+        small.stop()
+
+    print(f"{'profile':<10} {'turn p50 ms':>12} {'turn p95 ms':>12} {'turns/s':>9}")
+    for row in rows:
+        print(
+            f"{row['profile']:<10} {row['turn_p50_ms']:>12.0f} "
+            f"{row['turn_p95_ms']:>12.0f} {row['turns_per_sec']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
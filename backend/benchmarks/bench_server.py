@@ -0,0 +1,154 @@
+"""
+Server overhead: the development command line versus the production profile.
+
+Both run on a near-instant stand-in LLM so the numbers reflect the server, the
+graph and JSON encoding rather than model time:
+
+- dev: `uvicorn backend.main:app --reload` on asyncio/h11 (run.ps1, without
+  uvloop/httptools installed), default GC settings
+- prod: `python -m backend.server` (uvloop/httptools, frozen GC, raised gen-0
+  threshold, no access log)
+
+Two loads, each for a fixed duration at a fixed number of concurrent clients:
+
+- interviews: strict-persona interviews back to back (start, then answers
+  until final); every request is timed
+- metrics: GET /metrics, a large JSON document with no LLM work
+
+Both servers use the orjson default response class, so its effect is measured
+separately, in-process: rendering a session summary and a /metrics-sized
+document with Starlette's JSONResponse versus OrjsonResponse.
+
+    python -m backend.benchmarks.bench_server --clients 32 --duration 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from starlette.responses import JSONResponse
+
+from backend.benchmarks.replay import percentile, spawn_backend
+from backend.benchmarks.stub_ollama import StubOllamaServer
+from backend.server import OrjsonResponse
+
+ANSWER = "I would put a queue in front of the writer, batch inserts and make the consumer idempotent."
+
+
+async def run_load(url: str, clients: int, duration: float, load: str):
+    latencies, errors = [], 0
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=url, timeout=60, limits=limits) as client:
+        deadline = time.monotonic() + duration
+
+        async def timed(method, path, **kwargs):
+            nonlocal errors
+            t = time.perf_counter()
+            resp = await client.request(method, path, **kwargs)
+            latencies.append((time.perf_counter() - t) * 1000)
+            if resp.status_code != 200:
+                errors += 1
+                return None
+            return resp.json()
+
+        async def interviews():
+            while time.monotonic() < deadline:
+                started = await timed("POST", "/interview/start",
+                                      json={"role": "Backend Engineer", "experience": "3 years", "persona": "strict"})
+                if started is None:
+                    continue
+                while time.monotonic() < deadline:
+                    turn = await timed("POST", "/interview/answer",
+                                       json={"session_id": started["session_id"], "answer": ANSWER})
+                    if turn is None or turn.get("final"):
+                        break
+
+        async def metrics():
+            while time.monotonic() < deadline:
+                await timed("GET", "/metrics")
+
+        worker = interviews if load == "interviews" else metrics
+        start = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.monotonic() - start
+    return latencies, errors, elapsed
+
+
+def render_payloads():
+    summary = {
+        "final": True,
+        "summary": {
+            "average_score": 6.8,
+            "verdict": "Good",
+            "strengths": ["Clear structure", "Concrete production examples"] * 3,
+            "weaknesses": ["Vague on failure modes"] * 3,
+            "evaluations": [
+                {"question": f"Question {i}: how would you design the ingestion path?", "answer": ANSWER * 3,
+                 "score": 6.5, "topic": "system design", "feedback": ANSWER * 2}
+                for i in range(10)
+            ],
+        },
+    }
+    metrics = {
+        "counters": {f"llm.route.{i}.calls": float(i) for i in range(300)},
+        "timings": {f"request./interview/{i}.total_ms": {"count": 100, "p50": 12.5, "p99": 80.1, "mean": 20.3}
+                    for i in range(200)},
+    }
+    return {"summary": summary, "metrics": metrics}
+
+
+def bench_render(iterations: int):
+    print(f"{'payload':<8} {'stdlib us':>10} {'orjson us':>10} {'bytes':>7}")
+    for name, payload in render_payloads().items():
+        per_call = {}
+        for cls in (JSONResponse, OrjsonResponse):
+            t = time.perf_counter()
+            for _ in range(iterations):
+                body = cls(payload).body
+            per_call[cls] = (time.perf_counter() - t) / iterations * 1e6
+        print(f"{name:<8} {per_call[JSONResponse]:>10.1f} {per_call[OrjsonResponse]:>10.1f} {len(body):>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dev and production server profiles")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--port", type=int, default=8770)
+    parser.add_argument("--render-iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    bench_render(args.render_iterations)
+    print()
+
+    env = {
+        "RATE_LIMIT_ENABLED": "false", "DEGRADE_ENABLED": "false",
+        "TRANSCRIPT_LOG_DIR": "", "RESULTS_STORE_DIR": "",
+    }
+    profiles = [
+        ("dev", dict(env, GC_FREEZE="false", GC_GEN0_THRESHOLD="0"),
+         ["-m", "uvicorn", "backend.main:app", "--reload", "--loop", "asyncio", "--http", "h11",
+          "--port", str(args.port), "--log-level", "warning"]),
+        ("prod", env, ["-m", "backend.server", "--host", "127.0.0.1", "--port", str(args.port), "--log-level", "warning"]),
+    ]
+
+    print(f"{args.clients} clients, {args.duration:.0f}s per run")
+    print(f"{'profile':<8} {'load':<11} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    with StubOllamaServer(ttft_ms=0.0, tokens_per_sec=1e9, parallel=args.clients) as stub:
+        for label, profile_env, server_args in profiles:
+            proc = spawn_backend(args.port, stub.url, profile_env, server_args)
+            try:
+                for load in ("interviews", "metrics"):
+                    latencies, errors, elapsed = asyncio.run(
+                        run_load(f"http://127.0.0.1:{args.port}", args.clients, args.duration, load)
+                    )
+                    print(f"{label:<8} {load:<11} {len(latencies) / elapsed:>8.1f} "
+                          f"{statistics.median(latencies):>8.1f} {percentile(latencies, 99):>8.1f} {errors:>7}")
+            finally:
+                proc.terminate()
+                proc.wait()
+
+
+if __name__ == "__main__":
+    main()
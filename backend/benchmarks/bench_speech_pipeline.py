@@ -0,0 +1,122 @@
+"""
+Time to first audio for coach feedback and closings: sentence-pipelined versus after the reply.
+
+Runs the backend in-process with SPEECH_PIPELINE on, a streaming stand-in
+LLM server and the timing-faithful fake TTS engine. The clock starts when the
+answer (or early end) is submitted.
+
+- after reply: wait for the /interview/answer (or /interview/end) response,
+  then POST the text to /speech/synthesize
+- pipelined: open GET /interview/{id}/speech/{kind} alongside the request,
+  so each sentence is synthesized as soon as the LLM has written it
+
+    python -m backend.benchmarks.bench_speech_pipeline --interviews 4 --stub-tokens-per-sec 40
+"""
+
+import argparse
+import os
+import statistics
+import threading
+import time
+from collections import defaultdict
+
+import httpx
+
+ANSWER = "I would put a queue in front of the writer, batch the inserts and make the consumer idempotent."
+
+
+def read_audio(client: httpx.Client, method: str, path: str, t0: float, **kwargs):
+    """(first audio ms, last audio ms, bytes) from t0."""
+    first, size = None, 0
+    with client.stream(method, path, **kwargs) as resp:
+        resp.raise_for_status()
+        for chunk in resp.iter_bytes():
+            if first is None and chunk:
+                first = (time.perf_counter() - t0) * 1000
+            size += len(chunk)
+    return first, (time.perf_counter() - t0) * 1000, size
+
+
+def speak(client: httpx.Client, mode: str, kind: str, sid: str, number: int, request):
+    """Run `request()` (returns the JSON reply) and fetch the spoken text's audio in `mode`."""
+    t0 = time.perf_counter()
+    if mode == "after reply":
+        reply = request()
+        if kind == "closing":
+            text = reply["spoken_closing"]
+        else:
+            # The read model has the feedback whichever step the answer response reports
+            text = client.get(f"/interview/{sid}/state").json()["feedback"]
+        return reply, read_audio(client, "POST", "/speech/synthesize", t0, json={"session_id": sid, "text": text, "format": "ogg"})
+
+    holder = {}
+    worker = threading.Thread(target=lambda: holder.setdefault("reply", request()))
+    worker.start()
+    audio = read_audio(client, "GET", f"/interview/{sid}/speech/{kind}", t0, params={"number": number, "format": "ogg"})
+    worker.join()
+    return holder["reply"], audio
+
+
+def run_interview(url: str, mode: str, questions: int, results):
+    with httpx.Client(base_url=url, timeout=120) as client:
+        sid = client.post("/interview/start", json={
+            "role": "Backend Engineer", "experience": "3 years", "persona": "coach",
+        }).json()["session_id"]
+        for number in range(1, questions + 1):
+            reply, audio = speak(client, mode, "feedback", sid, number, lambda: client.post(
+                "/interview/answer", json={"session_id": sid, "answer": ANSWER}).json())
+            results[(mode, "feedback")].append(audio)
+            if number < questions:
+                client.post("/interview/continue", json={"session_id": sid}).raise_for_status()
+        _, audio = speak(client, mode, "closing", sid, 0, lambda: client.post(
+            "/interview/end", json={"session_id": sid}).json())
+        results[(mode, "closing")].append(audio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sentence-pipelined speech")
+    parser.add_argument("--interviews", type=int, default=4, help="Per mode")
+    parser.add_argument("--questions", type=int, default=2, help="Answered before ending early")
+    parser.add_argument("--stub-ttft-ms", type=float, default=300.0)
+    parser.add_argument("--stub-tokens-per-sec", type=float, default=40.0)
+    parser.add_argument("--first-chunk-ms", type=float, default=150.0)
+    parser.add_argument("--realtime-factor", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8771)
+    args = parser.parse_args()
+
+    from backend.benchmarks.stub_ollama import StubOllamaServer
+
+    with StubOllamaServer(ttft_ms=args.stub_ttft_ms, tokens_per_sec=args.stub_tokens_per_sec, parallel=8) as stub:
+        # Read by backend.config and backend.llm on import
+        os.environ.update({
+            "SPEECH_PIPELINE": "true", "TTS_ENGINE": "fake", "LLM_BASE_URL_LARGE": stub.url,
+            "LLM_BASE_URL_SMALL": stub.url, "RATE_LIMIT_ENABLED": "false", "DEGRADE_ENABLED": "false",
+            "TRANSCRIPT_LOG_DIR": "", "RESULTS_STORE_DIR": "",
+        })
+        from backend.benchmarks.bench_tts import serve
+        from backend.tts import tts_engine
+
+        tts_engine._default_engine = tts_engine.FakeTTSEngine(args.first_chunk_ms, args.realtime_factor)
+        server, thread = serve(args.port)
+        results = defaultdict(list)
+        try:
+            for _ in range(args.interviews):
+                for mode in ("after reply", "pipelined"):
+                    run_interview(f"http://127.0.0.1:{args.port}", mode, args.questions, results)
+        finally:
+            server.should_exit = True
+            thread.join()
+
+    print(f"LLM: {args.stub_ttft_ms:.0f} ms to first token, {args.stub_tokens_per_sec:.0f} tokens/s; "
+          f"TTS: {args.first_chunk_ms:.0f} ms to first chunk, {args.realtime_factor:.0f}x real time")
+    print(f"{'utterance':<10} {'mode':<12} {'first audio p50':>16} {'last audio p50':>15} {'KB':>6} {'n':>4}")
+    for kind in ("feedback", "closing"):
+        for mode in ("after reply", "pipelined"):
+            runs = results[(mode, kind)]
+            print(f"{kind:<10} {mode:<12} {statistics.median(r[0] for r in runs):>13.0f} ms "
+                  f"{statistics.median(r[1] for r in runs):>12.0f} ms "
+                  f"{statistics.mean(r[2] for r in runs) / 1024:>6.1f} {len(runs):>4}")
+
+
+if __name__ == "__main__":
+    main()
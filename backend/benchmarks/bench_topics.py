@@ -0,0 +1,164 @@
+"""
+Topic canonicalization: lookup latency, and its effect on the question prompt.
+
+Part 1 times `TopicIndex.canonicalize` on a fresh index, for first lookups
+(embedding plus one matrix-vector product) and repeats (cache hits), and
+checks a hand-labelled set of topic spellings.
+
+Part 2 simulates interviews in which the evaluator reports each subject
+under one of several spellings, as models do. The same turns are replayed
+with raw topics (the previous behaviour: the spelling goes into the
+weak-topic set, joined in set order) and with canonical ones. For every
+question prompt, as `ask_question_agent` builds it, it reports:
+
+- weak topics in the prompt and tokens on the "Weak Topics" line
+- prefix cache hits: the prompt up to and including that line (everything
+  before the role description and previous questions) is the part one
+  session can share with another; a hit is a prefix already sent before
+
+    python -m backend.benchmarks.bench_topics --interviews 2000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from backend import agents
+from backend.config import MAX_QUESTIONS
+from backend.prescreen import estimate_tokens
+from backend.topics import TAXONOMY, TopicIndex
+
+STRONG_RATE = 0.3  # Share of answers that move the interview to hard questions
+
+# (expected canonical id or None for "learned", spellings an evaluator might report)
+SUBJECTS = {
+    "Backend Engineer": [
+        ("api_design", ["REST APIs", "RESTful API design", "REST API design", "API design", "Designing REST endpoints"]),
+        ("caching", ["Caching", "Caching strategies", "Cache invalidation", "Redis caching"]),
+        ("sql", ["Database indexing", "SQL query optimization", "Indexing strategies", "Query optimization"]),
+        ("messaging", ["Message queues", "Kafka", "Event-driven architecture", "Asynchronous messaging"]),
+        ("concurrency", ["Concurrency", "Race conditions", "Thread safety", "Concurrency control"]),
+        ("scalability", ["Scalability", "Horizontal scaling", "Rate limiting", "Load balancing"]),
+        ("distributed_systems", ["Distributed systems", "Idempotency", "Eventual consistency", "CAP theorem"]),
+        ("testing", ["Testing", "Unit testing", "Testing strategy", "Integration tests"]),
+    ],
+    "Frontend Engineer": [
+        ("frontend", ["React", "React hooks", "State management", "React state management"]),
+        ("web_performance", ["Web performance", "Page load performance", "Lazy loading", "Bundle size optimization"]),
+        ("accessibility", ["Accessibility", "Web accessibility", "WCAG compliance", "a11y"]),
+        ("testing", ["Testing", "Unit tests", "Component testing", "Frontend testing"]),
+        ("api_design", ["REST APIs", "API integration", "HTTP APIs", "GraphQL"]),
+        ("teamwork", ["Team collaboration", "Collaboration", "Working with designers"]),
+        ("conflict", ["Conflict resolution", "Handling disagreements", "Conflict with a coworker"]),
+        (None, ["Internationalization", "Internationalization (i18n)", "Internationalisation"]),
+    ],
+}
+
+
+class _CapturedPrompt:
+    """Stands in for question_llm: returns the messages instead of calling a model."""
+
+    def invoke(self, messages):
+        return messages
+
+
+def lookup_latency(rounds: int, seed: int):
+    rng = random.Random(seed)
+    suffixes = ["", " in practice", " at scale", " trade-offs", " for production systems", " basics"]
+    aliases = [alias for _, aliases in TAXONOMY.values() for alias in aliases]
+    spellings = [s for pool in SUBJECTS.values() for _, spelling in pool for s in spelling]
+    corpus = list(dict.fromkeys(rng.choice(aliases + spellings) + rng.choice(suffixes) for _ in range(rounds)))
+
+    index = TopicIndex()
+    first, repeat = [], []
+    for raw in corpus:
+        t = time.perf_counter_ns()
+        index.canonicalize(raw)
+        first.append((time.perf_counter_ns() - t) / 1000)
+    for raw in corpus:
+        t = time.perf_counter_ns()
+        index.canonicalize(raw)
+        repeat.append((time.perf_counter_ns() - t) / 1000)
+
+    print(f"Lookup latency ({len(corpus)} distinct topics, {index.stats()['aliases']} alias rows after the run)")
+    for label, values in (("first lookup", first), ("cached", repeat)):
+        values.sort()
+        print(f"  {label:<13} p50 {statistics.median(values):>7.1f} us   p99 {values[int(len(values) * 0.99)]:>7.1f} us")
+
+    index = TopicIndex()
+    correct = total = 0
+    for pool in SUBJECTS.values():
+        for expected, spelling in pool:
+            for raw in spelling:
+                topic = index.canonicalize(raw)
+                total += 1
+                correct += topic.id == expected or (expected is None and topic.id.startswith("learned:"))
+    print(f"  labelled spellings mapped to their subject: {correct}/{total}")
+
+
+def question_prompt(role: str, difficulty: str, number: int, weak_topics) -> str:
+    messages = agents.ask_question_agent({
+        "role": role, "experience": "3 years", "difficulty": difficulty, "question_count": number,
+        "weak_topics": weak_topics, "asked_questions": [], "role_description": "",
+    })
+    return "\n".join(m.content for m in messages)
+
+
+def simulate(interviews: int, questions: int, weak_rate: float, seed: int):
+    agents.question_llm = _CapturedPrompt()
+    rng = random.Random(seed)
+    results = {mode: {"weak": [], "line_tokens": [], "prompt_tokens": [], "hits": 0, "prefixes": set()}
+               for mode in ("raw", "canonical")}
+    index = TopicIndex()
+
+    for _ in range(interviews):
+        role = rng.choice(list(SUBJECTS))
+        turns = []
+        for _ in range(questions):
+            _, spellings = rng.choice(SUBJECTS[role])
+            outcome = rng.random()
+            turns.append((rng.choice(spellings), outcome < weak_rate, outcome >= 1 - STRONG_RATE))
+
+        for mode, result in results.items():
+            weak, difficulty = set(), "medium"
+            for number, (topic, is_weak, is_strong) in enumerate(turns):
+                prompt = question_prompt(role, difficulty, number, weak)
+                prefix = prompt.split("Role Description:")[0]
+                result["hits"] += prefix in result["prefixes"]
+                result["prefixes"].add(prefix)
+                result["weak"].append(len(weak))
+                line = next(l for l in prompt.splitlines() if l.startswith("Weak Topics:"))
+                result["line_tokens"].append(estimate_tokens(line))
+                result["prompt_tokens"].append(estimate_tokens(prompt))
+                if is_weak:
+                    weak.add(topic if mode == "raw" else index.label(topic))
+                    difficulty = "easy"
+                elif is_strong:
+                    difficulty = "hard"
+
+    prompts = interviews * questions
+    print(f"\nQuestion prompts ({interviews} interviews x {questions} questions, {len(SUBJECTS)} roles)")
+    print(f"  {'topics':<10} {'weak topics':>12} {'max':>4} {'line tokens':>12} {'prompt tokens':>14} "
+          f"{'distinct prefixes':>18} {'prefix hits':>12}")
+    for mode, r in results.items():
+        print(f"  {mode:<10} {statistics.mean(r['weak']):>12.2f} {max(r['weak']):>4} "
+              f"{statistics.mean(r['line_tokens']):>12.1f} {statistics.mean(r['prompt_tokens']):>14.1f} "
+              f"{len(r['prefixes']):>18} {r['hits'] / prompts:>11.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark topic canonicalization")
+    parser.add_argument("--lookups", type=int, default=5000)
+    parser.add_argument("--interviews", type=int, default=2000)
+    parser.add_argument("--questions", type=int, default=MAX_QUESTIONS)
+    parser.add_argument("--weak-rate", type=float, default=0.4, help="Share of answers scored as weak")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    lookup_latency(args.lookups, args.seed)
+    simulate(args.interviews, args.questions, args.weak_rate, args.seed)
+
+
+if __name__ == "__main__":
+    main()
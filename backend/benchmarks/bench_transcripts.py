@@ -0,0 +1,151 @@
+"""
+Cost of durable transcript logging on the request path.
+
+1. Append latency: the background group-commit log versus a naive
+   synchronous write + fsync per event, from concurrent producer threads.
+2. End to end: the backend is started twice on a stand-in LLM server, once
+   with TRANSCRIPT_LOG_DIR unset and once with fsync'd logging, and the same
+   concurrent interviews are run against both.
+
+    python -m backend.benchmarks.bench_transcripts --events 20000 --interviews 24
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+import httpx
+
+from backend.benchmarks.replay import percentile, spawn_backend
+from backend.benchmarks.stub_ollama import StubOllamaServer
+from backend.metrics import metrics
+from backend.transcripts import TranscriptLog
+
+EVENT = {
+    "answer": "I would add a read replica for reporting queries and cache the hottest keys, "
+              "then compare p95 latency before and after the change." * 3,
+}
+ANSWER = (
+    "I would profile the endpoint first, add an index for the filtered column, cache hot reads, "
+    "and compare p95 latency before and after each change."
+)
+
+
+def timed_appends(append, events: int, producers: int):
+    latencies = []
+    lock = threading.Lock()
+
+    def produce(n):
+        local = []
+        for i in range(n):
+            start = time.perf_counter()
+            append(f"session-{i % 200}", "answer", EVENT)
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=produce, args=(events // producers,)) for _ in range(producers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, time.perf_counter() - start
+
+
+def bench_appends(events: int, producers: int):
+    print(f"Append latency ({events} events, {producers} producer threads)")
+    print(f"{'writer':<22} {'p50 ms':>8} {'p99 ms':>8} {'events/s':>10} {'events/fsync':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        f = open(os.path.join(tmp, "sync.log"), "ab")
+        lock = threading.Lock()
+
+        def sync_append(session, event, data):
+            line = (json.dumps({"t": time.time(), "session": session, "event": event, "data": data}) + "\n").encode()
+            with lock:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+        latencies, wall = timed_appends(sync_append, events, producers)
+        f.close()
+        print(f"{'sync write+fsync':<22} {statistics.median(latencies):>8.3f} {percentile(latencies, 99):>8.3f} "
+              f"{events / wall:>10.0f} {1:>13.1f}")
+
+        metrics.reset()
+        log = TranscriptLog(os.path.join(tmp, "log"))
+        start = time.perf_counter()
+        latencies, _ = timed_appends(log.append, events, producers)
+        log.flush(timeout=60)
+        wall = time.perf_counter() - start
+        log.close()
+        per_commit = metrics.counter("transcripts.events") / max(metrics.counter("transcripts.commits"), 1)
+        print(f"{'group commit + fsync':<22} {statistics.median(latencies):>8.3f} {percentile(latencies, 99):>8.3f} "
+              f"{events / wall:>10.0f} {per_commit:>13.1f}")
+
+
+async def run_interview(client, latencies):
+    start = time.perf_counter()
+    resp = await client.post("/interview/start", json={"role": "Backend Engineer", "experience": "3 years"})
+    latencies["/interview/start"].append((time.perf_counter() - start) * 1000)
+    sid = resp.json()["session_id"]
+    while True:
+        start = time.perf_counter()
+        resp = await client.post("/interview/answer", json={"session_id": sid, "answer": ANSWER})
+        latencies["/interview/answer"].append((time.perf_counter() - start) * 1000)
+        if resp.status_code != 200 or resp.json().get("final"):
+            return
+
+
+async def run_load(url: str, interviews: int, concurrency: int):
+    latencies = defaultdict(list)
+    semaphore = asyncio.Semaphore(concurrency)
+    # Each session is one client, like a browser
+    headers = lambda i: {"x-api-key": f"bench-{i}"}
+
+    async def one(i):
+        async with semaphore:
+            async with httpx.AsyncClient(base_url=url, timeout=120, headers=headers(i)) as client:
+                await run_interview(client, latencies)
+
+    await asyncio.gather(*(one(i) for i in range(interviews)))
+    return latencies
+
+
+def bench_end_to_end(interviews: int, concurrency: int, port: int):
+    print(f"\nEnd to end ({interviews} interviews, concurrency {concurrency})")
+    print(f"{'transcripts':<12} {'endpoint':<20} {'p50 ms':>8} {'p95 ms':>8}")
+    with StubOllamaServer(ttft_ms=40, tokens_per_sec=2000, parallel=16) as stub, tempfile.TemporaryDirectory() as tmp:
+        for label, log_dir in (("off", ""), ("on + fsync", os.path.join(tmp, "transcripts"))):
+            proc = spawn_backend(port, stub.url, {"TRANSCRIPT_LOG_DIR": log_dir, "RESULTS_STORE_DIR": ""})
+            try:
+                latencies = asyncio.run(run_load(f"http://127.0.0.1:{port}", interviews, concurrency))
+            finally:
+                proc.terminate()
+                proc.wait()
+            for endpoint in sorted(latencies):
+                values = latencies[endpoint]
+                print(f"{label:<12} {endpoint:<20} {statistics.median(values):>8.1f} {percentile(values, 95):>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transcript logging overhead")
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--producers", type=int, default=8)
+    parser.add_argument("--interviews", type=int, default=24)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    bench_appends(args.events, args.producers)
+    bench_end_to_end(args.interviews, args.concurrency, args.port)
+
+
+if __name__ == "__main__":
+    main()
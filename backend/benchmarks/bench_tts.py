@@ -0,0 +1,108 @@
+"""
+Bytes per turn and time to first audio for synthesized speech.
+
+Runs the backend in-process on a local port with a timing- and size-faithful
+fake TTS engine and fetches typical interviewer turns over HTTP. "blob" is
+the previous behaviour: a complete WAV that can only be played once fully
+downloaded. Streamed formats can start playback on the first chunk.
+
+    python -m backend.benchmarks.bench_tts --first-chunk-ms 150 --realtime-factor 10
+"""
+
+import argparse
+import logging
+import statistics
+import threading
+import time
+
+import httpx
+import uvicorn
+
+from backend.tts import tts_engine
+from backend.tts.tts_engine import FakeTTSEngine
+
+TURNS = {
+    "question": (
+        "Tell me about a time you had to debug a production incident under pressure. "
+        "What was your first step, and how did you decide where to look?"
+    ),
+    "feedback": (
+        "Good answer overall. You explained the trade-off between consistency and availability clearly, "
+        "and your example of the payment service was concrete. To make it stronger, quantify the impact: "
+        "how much latency did the cache remove, and what was the error budget before and after? "
+        "Also mention how you validated the fix before rolling it out to every region."
+    ),
+    "closing": (
+        "Thank you for your time today. You showed solid fundamentals in system design and communicated "
+        "your reasoning well, especially when discussing caching and failure modes. Your strongest areas were "
+        "incident response and API design. To improve, practise structuring answers with a clear situation, "
+        "action and result, and bring measurable outcomes into each story. Spend some time on database indexing "
+        "and query planning, which came up as a weaker area. Overall this was a promising interview, and with "
+        "a little more depth on data modelling you would be well prepared for a senior role. Best of luck."
+    ),
+}
+MODES = [("blob", "wav"), ("stream", "wav"), ("stream", "mp3"), ("stream", "ogg")]
+
+
+def serve(port: int):
+    from backend.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def fetch(client: httpx.Client, session_id: str, text: str, audio_format: str):
+    """Return (time to first byte ms, total ms, bytes) for one synthesis request."""
+    start = time.perf_counter()
+    first = None
+    size = 0
+    with client.stream("POST", "/speech/synthesize", json={"session_id": session_id, "text": text, "format": audio_format}) as resp:
+        resp.raise_for_status()
+        for chunk in resp.iter_bytes():
+            if first is None and chunk:
+                first = time.perf_counter()
+            size += len(chunk)
+    end = time.perf_counter()
+    return ((first or end) - start) * 1000, (end - start) * 1000, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark synthesized speech delivery")
+    parser.add_argument("--first-chunk-ms", type=float, default=150.0)
+    parser.add_argument("--realtime-factor", type=float, default=10.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    tts_engine._default_engine = FakeTTSEngine(
+        first_chunk_ms=args.first_chunk_ms, realtime_factor=args.realtime_factor
+    )
+    server, thread = serve(args.port)
+    from backend.main import create_session
+
+    session_id = create_session("strict")  # Synthesis is only served to active sessions
+
+    print(f"{'turn':<10} {'mode':<7} {'format':<6} {'KB/turn':>9} {'first audio ms':>15} {'complete ms':>12}")
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{args.port}", timeout=60) as client:
+            for turn, text in TURNS.items():
+                for mode, audio_format in MODES:
+                    runs = [fetch(client, session_id, text, audio_format) for _ in range(args.repeat)]
+                    ttfb = statistics.median(r[0] for r in runs)
+                    total = statistics.median(r[1] for r in runs)
+                    # A blob is only playable once it has fully arrived
+                    first_audio = total if mode == "blob" else ttfb
+                    print(f"{turn:<10} {mode:<7} {audio_format:<6} {runs[0][2] / 1024:>9.1f} "
+                          f"{first_audio:>15.0f} {total:>12.0f}")
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
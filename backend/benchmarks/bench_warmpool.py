@@ -0,0 +1,102 @@
+"""
+/interview/start latency with and without the warm pool.
+
+Starts arrive as a Poisson process. Most go to a few popular (role,
+experience, persona) combinations and the rest to one-off roles that the pool
+never warms. The backend is started twice on a stand-in LLM server, with the
+pool off and on, and the same arrival schedule is replayed against both.
+
+    python -m backend.benchmarks.bench_warmpool --rate 1.5 --duration 90
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections import defaultdict
+
+import httpx
+
+from backend.benchmarks.replay import percentile, spawn_backend
+from backend.benchmarks.stub_ollama import StubOllamaServer
+
+POPULAR = [
+    ({"role": "Backend Engineer", "experience": "3 years", "persona": "strict"}, 0.45),
+    ({"role": "Frontend Engineer", "experience": "Junior", "persona": "coach"}, 0.25),
+    ({"role": "Data Scientist", "experience": "5 years", "persona": "strict"}, 0.15),
+]
+
+
+def schedule(rate: float, duration: float, seed: int):
+    """(offset seconds, request body, popular?) arrivals."""
+    rng = random.Random(seed)
+    arrivals, t = [], 0.0
+    while True:
+        t += rng.expovariate(rate)
+        if t >= duration:
+            return arrivals
+        pick = rng.random()
+        for body, share in POPULAR:
+            if pick < share:
+                arrivals.append((t, body, True))
+                break
+            pick -= share
+        else:
+            arrivals.append((t, {"role": f"Niche Role {rng.randint(1, 10**6)}", "experience": "2 years"}, False))
+
+
+async def replay(url: str, arrivals):
+    latencies = defaultdict(list)
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        start = time.monotonic()
+
+        async def one(offset, body, popular):
+            await asyncio.sleep(max(0.0, offset - (time.monotonic() - start)))
+            t = time.perf_counter()
+            resp = await client.post("/interview/start", json=body)
+            if resp.status_code == 200:
+                latencies["popular" if popular else "long tail"].append((time.perf_counter() - t) * 1000)
+
+        await asyncio.gather(*(one(*a) for a in arrivals))
+        warm = (await client.get("/metrics")).json()["warm_pool"]
+        counters = (await client.get("/metrics")).json()["counters"]
+    return latencies, warm, counters
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /interview/start with the warm pool")
+    parser.add_argument("--rate", type=float, default=1.5, help="Starts per second")
+    parser.add_argument("--duration", type=float, default=90.0)
+    parser.add_argument("--stub-ttft-ms", type=float, default=400.0)
+    parser.add_argument("--stub-tokens-per-sec", type=float, default=60.0)
+    parser.add_argument("--port", type=int, default=8769)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    arrivals = schedule(args.rate, args.duration, args.seed)
+    print(f"{len(arrivals)} starts over {args.duration:.0f}s ({sum(a[2] for a in arrivals)} to popular combinations)")
+    print(f"{'warm pool':<10} {'combination':<10} {'p50 ms':>8} {'p99 ms':>8} {'n':>5}")
+    with StubOllamaServer(ttft_ms=args.stub_ttft_ms, tokens_per_sec=args.stub_tokens_per_sec, parallel=16) as stub:
+        for label, flag in (("off", "false"), ("on", "true")):
+            proc = spawn_backend(args.port, stub.url, {
+                "WARM_POOL_ENABLED": flag, "RATE_LIMIT_ENABLED": "false", "DEGRADE_ENABLED": "false",
+                "TRANSCRIPT_LOG_DIR": "", "RESULTS_STORE_DIR": "",
+            })
+            try:
+                latencies, warm, counters = asyncio.run(replay(f"http://127.0.0.1:{args.port}", arrivals))
+            finally:
+                proc.terminate()
+                proc.wait()
+            for group in ("popular", "long tail"):
+                values = latencies[group]
+                print(f"{label:<10} {group:<10} {statistics.median(values):>8.1f} "
+                      f"{percentile(values, 99):>8.1f} {len(values):>5}")
+            if warm["enabled"]:
+                print(f"{'':<10} hit rate {warm['hit_rate']:.0%} on all starts, "
+                      f"{counters.get('warm_pool.filled', 0):.0f} pre-started, "
+                      f"{warm['ready']} left unclaimed at the end")
+
+
+if __name__ == "__main__":
+    main()
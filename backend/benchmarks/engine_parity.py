@@ -0,0 +1,212 @@
+"""
+Parity check: the native engine against the LangGraph graphs.
+
+Every flow (strict, strict fused, coach) runs a set of scripted sessions on
+both engines, driven the way `main.py` drives them (start, answer, proceed,
+early end, state lookups, thread deletion). The LLMs are replaced by
+deterministic scripted ones that derive their replies from the prompt, so
+both engines see identical model output. After every step the invoke
+result, the `get_state` snapshot and the session read model are compared.
+
+    python -m backend.benchmarks.engine_parity
+
+Exits non-zero on the first mismatch in any scenario. The same scenarios run
+under pytest in `backend/tests/test_engine_parity.py`.
+"""
+
+import json
+import re
+import sys
+import zlib
+from uuid import uuid4
+
+from langgraph.types import Command
+
+from backend import agents
+from backend.graph import (
+    build_graph_strict,
+    build_graph_strict_fused,
+    build_graph_coach,
+    build_native_strict,
+    build_native_strict_fused,
+    build_native_coach,
+)
+from backend.models import EvaluationWithFeedback, FusedTurn, Question, SpokenClosing, SpokenTransition
+from backend.nodes import END_EARLY_SIGNAL
+from backend.sessionstate import session_states
+
+STRONG = "I would shard by tenant, keep writes idempotent and measure p99 before and after every change."
+AVERAGE = "I would probably add a cache and some monitoring, then see what happens in production."
+WEAK = "Maybe restart the server when it gets slow, that usually fixes things for a while."
+DONT_KNOW = "I don't know"
+
+TOPICS = ["Caching strategies", "REST API design", "Database indexing", "Message queues", "Observability"]
+
+FLOWS = {
+    "strict": (build_graph_strict, build_native_strict),
+    "strict fused": (build_graph_strict_fused, build_native_strict_fused),
+    "coach": (build_graph_coach, build_native_coach),
+}
+
+# Actions: ("answer", text), ("continue",), ("end",), ("state",)
+SCENARIOS = {
+    "complete": [("answer", STRONG), ("continue",), ("answer", WEAK), ("continue",), ("state",),
+                 ("answer", AVERAGE), ("continue",), ("answer", DONT_KNOW), ("continue",),
+                 ("answer", STRONG), ("continue",), ("state",)],
+    "weak run": [("answer", WEAK), ("continue",), ("answer", WEAK), ("continue",), ("answer", ""),
+                 ("continue",), ("answer", WEAK), ("continue",), ("answer", WEAK), ("continue",)],
+    "end at question": [("answer", STRONG), ("continue",), ("state",), ("end",), ("state",)],
+    "end at feedback": [("answer", AVERAGE), ("continue",), ("answer", STRONG), ("end",), ("state",)],
+    "end before answering": [("state",), ("end",), ("end",)],
+    "resume finished": [("answer", STRONG), ("continue",), ("end",), ("answer", STRONG), ("state",)],
+}
+
+
+def _score(answer: str) -> float:
+    return {STRONG: 8.5, AVERAGE: 6.0, WEAK: 3.0}.get(answer.strip(), 5.0)
+
+
+def _answer(text: str) -> str:
+    return text.split("Candidate Answer:")[-1].strip()
+
+
+class ScriptedLLM:
+    """Stands in for a RoutedLLM: a reply derived only from the prompt text."""
+
+    def __init__(self, reply):
+        self.reply = reply
+
+    def invoke(self, messages, **kwargs):
+        return self.reply("\n".join(m.content for m in messages))
+
+    def invoke_streaming(self, messages, on_text, **kwargs):
+        result = self.invoke(messages)
+        on_text(json.dumps(result.model_dump()))
+        return result
+
+
+def _question(text: str) -> Question:
+    number = re.search(r"Question Number: (\d+)", text).group(1)
+    difficulty = re.search(r"Difficulty: (\w+)", text).group(1)
+    return Question(question=f"Question {number} ({difficulty}): how would you handle case {number}?")
+
+
+def _evaluation(text: str) -> EvaluationWithFeedback:
+    answer = _answer(text)
+    return EvaluationWithFeedback(
+        score=_score(answer),
+        topic=TOPICS[zlib.crc32(answer.encode()) % len(TOPICS)],
+        feedback=f"Feedback on '{answer[:24]}'. Add a concrete example next time.",
+        strengths=["Clear structure"],
+        weaknesses=["Few specifics"],
+    )
+
+
+def _fused(text: str) -> FusedTurn:
+    ev = _evaluation(text)
+    number = re.search(r"Next Question Number: (\d+)", text).group(1)
+    next_difficulty = "easy" if ev.score < 5 else "hard"
+    return FusedTurn(
+        **ev.model_dump(), next_difficulty=next_difficulty, transition="Let's keep going.",
+        next_question=f"Question {number} ({next_difficulty}): what would you change in case {number}?",
+    )
+
+
+def install_scripted_llms():
+    agents.question_llm = ScriptedLLM(_question)
+    agents.evaluation_with_feedback_llm = ScriptedLLM(_evaluation)
+    agents.fused_turn_llm = ScriptedLLM(_fused)
+    agents.transition_llm = ScriptedLLM(lambda text: SpokenTransition(transition="Thanks, next one."))
+    agents.closing_llm = ScriptedLLM(lambda text: SpokenClosing(spoken_closing="Thank you for your time."))
+
+
+def initial_state(persona: str) -> dict:
+    return {
+        "role": "Backend Engineer", "experience": "3 years", "persona": persona, "role_description": None,
+        "current_question": None, "last_answer_text": None, "evaluation": None, "feedback": None,
+        "evaluations_history": [], "score_history": [], "weak_topics": set(), "difficulty": "easy",
+        "question_count": 0, "end_interview": False, "asked_questions": [], "summary": None,
+        "spoken_transition": None, "spoken_closing": None,
+    }
+
+
+def _plain(value):
+    """Comparable form of graph output: models as dicts, sets sorted, interrupts as their values."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if type(value).__name__ == "Interrupt":
+        return {"interrupt": _plain(value.value)}
+    return value
+
+
+def run_scenario(graph, persona: str, actions):
+    """Drive one session as main.py would; returns the observations after each step."""
+    thread_id = str(uuid4())
+    config = {"configurable": {"thread_id": thread_id}}
+    observations = []
+
+    def observe(label, result):
+        snapshot = graph.get_state(config)
+        record = dict(session_states.get(thread_id) or {})
+        record.pop("updated_at", None)
+        observations.append((label, _plain(result), _plain(snapshot.values), bool(snapshot.next), record))
+
+    observe("start", graph.invoke(initial_state(persona), config=config))
+    for action in actions:
+        if action[0] == "answer":
+            observe("answer", graph.invoke(Command(resume=action[1]), config=config))
+        elif action[0] == "continue":
+            if persona == "coach":
+                observe("continue", graph.invoke(Command(resume="[Proceed]"), config=config))
+        elif action[0] == "end":
+            snapshot = graph.get_state(config)
+            result = dict(snapshot.values or {})
+            if snapshot.next and not result.get("summary"):
+                result = graph.invoke(Command(resume=END_EARLY_SIGNAL), config=config)
+            observe("end", result)
+        else:
+            observe("state", None)
+
+    graph.checkpointer.delete_thread(thread_id)
+    snapshot = graph.get_state(config)
+    observations.append(("deleted", None, _plain(snapshot.values), bool(snapshot.next), None))
+    session_states.discard(thread_id)
+    return observations
+
+
+def first_difference(expected, actual):
+    for step, (a, b) in enumerate(zip(expected, actual)):
+        for name, x, y in zip(("result", "state", "paused", "read model"), a[1:], b[1:]):
+            if x != y:
+                keys = sorted(k for k in set(x or {}) | set(y or {}) if (x or {}).get(k) != (y or {}).get(k)) \
+                    if isinstance(x, dict) and isinstance(y, dict) else []
+                return f"step {step} ({a[0]}): {name} differs" + (f" in {keys}" if keys else f": {x!r} != {y!r}")
+    if len(expected) != len(actual):
+        return f"{len(expected)} steps on LangGraph, {len(actual)} on native"
+    return None
+
+
+def main():
+    install_scripted_llms()
+    failures = 0
+    for flow, (build_graph, build_native) in FLOWS.items():
+        graph, machine = build_graph(), build_native()
+        persona = "coach" if flow == "coach" else "strict"
+        for name, actions in SCENARIOS.items():
+            expected = run_scenario(graph, persona, actions)
+            actual = run_scenario(machine, persona, actions)
+            difference = first_difference(expected, actual)
+            failures += difference is not None
+            print(f"{flow:<13} {name:<22} {len(expected):>3} steps  {'FAIL: ' + difference if difference else 'ok'}")
+    print(f"\n{failures} mismatching scenario(s)" if failures else "\nAll scenarios match")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Replay captured traffic traces against a running backend.
+
+Traces come from TrafficCaptureMiddleware (TRAFFIC_CAPTURE_PATH). Each
+captured session is replayed in order with its original inter-arrival gaps
+divided by --speed; answers, interim transcripts and spoken text are
+synthesized at the recorded length. Speech streams run alongside the
+requests that produce their text, as the browser opens them. A spawned
+backend uses the fake TTS engine, so speech costs no Azure calls.
+
+    # Against a backend you already started
+    python -m backend.benchmarks.replay traces/traffic.jsonl.gz --url http://127.0.0.1:8000 --speed 10
+
+    # Spawn a backend wired to a stand-in LLM server
+    python -m backend.benchmarks.replay traces/traffic.jsonl.gz --spawn --speed 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Optional
+
+import httpx
+
+from backend.benchmarks.stub_ollama import StubOllamaServer
+from backend.traffic import load_traces
+
+FILLER = "I would start by measuring the bottleneck, then change one thing at a time and compare. "
+REPLAYED_ENDPOINTS = {
+    "/interview/start",
+    "/interview/answer",
+    "/interview/partial",
+    "/interview/continue",
+    "/interview/hint",
+    "/interview/end",
+    "/speech/synthesize",
+    "/interview/{session_id}/speech/feedback",
+    "/interview/{session_id}/speech/closing",
+}
+# Replayed load must not be throttled or shed by the backend it measures
+SPAWN_ENV = {
+    "TTS_ENGINE": "fake", "SPEECH_PIPELINE": "true", "RATE_LIMIT_ENABLED": "false", "DEGRADE_ENABLED": "false",
+}
+
+
+def synth_answer(chars: int) -> str:
+    return (FILLER * (chars // len(FILLER) + 1))[:chars]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    idx = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[idx]
+
+
+def group_sessions(records):
+    """Split trace records into per-session event lists (in arrival order)."""
+    sessions = defaultdict(list)
+    skipped = 0
+    for rec in records:
+        if rec["endpoint"] not in REPLAYED_ENDPOINTS or not rec.get("session"):
+            skipped += 1
+            continue
+        sessions[rec["session"]].append(rec)
+    return sessions, skipped
+
+
+async def send(client, method, endpoint, url, payload, latencies, errors):
+    """One replayed request; returns the response, or None after an error status or transport error."""
+    start = time.perf_counter()
+    try:
+        if method == "GET":
+            resp = await client.get(url)
+        else:
+            resp = await client.post(url, json=payload)
+        # A 4xx (e.g. a 429 on /interview/start) leaves the session without an id, so it is an error too
+        ok = resp.status_code < 400
+    except httpx.HTTPError:
+        resp, ok = None, False
+    latencies[endpoint].append((time.perf_counter() - start) * 1000)
+    if not ok:
+        errors[endpoint] += 1
+        return None
+    return resp
+
+
+async def replay_session(client, events, t0, speed, latencies, errors):
+    live_sid = None
+    streams = []
+    for rec in events:
+        delay = t0 + rec["t"] / speed - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        endpoint = rec["endpoint"]
+        if endpoint == "/interview/start":
+            payload = {
+                "role": "Software Engineer",
+                "experience": "3 years",
+                "role_description": synth_answer(rec.get("role_description_chars", 0)) or None,
+                "persona": rec.get("persona") or "strict",
+            }
+        elif live_sid is None:
+            continue  # Session started before the capture window
+        elif endpoint == "/interview/answer":
+            payload = {"session_id": live_sid, "answer": synth_answer(rec.get("answer_chars", 0))}
+        elif endpoint in ("/interview/partial", "/speech/synthesize"):
+            payload = {"session_id": live_sid, "text": synth_answer(rec.get("text_chars", 0)) or "."}
+        else:
+            payload = {"session_id": live_sid}
+
+        url = endpoint.replace("{session_id}", live_sid or "")
+        if rec.get("method") == "GET":
+            # Speech streams wait for text that the next request produces
+            url += f"?number={rec.get('number', 0)}"
+            streams.append(asyncio.create_task(send(client, "GET", endpoint, url, None, latencies, errors)))
+            continue
+        resp = await send(client, "POST", endpoint, url, payload, latencies, errors)
+        if resp is None:
+            break
+        if endpoint == "/interview/start":
+            live_sid = resp.json().get("session_id")
+    await asyncio.gather(*streams)
+
+
+async def replay(records, url, speed, timeout):
+    sessions, skipped = group_sessions(records)
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    limits = httpx.Limits(max_connections=1000, max_keepalive_connections=1000)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+        t0 = time.monotonic() - records[0]["t"] / speed if records else time.monotonic()
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            replay_session(client, events, t0, speed, latencies, errors)
+            for events in sessions.values()
+        ))
+        wall = time.perf_counter() - started
+    return latencies, errors, skipped, len(sessions), wall
+
+
+def spawn_backend(port: int, stub_url: str, extra_env: Optional[dict] = None, server_args: Optional[list] = None):
+    """Start the backend on the stand-in LLM; `server_args` replaces the default uvicorn command line."""
+    env = dict(os.environ, LLM_BASE_URL_LARGE=stub_url, LLM_BASE_URL_SMALL=stub_url, **(extra_env or {}))
+    args = server_args or ["-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"]
+    proc = subprocess.Popen([sys.executable, *args], env=env)
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health", timeout=0.5)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("Backend did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay captured traffic traces")
+    parser.add_argument("trace", help="Trace file written by TrafficCaptureMiddleware")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier (1-50)")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--spawn", action="store_true", help="Start a backend on a stand-in LLM server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--stub-ttft-ms", type=float, default=300.0)
+    parser.add_argument("--stub-tokens-per-sec", type=float, default=60.0)
+    args = parser.parse_args()
+
+    if not 1 <= args.speed <= 50:
+        parser.error("--speed must be between 1 and 50")
+
+    records = load_traces(args.trace)
+    stub = proc = None
+    url = args.url
+    if args.spawn:
+        stub = StubOllamaServer(
+            ttft_ms=args.stub_ttft_ms, tokens_per_sec=args.stub_tokens_per_sec, parallel=8
+        ).start()
+        proc = spawn_backend(args.port, stub.url, SPAWN_ENV)
+        url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        latencies, errors, skipped, n_sessions, wall = asyncio.run(
+            replay(records, url, args.speed, args.timeout)
+        )
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+        if stub:
+            stub.stop()
+
+    print(f"Replayed {n_sessions} sessions ({len(records)} records, {skipped} skipped) "
+          f"at {args.speed}x in {wall:.1f}s")
+    print(f"{'endpoint':<40} {'n':>6} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for endpoint in sorted(latencies):
+        values = latencies[endpoint]
+        print(
+            f"{endpoint:<40} {len(values):>6} {errors[endpoint]:>5} "
+            f"{statistics.median(values):>9.0f} {percentile(values, 95):>9.0f} "
+            f"{percentile(values, 99):>9.0f} {max(values):>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Drive the degradation controller with a model server that slows down and recovers.
+
+A stand-in Ollama server answers every route. Interviews run continuously
+through the strict graph (with a hint every few questions) while the server's
+latency goes healthy -> slow -> healthy, after a short warm-up that is not
+measured (first calls open connections and are slower). Controller timings
+are shortened so a full cycle takes about a minute; the timeline shows the
+level stepping up under load and back down with hysteresis once latency
+recovers. Pass/fail checks of the same behaviour are in
+backend/tests/test_degrade.py.
+
+    python -m backend.benchmarks.sim_degradation --slow-ttft-ms 2500 --concurrency 8
+"""
+
+import argparse
+import itertools
+import logging
+import threading
+import time
+from uuid import uuid4
+
+from langgraph.types import Command
+
+from backend import llm as llm_module
+from backend.agents import hint_agent
+from backend.benchmarks.stub_ollama import StubOllamaServer
+from backend.config import MODEL_LARGE, MODEL_SMALL
+from backend.degrade import LEVELS, degradation
+from backend.graph import build_graph_strict
+from backend.metrics import metrics
+
+ANSWER = (
+    "I would start by profiling the slow endpoint, then add an index on the filtered column "
+    "and cache the hot reads, measuring p95 latency before and after each change."
+)
+
+
+def run_interviews(graph, stop: threading.Event, hint_every: int):
+    """Run back-to-back interviews until `stop` is set."""
+    for n in itertools.count():
+        if stop.is_set():
+            return
+        config = {"configurable": {"thread_id": str(uuid4())}}
+        result = graph.invoke({
+            "role": "Backend Engineer", "experience": "3 years", "role_description": None, "persona": "strict",
+            "current_question": None, "last_answer_text": None, "evaluation": None, "feedback": None,
+            "evaluations_history": [], "score_history": [], "weak_topics": set(), "difficulty": "easy",
+            "question_count": 0, "end_interview": False, "asked_questions": [], "summary": None,
+            "spoken_transition": None, "spoken_closing": None,
+        }, config=config)
+        for turn in itertools.count():
+            if "__interrupt__" not in result or stop.is_set():
+                break
+            question = result["__interrupt__"][0].value["prompt"]
+            if (n + turn) % hint_every == 0:
+                if degradation.sheds("no_hints"):
+                    metrics.incr("sim.hints_refused")
+                else:
+                    hint_agent(question, "Backend Engineer", "3 years")
+            result = graph.invoke(Command(resume=ANSWER), config=config)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate degradation under a slow model server")
+    parser.add_argument("--healthy-ttft-ms", type=float, default=60.0)
+    parser.add_argument("--slow-ttft-ms", type=float, default=2500.0)
+    parser.add_argument("--phase-seconds", type=float, nargs=3, default=[10, 25, 30],
+                        metavar=("HEALTHY", "SLOW", "RECOVERED"))
+    parser.add_argument("--warmup-seconds", type=float, default=5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--hint-every", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    stub = StubOllamaServer(ttft_ms=args.healthy_ttft_ms, tokens_per_sec=4000, parallel=8).start()
+    llm_module.MODEL_BASE_URLS[MODEL_LARGE] = stub.url
+    llm_module.MODEL_BASE_URLS[MODEL_SMALL] = stub.url
+    llm_module.set_routing_profile("single")
+
+    # Same logic, compressed timescale
+    degradation.slo_ms = {route: 1000 for route in ("question", "evaluation", "transition", "hint", "closing")}
+    degradation.window_seconds = 5
+    degradation.step_seconds = 2
+    degradation.recover_seconds = 5
+    degradation.hold_seconds = 20
+
+    graph = build_graph_strict()
+
+    def start_workers(stop):
+        workers = [
+            threading.Thread(target=run_interviews, args=(graph, stop, args.hint_every), daemon=True)
+            for _ in range(args.concurrency)
+        ]
+        for w in workers:
+            w.start()
+        return workers
+
+    warmup = threading.Event()
+    workers = start_workers(warmup)
+    time.sleep(args.warmup_seconds)
+    warmup.set()
+    for w in workers:
+        w.join()
+    degradation.reset()
+    metrics.reset()
+
+    stop = threading.Event()
+    start_workers(stop)
+
+    healthy, slow, recovered = args.phase_seconds
+    phases = [("healthy", args.healthy_ttft_ms, healthy), ("slow", args.slow_ttft_ms, slow),
+              ("recovered", args.healthy_ttft_ms, recovered)]
+    start = time.monotonic()
+    requests_before = stub.requests
+
+    timeline = []
+    print(f"{'t s':>5} {'phase':<10} {'level':<18} {'pressure':>8} {'in flight':>9} {'llm calls':>9}")
+    for phase, ttft, seconds in phases:
+        stub.ttft_ms = ttft
+        phase_end = time.monotonic() + seconds
+        while time.monotonic() < phase_end:
+            time.sleep(1)
+            s = degradation.stats()
+            timeline.append((time.monotonic() - start, s["level"]))
+            print(f"{time.monotonic() - start:>5.0f} {phase:<10} {s['level']} {s['name']:<16} "
+                  f"{s['pressure']:>8.2f} {s['in_flight']:>9} {stub.requests - requests_before:>9}")
+
+    stop.set()
+    slow_end = healthy + slow
+    print(f"\nHealthy phase stayed normal: {all(level == 0 for t, level in timeline if t <= healthy)}")
+    print(f"Escalated while slow: {any(level > 0 for t, level in timeline if healthy < t <= slow_end)}")
+    print(f"Back to normal after recovery: {timeline[-1][1] == 0}")
+    print("\nShed work:")
+    for feature in LEVELS[1:]:
+        print(f"  {feature:<18} {metrics.counter(f'degradation.shed.{feature}'):>6.0f}")
+    print(f"  level changes      {metrics.counter('degradation.level_changes'):>6.0f}")
+    stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Simulate adaptive early stopping over synthetic score sequences.
+
+Each synthetic candidate has an underlying mean score and a consistency
+(per-answer standard deviation); answers are scored on the evaluator's
+half-point scale. Every candidate is interviewed at full length and with
+adaptive stopping, for a grid of confidence levels and minimum question
+counts. Reported per setting:
+
+- average questions asked and LLM calls saved per interview (a strict-persona
+  turn is 3 calls: evaluation, transition, next question)
+- how often the early verdict matches the full-length verdict, and the
+  candidate's true band (for comparison, the full-length verdict's own
+  agreement with the true band)
+
+    python -m backend.benchmarks.sim_stopping --candidates 20000
+"""
+
+import argparse
+import random
+import statistics
+
+from backend.config import MAX_QUESTIONS, STOPPING_PRIOR_SD, STOPPING_PRIOR_WEIGHT
+from backend.stopping import check_settings, should_stop, verdict_band
+
+CALLS_PER_TURN = 3
+
+
+def synthetic_candidate(rng: random.Random, max_questions: int):
+    ability = rng.uniform(1.0, 9.5)
+    consistency = rng.uniform(0.5, 2.5)
+    scores = [min(10.0, max(0.0, round(rng.gauss(ability, consistency) * 2) / 2)) for _ in range(max_questions)]
+    return ability, scores
+
+
+def asked_until_stop(scores, min_questions, max_questions, confidence, prior_sd, prior_weight) -> int:
+    for n in range(1, max_questions + 1):
+        if should_stop(scores[:n], min_questions, max_questions, confidence, prior_sd, prior_weight):
+            return n
+    return max_questions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate adaptive early stopping")
+    parser.add_argument("--candidates", type=int, default=20000)
+    parser.add_argument("--max-questions", type=int, default=MAX_QUESTIONS)
+    parser.add_argument("--confidence", type=float, nargs="+", default=[0.8, 0.9, 0.95])
+    parser.add_argument("--min-questions", type=int, nargs="+", default=[2, 3])
+    parser.add_argument("--prior-sd", type=float, default=STOPPING_PRIOR_SD)
+    parser.add_argument("--prior-weight", type=float, default=STOPPING_PRIOR_WEIGHT)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for confidence in args.confidence:
+        for min_questions in args.min_questions:
+            try:
+                check_settings(min_questions, args.max_questions, confidence, args.prior_weight)
+            except ValueError as e:
+                parser.error(str(e))
+
+    rng = random.Random(args.seed)
+    candidates = [synthetic_candidate(rng, args.max_questions) for _ in range(args.candidates)]
+    full_verdicts = [verdict_band(statistics.mean(scores)) for _, scores in candidates]
+    true_bands = [verdict_band(ability) for ability, _ in candidates]
+    full_vs_true = sum(f == t for f, t in zip(full_verdicts, true_bands)) / len(candidates)
+
+    print(f"{args.candidates} synthetic candidates, up to {args.max_questions} questions; "
+          f"full-length verdict matches true band {full_vs_true:.1%}")
+    print(f"{'confidence':>10} {'min q':>6} {'avg q':>6} {'ended early':>12} {'calls saved':>12} "
+          f"{'= full verdict':>15} {'= true band':>12}")
+    for confidence in args.confidence:
+        for min_questions in args.min_questions:
+            asked, same_as_full, same_as_true = [], 0, 0
+            for (ability, scores), full, true in zip(candidates, full_verdicts, true_bands):
+                n = asked_until_stop(scores, min_questions, args.max_questions, confidence,
+                                     args.prior_sd, args.prior_weight)
+                verdict = verdict_band(statistics.mean(scores[:n]))
+                asked.append(n)
+                same_as_full += verdict == full
+                same_as_true += verdict == true
+            total = len(candidates)
+            avg_asked = statistics.mean(asked)
+            print(f"{confidence:>10.2f} {min_questions:>6} {avg_asked:>6.2f} "
+                  f"{sum(n < args.max_questions for n in asked) / total:>12.1%} "
+                  f"{(args.max_questions - avg_asked) * CALLS_PER_TURN:>12.2f} "
+                  f"{same_as_full / total:>15.1%} {same_as_true / total:>12.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Local stand-in for an Ollama server, used by the benchmarks.
+
+Answers /api/chat with JSON that satisfies the requested `format` schema,
+after a simulated delay of `ttft_ms + tokens / tokens_per_sec`. Streaming
+requests get their tokens at that rate after the first-token delay. At most
+`parallel` requests are generated at once, like a real server's slot limit.
+
+/v1/completions (OpenAI-compatible) takes a list of prompts, with the schema
+as `guided_json`, and answers them as one batch in one slot. Prefill is
+compute-bound, so `ttft_ms` is paid per prompt; decoding is memory-bound, so
+each extra sequence adds only `batch_cost` of the single-sequence decode time.
+"""
+
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    "candidate explained the trade offs between consistency and availability "
+    "with a concrete example from a production incident and a clear structure"
+).split()
+
+
+# Spoken multi-sentence fields
+PARAGRAPH_FIELDS = {"feedback", "spoken_closing"}
+
+
+def sentence(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 18))).capitalize() + "."
+
+
+def sample_from_schema(schema: dict, rng: random.Random, defs: dict = None, name: str = None) -> object:
+    """Produce a value that validates against a (Pydantic-generated) JSON schema."""
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return sample_from_schema(defs[schema["$ref"].split("/")[-1]], rng, defs)
+    if "anyOf" in schema:
+        return sample_from_schema(schema["anyOf"][0], rng, defs, name)
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+
+    kind = schema.get("type", "object")
+    if kind == "object":
+        return {
+            prop_name: sample_from_schema(prop, rng, defs, prop_name)
+            for prop_name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return [sample_from_schema(schema.get("items", {}), rng, defs) for _ in range(2)]
+    if kind == "number":
+        return round(rng.uniform(2.0, 9.5), 1)
+    if kind == "integer":
+        return rng.randint(1, 10)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    if name in PARAGRAPH_FIELDS:
+        return " ".join(sentence(rng) for _ in range(rng.randint(3, 5)))
+    return sentence(rng)
+
+
+class StubOllamaServer:
+    """Threaded HTTP server that imitates Ollama's chat API."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        ttft_ms: float = 200.0,
+        tokens_per_sec: float = 50.0,
+        parallel: int = 4,
+        seed: int = 0,
+        batch_cost: float = 0.15,
+    ):
+        self.ttft_ms = ttft_ms
+        self.tokens_per_sec = tokens_per_sec
+        self.batch_cost = batch_cost
+        self.batch_sizes: list[int] = []
+        self.slots = threading.BoundedSemaphore(parallel)
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.requests = 0
+        self.models_seen: dict[str, int] = {}
+        self.fail_models: set[str] = set()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubOllamaServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def generate(self, body: dict) -> str:
+        """Return the assistant message content for a chat request."""
+        fmt = body.get("format")
+        with self.rng_lock:
+            if isinstance(fmt, dict):
+                return json.dumps(sample_from_schema(fmt, self.rng))
+            return " ".join(self.rng.choice(WORDS) for _ in range(20))
+
+    def _simulate(self, content: str):
+        tokens = max(len(content) // 4, 1)
+        time.sleep(self.ttft_ms / 1000 + tokens / self.tokens_per_sec)
+
+    def _simulate_batch(self, contents: list):
+        tokens = max(max(len(c) // 4, 1) for c in contents)
+        decode = tokens / self.tokens_per_sec * (1 + self.batch_cost * (len(contents) - 1))
+        time.sleep(len(contents) * self.ttft_ms / 1000 + decode)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status: int, payload: dict):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._send_json(200, {"status": "ok", "requests": server.requests})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if self.path == "/v1/completions":
+                    self._completions(body)
+                    return
+                if self.path != "/api/chat":
+                    self._send_json(404, {"error": f"unsupported path {self.path}"})
+                    return
+
+                model = body.get("model", "")
+                server.requests += 1
+                server.models_seen[model] = server.models_seen.get(model, 0) + 1
+                if model in server.fail_models:
+                    self._send_json(500, {"error": f"model '{model}' unavailable"})
+                    return
+
+                content = server.generate(body)
+                created = datetime.now(timezone.utc).isoformat()
+                if body.get("stream", False):
+                    with server.slots:
+                        self._stream(model, created, content, body)
+                    return
+                with server.slots:
+                    server._simulate(content)
+
+                self._send_json(200, self._final(model, created, content, body, content))
+
+            def _completions(self, body: dict):
+                prompts = body.get("prompt") or []
+                prompts = [prompts] if isinstance(prompts, str) else list(prompts)
+                model = body.get("model", "")
+                server.requests += 1
+                server.models_seen[model] = server.models_seen.get(model, 0) + len(prompts)
+                server.batch_sizes.append(len(prompts))
+                if model in server.fail_models or not prompts:
+                    self._send_json(500, {"error": f"model '{model}' unavailable"})
+                    return
+
+                contents = [server.generate({"format": body.get("guided_json")}) for _ in prompts]
+                with server.slots:
+                    server._simulate_batch(contents)
+                self._send_json(200, {
+                    "object": "text_completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [
+                        {"index": i, "text": content, "finish_reason": "stop"} for i, content in enumerate(contents)
+                    ],
+                    "usage": {
+                        "prompt_tokens": sum(len(p) for p in prompts) // 4,
+                        "completion_tokens": sum(max(len(c) // 4, 1) for c in contents),
+                    },
+                })
+
+            def _final(self, model: str, created: str, content: str, body: dict, message: str) -> dict:
+                return {
+                    "model": model,
+                    "created_at": created,
+                    "message": {"role": "assistant", "content": message},
+                    "done": True,
+                    "done_reason": "stop",
+                    "prompt_eval_count": sum(len(m.get("content", "")) for m in body.get("messages", [])) // 4,
+                    "eval_count": max(len(content) // 4, 1),
+                }
+
+            def _stream(self, model: str, created: str, content: str, body: dict):
+                """Chunked NDJSON, one message per ~4-character token at tokens_per_sec."""
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                def send(payload: dict):
+                    data = (json.dumps(payload) + "\n").encode()
+                    self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                    self.wfile.flush()
+
+                time.sleep(server.ttft_ms / 1000)
+                for i in range(0, len(content), 4):
+                    send({"model": model, "created_at": created, "done": False,
+                          "message": {"role": "assistant", "content": content[i:i + 4]}})
+                    time.sleep(1 / server.tokens_per_sec)
+                send(self._final(model, created, content, body, ""))
+                self.wfile.write(b"0\r\n\r\n")
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a stand-in Ollama server")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--ttft-ms", type=float, default=200.0)
+    parser.add_argument("--tokens-per-sec", type=float, default=50.0)
+    parser.add_argument("--parallel", type=int, default=4)
+    parser.add_argument("--batch-cost", type=float, default=0.15)
+    args = parser.parse_args()
+
+    stub = StubOllamaServer(
+        port=args.port, ttft_ms=args.ttft_ms, tokens_per_sec=args.tokens_per_sec, parallel=args.parallel,
+        batch_cost=args.batch_cost,
+    )
+    print(f"Stub Ollama listening on {stub.url}")
+    stub.httpd.serve_forever()
@@ -2,6 +2,8 @@
 Configuration constants for the interview backend.
 """
 
+import os
+
 # Interview settings
 MAX_QUESTIONS = 5  # Total questions per interview
 DEFAULT_PERSONA = "strict"  # Default interviewer persona
@@ -11,6 +13,52 @@ AVAILABLE_PERSONAS = ["strict", "coach"]
 SESSION_TTL_MINUTES = 60  # Session expiration time
 MAX_SESSIONS = 1000  # Maximum concurrent sessions
 
+# Flow execution: "langgraph" (compiled StateGraphs) or "native" (backend/engine.py state machine)
+INTERVIEW_ENGINE = os.getenv("INTERVIEW_ENGINE", "langgraph").lower()
+
+# Built frontend served by the backend (e.g. "frontend/dist"); unset when the Vite dev server is used
+FRONTEND_DIST_DIR = os.getenv("FRONTEND_DIST_DIR")
+
+# Server profile (python -m backend.server)
+SERVER_KEEPALIVE_SECONDS = 75  # Longer than common load-balancer idle timeouts (60 s), so the proxy closes first
+SERVER_BACKLOG = 2048  # Pending connections queued by the kernel during bursts
+GC_FREEZE = os.getenv("GC_FREEZE", "false").lower() == "true"  # Freeze start-up objects out of the collector
+GC_GEN0_THRESHOLD = int(os.getenv("GC_GEN0_THRESHOLD", "0"))  # 0 keeps the interpreter default
+
+# Per-client rate limits (token buckets keyed by a configured X-API-Key or the client IP)
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() != "false"
+RATE_LIMIT_STORE_URL = os.getenv("RATE_LIMIT_STORE_URL")  # e.g. "redis://localhost:6379/0"; in-process if unset
+RATE_LIMIT_API_KEYS = [k for k in os.getenv("RATE_LIMIT_API_KEYS", "").split(",") if k]  # Keys with their own bucket
+# Proxies (IPs or CIDRs) whose X-Forwarded-For is trusted for the client IP, e.g. "10.0.0.0/8"
+RATE_LIMIT_TRUSTED_PROXIES = [p for p in os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "127.0.0.1,::1").split(",") if p]
+RATE_LIMITS = {
+    # endpoint: burst capacity, refilled evenly over per_seconds
+    "/interview/start": {"capacity": 5, "per_seconds": 60},
+    "/interview/answer": {"capacity": 20, "per_seconds": 60},
+    "/interview/continue": {"capacity": 20, "per_seconds": 60},
+    "/interview/hint": {"capacity": 2, "per_seconds": 300},  # Per question
+    "/interview/partial": {"capacity": 120, "per_seconds": 60},
+    "/speech/synthesize": {"capacity": 30, "per_seconds": 60},
+}
+
+# Traffic capture (opt-in, for load-test replay)
+TRAFFIC_CAPTURE_PATH = os.getenv("TRAFFIC_CAPTURE_PATH")  # e.g. "traces/traffic.jsonl.gz"
+TRAFFIC_CAPTURE_SALT = os.getenv("TRAFFIC_CAPTURE_SALT", "")  # Salt for session id hashing
+
+# Interview results store (columnar analytics)
+RESULTS_STORE_DIR = os.getenv("RESULTS_STORE_DIR", "data/results")  # Empty string keeps results in memory only
+
+# Durable transcript log (append-only segments, written off the request path)
+TRANSCRIPT_LOG_DIR = os.getenv("TRANSCRIPT_LOG_DIR", "")  # e.g. "data/transcripts"; unset disables the log
+TRANSCRIPT_FSYNC = os.getenv("TRANSCRIPT_FSYNC", "true").lower() != "false"  # fsync once per committed batch
+
+# Admin-only profiling (X-Admin-Token header); unset disables the admin endpoints
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "3000"))  # /interview/* requests slower than this are kept
+SLOW_REQUEST_BUFFER = 200  # Slow requests kept, newest first
+SLOW_PROFILE_SAMPLE_RATE = float(os.getenv("SLOW_PROFILE_SAMPLE_RATE", "0.02"))  # Fraction sampled, kept if slow
+PROFILE_INTERVAL_MS = 5  # Stack sampling interval while a request is profiled
+
 # Azure Speech settings
 DEFAULT_TTS_VOICE = "en-US-JennyNeural"  # Professional female voice
 # Alternative voices:
@@ -18,8 +66,26 @@ DEFAULT_TTS_VOICE = "en-US-JennyNeural"  # Professional female voice
 # "en-US-AriaNeural" - Conversational female
 # "en-US-DavisNeural" - Conversational male
 
+# Text-to-speech output (POST /speech/synthesize)
+TTS_ENGINE = os.getenv("TTS_ENGINE", "azure")  # "azure", "coqui" (local CPU, needs ffmpeg for ogg/mp3) or "fake"
+DEFAULT_AUDIO_FORMAT = os.getenv("TTS_AUDIO_FORMAT", "ogg")  # "ogg" (Opus), "mp3" or "wav"
+TTS_CHUNK_BYTES = 4096  # Size of each chunk sent to the client
+TTS_MAX_TEXT_CHARS = 2000  # Longest text /speech/synthesize accepts (a long coach feedback is ~1000)
+
+# Sentence-pipelined speech for coach feedback and closings (GET /interview/{id}/speech/{kind})
+SPEECH_PIPELINE = os.getenv("SPEECH_PIPELINE", "false").lower() == "true"  # Stream those LLM replies into TTS
+SENTENCE_MIN_CHARS = 12  # Shorter fragments are joined to the next sentence
+TTS_PIPELINE_LOOKAHEAD = 2  # Sentences synthesized ahead of the one being sent
+TTS_PIPELINE_WORKERS = 4
+SPEECH_STREAM_WAIT_SECONDS = 60  # Longest wait for the next sentence before giving up
+
 DEFAULT_STT_LANGUAGE = "en-US"
 
+# Server-side streaming speech-to-text (WebSocket /interview/answer/stream)
+STT_ENGINE = os.getenv("STT_ENGINE", "azure")  # "azure", "vosk" (local CPU) or "fake"
+STT_SAMPLE_RATE = 16000  # Frames are 16-bit mono PCM at this rate
+VOSK_MODEL_PATH = os.getenv("VOSK_MODEL_PATH")
+
 # Scoring thresholds
 SCORE_EXCELLENT = 8.0
 SCORE_GOOD = 7.0
@@ -28,6 +94,109 @@ SCORE_NEEDS_IMPROVEMENT = 5.0
 WEAK_ANSWER_THRESHOLD = 5.0  # Below this marks topic as weak
 STRONG_ANSWER_THRESHOLD = 7.0  # Above this increases difficulty
 
+# Topic canonicalization: map model-reported topics onto a taxonomy so weak topics don't pile up near-duplicates
+TOPIC_CANONICALIZE = os.getenv("TOPIC_CANONICALIZE", "true").lower() != "false"
+TOPIC_MATCH_THRESHOLD = float(os.getenv("TOPIC_MATCH_THRESHOLD", "0.55"))  # Cosine similarity to an alias
+TOPIC_MAX_LEARNED = 512  # Unmatched topics added as new entries before falling back to the nearest one
+
+# Adaptive early stopping: end once a confidence interval on the mean score lies within one verdict band
+ADAPTIVE_STOPPING = os.getenv("ADAPTIVE_STOPPING", "false").lower() == "true"
+STOPPING_MIN_QUESTIONS = int(os.getenv("STOPPING_MIN_QUESTIONS", "3"))
+STOPPING_MAX_QUESTIONS = int(os.getenv("STOPPING_MAX_QUESTIONS", str(MAX_QUESTIONS)))
+STOPPING_CONFIDENCE = float(os.getenv("STOPPING_CONFIDENCE", "0.9"))
+STOPPING_PRIOR_SD = 1.5  # Assumed spread of one candidate's scores before any are seen
+STOPPING_PRIOR_WEIGHT = float(os.getenv("STOPPING_PRIOR_WEIGHT", "2"))  # Pseudo-observations behind STOPPING_PRIOR_SD
+
+# Answer pre-screening (local checks before LLM evaluation)
+PRESCREEN_ANSWERS = os.getenv("PRESCREEN_ANSWERS", "true").lower() != "false"  # Score obvious non-answers without an LLM call
+ANSWER_TOKEN_BUDGET = 600  # Longer answers are condensed before evaluation
+
+# Speculative evaluation of stabilized interim transcripts
+SPECULATIVE_EVALUATION = os.getenv("SPECULATIVE_EVALUATION", "true").lower() != "false"
+SPECULATION_STABLE_MS = 1200  # Interim text must be unchanged this long before evaluating
+SPECULATION_SIMILARITY = 0.95  # Minimum word-level similarity to commit the speculative result
+SPECULATION_MAX_PER_ANSWER = 3  # Speculative evaluations started per question; one runs at a time per session
+
+# Coach persona: prepare the next turn (decision, transition, question) during the feedback pause
+COACH_PRECOMPUTE = os.getenv("COACH_PRECOMPUTE", "true").lower() != "false"
+COACH_PRECOMPUTE_WORKERS = 4
+
+# Hint pre-generation: produce each question's hint in the background so /interview/hint answers from memory
+HINT_PREGENERATE = os.getenv("HINT_PREGENERATE", "false").lower() == "true"
+HINT_PREGENERATE_WORKERS = 4
+
+# Warm pool of interviews pre-started to their first question (only for starts without a role description)
+WARM_POOL_ENABLED = os.getenv("WARM_POOL_ENABLED", "false").lower() == "true"
+WARM_POOL_MAX_PER_KEY = 4  # Ready interviews per (role, experience, persona)
+WARM_POOL_MAX_TOTAL = 32  # Ready + filling across all combinations
+WARM_POOL_TTL_SECONDS = 900  # Unclaimed entries are discarded after this
+WARM_POOL_DEMAND_WINDOW = 600  # Starts counted over this window to size each pool
+WARM_POOL_LEAD_SECONDS = 60  # Keep enough ready for this many seconds of observed arrivals
+
+# Fused turns (strict persona): evaluate, give feedback, transition and ask the next question in one LLM call
+FUSED_TURNS = os.getenv("FUSED_TURNS", "false").lower() == "true"
+
+# Adaptive degradation (shed optional LLM work when the model server is slow)
+DEGRADE_ENABLED = os.getenv("DEGRADE_ENABLED", "true").lower() != "false"
+DEGRADE_SLO_MS = {  # p95 latency target per LLM route; override with e.g. DEGRADE_SLO_MS_EVALUATION=20000
+    route: float(os.getenv(f"DEGRADE_SLO_MS_{route.upper()}", str(ms)))
+    for route, ms in {
+        "question": 4000,
+        "evaluation": 6000,
+        "transition": 1500,
+        "hint": 2500,
+        "closing": 3000,
+        "turn": 8000,
+    }.items()
+}
+DEGRADE_MAX_INFLIGHT = int(os.getenv("DEGRADE_MAX_INFLIGHT", "32"))  # Concurrent LLM calls treated as full load
+DEGRADE_WINDOW_SECONDS = 60  # Rolling latency window
+DEGRADE_STEP_SECONDS = 10  # Minimum time between stepping up a level
+DEGRADE_RECOVER_SECONDS = 30  # Calm time required before stepping down a level
+DEGRADE_RECOVER_RATIO = 0.7  # Pressure below this counts as calm
+DEGRADE_HOLD_SECONDS = 120  # Time within the SLO (but not calm) after which a level still steps down
+
 # Difficulty levels
 DIFFICULTY_EASY = "easy"
 DIFFICULTY_HARD = "hard"
+
+# LLM model routing
+# Each agent is served by a route with its own model, sampling settings,
+# token limit and ordered fallbacks. Profiles are picked with LLM_ROUTING_PROFILE.
+MODEL_LARGE = os.getenv("LLM_MODEL_LARGE", "gpt-oss:120b-cloud")
+MODEL_SMALL = os.getenv("LLM_MODEL_SMALL", "qwen2.5:1.5b")  # CPU-resident local model
+LLM_ROUTES = ["question", "evaluation", "hint", "transition", "closing", "turn"]
+LLM_ROUTING_PROFILE = os.getenv("LLM_ROUTING_PROFILE", "single")  # "tiered" needs LLM_MODEL_SMALL pulled
+
+ROUTING_PROFILES = {
+    # Every agent on the large model (original behaviour)
+    "single": {
+        "question": {"model": MODEL_LARGE, "temperature": 0.5},
+        "evaluation": {"model": MODEL_LARGE, "temperature": 0.5},
+        "hint": {"model": MODEL_LARGE, "temperature": 0.5},
+        "transition": {"model": MODEL_LARGE, "temperature": 0.5},
+        "closing": {"model": MODEL_LARGE, "temperature": 0.5},
+        "turn": {"model": MODEL_LARGE, "temperature": 0.5},
+    },
+    # Low-stakes one-liners on the small local model, large model as fallback
+    "tiered": {
+        "question": {"model": MODEL_LARGE, "temperature": 0.7, "num_predict": 256},
+        "evaluation": {"model": MODEL_LARGE, "temperature": 0.2, "num_predict": 768},
+        "hint": {"model": MODEL_SMALL, "temperature": 0.5, "num_predict": 96, "fallbacks": [MODEL_LARGE]},
+        "transition": {"model": MODEL_SMALL, "temperature": 0.7, "num_predict": 48, "fallbacks": [MODEL_LARGE]},
+        "closing": {"model": MODEL_SMALL, "temperature": 0.5, "num_predict": 128, "fallbacks": [MODEL_LARGE]},
+        # Fused turn: evaluation + feedback + transition + next question
+        "turn": {"model": MODEL_LARGE, "temperature": 0.4, "num_predict": 1024},
+    },
+}
+
+# Cross-session micro-batching: same-route calls from concurrent sessions are sent together to a local
+# OpenAI-compatible server (POST /v1/completions with a list of prompts, e.g. vLLM or llama.cpp)
+LLM_BATCH_URL = os.getenv("LLM_BATCH_URL")  # e.g. "http://localhost:8000"; unset disables batching
+LLM_BATCH_MODEL = os.getenv("LLM_BATCH_MODEL")  # Model name on that server; required with LLM_BATCH_URL
+LLM_BATCH_TEMPLATE = os.getenv("LLM_BATCH_TEMPLATE")  # That model's chat template (chatml, llama3, gemma); required too
+LLM_BATCH_ROUTES = [r for r in os.getenv("LLM_BATCH_ROUTES", "question,evaluation").split(",") if r]
+LLM_BATCH_WINDOW_MS = float(os.getenv("LLM_BATCH_WINDOW_MS", "5"))  # Wait after a batch's first call
+LLM_BATCH_MAX_SIZE = int(os.getenv("LLM_BATCH_MAX_SIZE", "8"))
+LLM_BATCH_MAX_INFLIGHT = 2  # Batches on the server at once; calls queue (and batch up) behind them
+LLM_BATCH_TIMEOUT_SECONDS = 120
@@ -0,0 +1,210 @@
+"""
+Adaptive degradation: shed optional LLM work when latency SLOs are breached.
+
+Every routed LLM call is timed per route (agent) and counted while in flight.
+Pressure is the worst of p95 latency / SLO over a rolling window and
+in-flight calls / DEGRADE_MAX_INFLIGHT. Sustained pressure above 1 steps the
+level up one at a time; pressure below DEGRADE_RECOVER_RATIO for
+DEGRADE_RECOVER_SECONDS steps it back down, so a brief dip does not flap
+between levels. Pressure that stays within the SLO without getting that low
+steps down too, after DEGRADE_HOLD_SECONDS, so no level is held for good.
+Each level also keeps everything shed below it.
+"""
+
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Optional, Tuple
+from backend.metrics import metrics
+from backend.config import (
+    DEGRADE_ENABLED,
+    DEGRADE_SLO_MS,
+    DEGRADE_MAX_INFLIGHT,
+    DEGRADE_WINDOW_SECONDS,
+    DEGRADE_STEP_SECONDS,
+    DEGRADE_RECOVER_SECONDS,
+    DEGRADE_RECOVER_RATIO,
+    DEGRADE_HOLD_SECONDS,
+)
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Ordered from least to most user-visible
+LEVELS = ["normal", "skip_transition", "no_hints", "canned_closing", "short_evaluation"]
+
+MIN_SAMPLES = 5  # Per route, before its latency counts towards pressure
+MAX_SAMPLES = 512  # Per route, newest kept
+
+
+def _p95(values) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(round(0.95 * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+class DegradationController:
+    """Tracks per-route latency and in-flight calls and picks a degradation level."""
+
+    def __init__(
+        self,
+        slo_ms: Dict[str, float],
+        max_inflight: int,
+        window_seconds: float,
+        step_seconds: float,
+        recover_seconds: float,
+        recover_ratio: float,
+        hold_seconds: Optional[float] = None,
+        enabled: bool = True,
+    ):
+        self.slo_ms = slo_ms
+        self.max_inflight = max_inflight
+        self.window_seconds = window_seconds
+        self.step_seconds = step_seconds
+        self.recover_seconds = recover_seconds
+        self.recover_ratio = recover_ratio
+        self.hold_seconds = hold_seconds if hold_seconds is not None else recover_seconds * 4
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[Tuple[float, float]]] = {}
+        self._inflight = 0
+        self._level = 0
+        self._pressure = 0.0
+        self._changed_at = time.monotonic()
+        self._calm_since: Optional[float] = None
+        self._within_slo_since: Optional[float] = None
+        self._evaluated_at = 0.0
+        self._forced = False
+
+    # ----- signals -----
+
+    @contextmanager
+    def track(self, route: str):
+        """Time one LLM call for `route` and count it as in flight."""
+        with self._lock:
+            self._inflight += 1
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            end = time.monotonic()
+            with self._lock:
+                self._inflight -= 1
+                self._samples.setdefault(route, deque(maxlen=MAX_SAMPLES)).append((end, (end - start) * 1000))
+            metrics.observe(f"llm.{route}.ms", (end - start) * 1000)
+            self._maybe_evaluate(end)
+
+    # ----- decisions -----
+
+    @property
+    def level(self) -> int:
+        self._maybe_evaluate(time.monotonic())
+        return self._level
+
+    def sheds(self, feature: str) -> bool:
+        """True when `feature` (a LEVELS name) is currently switched off."""
+        if self.level >= LEVELS.index(feature):
+            metrics.incr(f"degradation.shed.{feature}")
+            return True
+        return False
+
+    def force(self, level: Optional[int]):
+        """Pin a level (None resumes automatic control)."""
+        with self._lock:
+            self._forced = level is not None
+            self._set_level(level or 0, time.monotonic())
+
+    def stats(self) -> Dict:
+        now = time.monotonic()
+        self._maybe_evaluate(now)
+        with self._lock:
+            self._trim(now)
+            routes = {
+                route: {"p95_ms": round(_p95([ms for _, ms in samples]), 1), "samples": len(samples)}
+                for route, samples in self._samples.items() if samples
+            }
+            return {
+                "level": self._level,
+                "forced": self._forced,
+                "name": LEVELS[self._level],
+                "pressure": round(self._pressure, 3),
+                "in_flight": self._inflight,
+                "routes": routes,
+            }
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._inflight = 0
+            self._pressure = 0.0
+            self._calm_since = None
+            self._within_slo_since = None
+            self._set_level(0, time.monotonic())
+
+    # ----- internals -----
+
+    def _trim(self, now: float):
+        cutoff = now - self.window_seconds
+        for samples in self._samples.values():
+            while samples and samples[0][0] < cutoff:
+                samples.popleft()
+
+    def _current_pressure(self, now: float) -> float:
+        self._trim(now)
+        pressure = self._inflight / self.max_inflight
+        for route, samples in self._samples.items():
+            slo = self.slo_ms.get(route)
+            if slo and len(samples) >= MIN_SAMPLES:
+                pressure = max(pressure, _p95([ms for _, ms in samples]) / slo)
+        return pressure
+
+    def _maybe_evaluate(self, now: float):
+        # Cheap enough per call, but no need to re-sort samples more than a few times a second
+        if not self.enabled or self._forced or now - self._evaluated_at < 0.25:
+            return
+        with self._lock:
+            self._evaluated_at = now
+            pressure = self._pressure = self._current_pressure(now)
+            metrics.set_gauge("degradation.pressure", round(pressure, 3))
+
+            if pressure > 1.0:
+                self._calm_since = self._within_slo_since = None
+                if self._level < len(LEVELS) - 1 and now - self._changed_at >= self.step_seconds:
+                    self._set_level(self._level + 1, now)
+                return
+            if self._within_slo_since is None:
+                self._within_slo_since = now
+            if pressure < self.recover_ratio:
+                if self._calm_since is None:
+                    self._calm_since = now
+            else:
+                self._calm_since = None
+            calm = self._calm_since is not None and now - max(self._calm_since, self._changed_at) >= self.recover_seconds
+            held = now - max(self._within_slo_since, self._changed_at) >= self.hold_seconds
+            if self._level > 0 and (calm or held):
+                self._set_level(self._level - 1, now)
+
+    def _set_level(self, level: int, now: float):
+        level = max(0, min(level, len(LEVELS) - 1))
+        if level != self._level:
+            logger.warning(
+                f"Degradation level {self._level} ({LEVELS[self._level]}) -> {level} ({LEVELS[level]}), "
+                f"pressure={self._pressure:.2f}"
+            )
+            metrics.incr("degradation.level_changes")
+        self._level = level
+        self._changed_at = now
+        metrics.set_gauge("degradation.level", level)
+
+
+degradation = DegradationController(
+    slo_ms=DEGRADE_SLO_MS,
+    max_inflight=DEGRADE_MAX_INFLIGHT,
+    window_seconds=DEGRADE_WINDOW_SECONDS,
+    step_seconds=DEGRADE_STEP_SECONDS,
+    recover_seconds=DEGRADE_RECOVER_SECONDS,
+    recover_ratio=DEGRADE_RECOVER_RATIO,
+    hold_seconds=DEGRADE_HOLD_SECONDS,
+    enabled=DEGRADE_ENABLED,
+)
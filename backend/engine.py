@@ -0,0 +1,147 @@
+"""
+Native execution engine for the interview flows.
+
+The flows in `backend/graph.py` are small fixed state machines. LangGraph
+runs them through its generic Pregel loop: channels, per-step task
+scheduling, and a serialized checkpoint after every node. `InterviewMachine`
+runs the same node functions as a plain loop over a transition table and
+keeps one record per thread: the current state dict and the node to run
+next. Selected with INTERVIEW_ENGINE=native.
+
+It implements the part of the compiled-graph interface that `main.py`
+uses (`invoke` with an initial state or `Command(resume=...)`, `get_state`,
+`checkpointer.delete_thread`), with the same interrupt semantics: a node
+that calls `interrupt()` is stopped, and run again from the start when the
+thread is resumed, this time receiving the resume value.
+"""
+
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple, Union
+from langgraph.graph import END
+from langgraph.types import Command, Interrupt, interrupt as graph_interrupt
+import threading
+
+_MISSING = object()
+
+
+class _Paused(Exception):
+    """Raised by `interrupt()` inside a native run that has no resume value to give."""
+
+    def __init__(self, value: Any):
+        super().__init__(value)
+        self.value = value
+
+
+class _Run:
+    """Per-invoke context: the resume value for the interrupted node, until it is taken."""
+
+    __slots__ = ("resume",)
+
+    def __init__(self, resume: Any = _MISSING):
+        self.resume = resume
+
+
+_current_run: ContextVar[Optional[_Run]] = ContextVar("native_run", default=None)
+
+
+def interrupt(value: Any) -> Any:
+    """
+    Pause the running node until the thread is resumed, under either engine.
+
+    Nodes call this instead of `langgraph.types.interrupt`, which only works
+    inside a LangGraph run.
+    """
+    run = _current_run.get()
+    if run is None:
+        return graph_interrupt(value)
+    if run.resume is _MISSING:
+        raise _Paused(value)
+    resume, run.resume = run.resume, _MISSING
+    return resume
+
+
+class StateSnapshot(NamedTuple):
+    values: Dict[str, Any]
+    next: Tuple[str, ...]
+
+
+class _Thread:
+    __slots__ = ("state", "next", "paused")
+
+    def __init__(self, state: Dict[str, Any], next_node: str):
+        self.state = state
+        self.next = next_node
+        self.paused: Any = _MISSING  # Interrupt value while `next` is waiting to be resumed
+
+
+Route = Union[str, Callable[[Dict[str, Any]], str]]
+
+
+class InterviewMachine:
+    """
+    A flow as `{node name: (node, route)}`, run from `entry` until a node pauses or END.
+
+    Nodes take `(state, config)` and return updates, merged by overwriting
+    (every InterviewState key is last-value). Keys outside `keys` are
+    dropped, as LangGraph drops writes to undeclared channels. A route is the
+    next node's name or a function of the updated state returning it.
+    """
+
+    def __init__(self, entry: str, nodes: Dict[str, Tuple[Callable, Route]], keys: Iterable[str]):
+        self.entry = entry
+        self.nodes = nodes
+        self.keys = frozenset(keys)
+        self._threads: Dict[str, _Thread] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def checkpointer(self) -> "InterviewMachine":
+        return self
+
+    def invoke(self, input: Any, config: Dict) -> Dict[str, Any]:
+        thread_id = config["configurable"]["thread_id"]
+        if isinstance(input, Command):
+            with self._lock:
+                thread = self._threads.get(thread_id)
+            if thread is None:
+                raise ValueError(f"No interview thread {thread_id} to resume")
+            run = _Run(input.resume if thread.paused is not _MISSING else _MISSING)
+        else:
+            thread = _Thread({k: v for k, v in input.items() if k in self.keys}, self.entry)
+            with self._lock:
+                self._threads[thread_id] = thread
+            run = _Run()
+        return self._run(thread, run, config)
+
+    def get_state(self, config: Dict) -> StateSnapshot:
+        with self._lock:
+            thread = self._threads.get(config["configurable"]["thread_id"])
+        if thread is None:
+            return StateSnapshot({}, ())
+        return StateSnapshot(dict(thread.state), () if thread.next == END else (thread.next,))
+
+    def delete_thread(self, thread_id: str):
+        with self._lock:
+            self._threads.pop(thread_id, None)
+
+    def _run(self, thread: _Thread, run: _Run, config: Dict) -> Dict[str, Any]:
+        state, node_name = thread.state, thread.next
+        token = _current_run.set(run)
+        try:
+            while node_name != END:
+                node, route = self.nodes[node_name]
+                try:
+                    updates = node(state, config)
+                except _Paused as pause:
+                    thread.paused = pause.value
+                    return {**state, "__interrupt__": [Interrupt(value=pause.value)]}
+                # A resume value is only for the node that was paused
+                run.resume = _MISSING
+                if updates:
+                    state = {**state, **{k: v for k, v in updates.items() if k in self.keys}}
+                node_name = route if isinstance(route, str) else route(state)
+                # Committed after every node, so a failing node is retried from here
+                thread.state, thread.next, thread.paused = state, node_name, _MISSING
+            return dict(state)
+        finally:
+            _current_run.reset(token)
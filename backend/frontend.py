@@ -0,0 +1,121 @@
+"""
+Serve the built frontend (frontend/dist) from the backend, same-origin.
+
+Content-hashed assets under assets/ are cached as immutable; the HTML shell
+is revalidated on every load and carries preload Link headers for the entry
+chunks. Precompressed .br/.gz siblings written by frontend/scripts/compress.mjs
+are served when the client accepts them.
+"""
+
+from typing import Dict, List, Optional
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+import json
+import logging
+import mimetypes
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Vite names build output like assets/index-B6ZKnhVm.js
+HASHED_ASSET = re.compile(r"^assets/.+-[A-Za-z0-9_-]{8}\.[a-z0-9]+$")
+
+# Preferred first when the client accepts both
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+
+def accepted_encodings(header: Optional[str]) -> set:
+    accepted = set()
+    for part in (header or "").split(","):
+        name, _, params = part.partition(";")
+        params = params.strip()
+        q = 1.0
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name.strip() and q > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def preload_links(dist_dir: str) -> List[str]:
+    """Link header values for the entry chunk, its CSS and static imports (from the Vite manifest)."""
+    path = os.path.join(dist_dir, ".vite", "manifest.json")
+    try:
+        with open(path) as f:
+            manifest: Dict[str, Dict] = json.load(f)
+    except (OSError, ValueError):
+        return []
+
+    links = []
+    seen = set()
+
+    def visit(key: str):
+        chunk = manifest.get(key)
+        if not chunk or key in seen:
+            return
+        seen.add(key)
+        links.append(f"</{chunk['file']}>; rel=modulepreload; crossorigin")
+        for css in chunk.get("css", []):
+            links.append(f"</{css}>; rel=preload; as=style; crossorigin")
+        for imported in chunk.get("imports", []):
+            visit(imported)
+
+    for key, chunk in manifest.items():
+        if chunk.get("isEntry"):
+            visit(key)
+    return links
+
+
+class FrontendFiles(StaticFiles):
+    """StaticFiles with precompressed variants and cache headers for a Vite build."""
+
+    def __init__(self, directory: str):
+        super().__init__(directory=directory, html=True)
+        self._link_header = ", ".join(preload_links(directory))
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        relative = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+        media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+
+        headers = {
+            "Cache-Control": IMMUTABLE if HASHED_ASSET.match(relative) else REVALIDATE,
+            "Vary": "Accept-Encoding",
+        }
+        if relative == "index.html" and self._link_header:
+            headers["Link"] = self._link_header
+
+        path, stat = full_path, stat_result
+        accepted = accepted_encodings(request_headers.get("accept-encoding"))
+        for encoding, suffix in ENCODINGS:
+            if encoding in accepted:
+                try:
+                    stat = os.stat(full_path + suffix)
+                except OSError:
+                    continue
+                path = full_path + suffix
+                headers["Content-Encoding"] = encoding
+                break
+
+        response = FileResponse(path, status_code=status_code, headers=headers, media_type=media_type, stat_result=stat)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def mount_frontend(app, dist_dir: str) -> bool:
+    """Mount the build at "/" (after all API routes). Returns False if it has not been built."""
+    if not os.path.isfile(os.path.join(dist_dir, "index.html")):
+        logger.warning(f"Frontend build not found at {dist_dir}; run `npm run build` in frontend/")
+        return False
+    app.mount("/", FrontendFiles(dist_dir), name="frontend")
+    logger.info(f"Serving frontend from {dist_dir}")
+    return True
@@ -1,6 +1,9 @@
+import inspect
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.runnables import RunnableConfig
 from backend.models import InterviewState
+from backend.engine import InterviewMachine
 from backend.nodes import (
     ask_question_node,
     await_answer_node,
@@ -9,24 +12,54 @@ from backend.nodes import (
     end_node,
     transition_node,
     await_continue_node,
+    fused_turn_node,
+    advance_node,
 )
+from backend.sessionstate import session_states, STEP_QUESTION, STEP_FEEDBACK, STEP_PROCESSING
+
+
+def projected(node, step: str):
+    """
+    Wrap a node so its completed updates are projected into the session read model.
+
+    `step` is what the client sees once the node is done (e.g. a question
+    node leaves the session waiting for an answer). Nodes that pause with
+    interrupt() only complete when resumed.
+    """
+    takes_config = "config" in inspect.signature(node).parameters
+
+    def run(state: InterviewState, config: RunnableConfig):
+        updates = node(state, config) if takes_config else node(state)
+        session_states.apply(config.get("configurable", {}).get("thread_id"), step, state, updates)
+        return updates
+
+    # Not functools.wraps: LangGraph reads the signature to decide whether to pass config
+    run.__name__ = node.__name__
+    return run
 
 
 def build_graph_strict():
     """Original strict interview flow: ask → await_answer → evaluate → decide → transition/end."""
     builder = StateGraph(InterviewState)
 
-    builder.add_node("ask", ask_question_node)
-    builder.add_node("await_answer", await_answer_node)
-    builder.add_node("evaluate", evaluate_node)
-    builder.add_node("transition", transition_node)
-    builder.add_node("decide", decision_node)
-    builder.add_node("end", end_node)
+    builder.add_node("ask", projected(ask_question_node, STEP_QUESTION))
+    builder.add_node("await_answer", projected(await_answer_node, STEP_PROCESSING))
+    builder.add_node("evaluate", projected(evaluate_node, STEP_PROCESSING))
+    builder.add_node("transition", projected(transition_node, STEP_PROCESSING))
+    builder.add_node("decide", projected(decision_node, STEP_PROCESSING))
+    builder.add_node("end", projected(end_node, STEP_PROCESSING))
 
     builder.set_entry_point("ask")
 
     builder.add_edge("ask", "await_answer")
-    builder.add_edge("await_answer", "evaluate")
+    builder.add_conditional_edges(
+        "await_answer",
+        lambda s: "end" if s["end_interview"] else "evaluate",
+        {
+            "end": "end",
+            "evaluate": "evaluate",
+        },
+    )
     builder.add_edge("evaluate", "decide")
     builder.add_edge("transition", "ask")
 
@@ -44,38 +77,129 @@ def build_graph_strict():
     return builder.compile(checkpointer=MemorySaver())
 
 
+def build_graph_strict_fused():
+    """Strict flow in fused-turn mode: ask → await_answer → turn (evaluate + decide + transition + next question)."""
+    builder = StateGraph(InterviewState)
+
+    builder.add_node("ask", projected(ask_question_node, STEP_QUESTION))  # First question only
+    builder.add_node("await_answer", projected(await_answer_node, STEP_PROCESSING))
+    builder.add_node("turn", projected(fused_turn_node, STEP_QUESTION))
+    builder.add_node("end", projected(end_node, STEP_PROCESSING))
+
+    builder.set_entry_point("ask")
+
+    builder.add_edge("ask", "await_answer")
+    builder.add_conditional_edges(
+        "await_answer",
+        lambda s: "end" if s["end_interview"] else "turn",
+        {
+            "end": "end",
+            "turn": "turn",
+        },
+    )
+    builder.add_conditional_edges(
+        "turn",
+        lambda s: "end" if s["end_interview"] else "await_answer",
+        {
+            "end": "end",
+            "await_answer": "await_answer",
+        },
+    )
+
+    builder.add_edge("end", END)
+
+    return builder.compile(checkpointer=MemorySaver())
+
+
 def build_graph_coach():
-    """Coach flow: insert await_continue after evaluate to gate next question on user action."""
+    """
+    Coach flow: pause at await_continue after evaluate to gate the next question on user action.
+
+    The next turn (decision, transition, question) is prepared during the
+    pause, and `advance` applies it once the candidate proceeds.
+    """
     builder = StateGraph(InterviewState)
 
-    builder.add_node("ask", ask_question_node)
-    builder.add_node("await_answer", await_answer_node)
-    builder.add_node("evaluate", evaluate_node)
-    builder.add_node("await_continue", await_continue_node)
-    builder.add_node("decide", decision_node)
-    builder.add_node("transition", transition_node)
-    builder.add_node("end", end_node)
+    builder.add_node("ask", projected(ask_question_node, STEP_QUESTION))  # First question only
+    builder.add_node("await_answer", projected(await_answer_node, STEP_PROCESSING))
+    builder.add_node("evaluate", projected(evaluate_node, STEP_FEEDBACK))
+    builder.add_node("await_continue", projected(await_continue_node, STEP_PROCESSING))
+    builder.add_node("advance", projected(advance_node, STEP_QUESTION))
+    builder.add_node("end", projected(end_node, STEP_PROCESSING))
 
     builder.set_entry_point("ask")
 
     builder.add_edge("ask", "await_answer")
-    builder.add_edge("await_answer", "evaluate")
+    # Either pause may be resumed with END_EARLY_SIGNAL, which goes straight to end
+    builder.add_conditional_edges(
+        "await_answer",
+        lambda s: "end" if s["end_interview"] else "evaluate",
+        {
+            "end": "end",
+            "evaluate": "evaluate",
+        },
+    )
     # Pause here for user to review feedback and press Proceed
     builder.add_edge("evaluate", "await_continue")
-    # After proceed, continue with decision/transition
-    builder.add_edge("await_continue", "decide")
-    builder.add_edge("decide", "transition")
-    builder.add_edge("transition", "ask")
-
     builder.add_conditional_edges(
-        "decide",
-        lambda s: "end" if s["end_interview"] else "transition",
+        "await_continue",
+        lambda s: "end" if s["end_interview"] else "advance",
         {
             "end": "end",
-            "transition": "transition",
+            "advance": "advance",
+        },
+    )
+    builder.add_conditional_edges(
+        "advance",
+        lambda s: "end" if s["end_interview"] else "await_answer",
+        {
+            "end": "end",
+            "await_answer": "await_answer",
         },
     )
 
     builder.add_edge("end", END)
 
     return builder.compile(checkpointer=MemorySaver())
+
+
+# --------------------------------------------------
+# Native engine: the same flows as transition tables
+# --------------------------------------------------
+
+def _unless_ended(target: str):
+    return lambda s: "end" if s["end_interview"] else target
+
+
+def build_native_strict() -> InterviewMachine:
+    """`build_graph_strict` on the native engine."""
+    return InterviewMachine("ask", {
+        "ask": (projected(ask_question_node, STEP_QUESTION), "await_answer"),
+        "await_answer": (projected(await_answer_node, STEP_PROCESSING), _unless_ended("evaluate")),
+        "evaluate": (projected(evaluate_node, STEP_PROCESSING), "decide"),
+        "decide": (projected(decision_node, STEP_PROCESSING), _unless_ended("transition")),
+        "transition": (projected(transition_node, STEP_PROCESSING), "ask"),
+        "end": (projected(end_node, STEP_PROCESSING), END),
+    }, InterviewState.__annotations__)
+
+
+def build_native_strict_fused() -> InterviewMachine:
+    """`build_graph_strict_fused` on the native engine."""
+    return InterviewMachine("ask", {
+        "ask": (projected(ask_question_node, STEP_QUESTION), "await_answer"),
+        "await_answer": (projected(await_answer_node, STEP_PROCESSING), _unless_ended("turn")),
+        "turn": (projected(fused_turn_node, STEP_QUESTION), _unless_ended("await_answer")),
+        "end": (projected(end_node, STEP_PROCESSING), END),
+    }, InterviewState.__annotations__)
+
+
+def build_native_coach() -> InterviewMachine:
+    """`build_graph_coach` on the native engine."""
+    return InterviewMachine("ask", {
+        "ask": (projected(ask_question_node, STEP_QUESTION), "await_answer"),
+        "await_answer": (projected(await_answer_node, STEP_PROCESSING), _unless_ended("evaluate")),
+        "evaluate": (projected(evaluate_node, STEP_FEEDBACK), "await_continue"),
+        "await_continue": (projected(await_continue_node, STEP_PROCESSING), _unless_ended("advance")),
+        "advance": (projected(advance_node, STEP_QUESTION), _unless_ended("await_answer")),
+        "end": (projected(end_node, STEP_PROCESSING), END),
+    }, InterviewState.__annotations__)
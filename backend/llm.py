@@ -1,18 +1,216 @@
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Union
 from langchain_ollama import ChatOllama
-from backend.models import Question, Evaluation, Feedback, Hint, EvaluationWithFeedback, SpokenClosing, SpokenTransition
+from backend.models import (
+    Question, Evaluation, Feedback, Hint, EvaluationWithFeedback, FusedTurn, SpokenClosing, SpokenTransition,
+)
+from backend.config import (
+    MODEL_LARGE,
+    MODEL_SMALL,
+    LLM_ROUTING_PROFILE,
+    ROUTING_PROFILES,
+    LLM_BATCH_URL,
+    LLM_BATCH_MODEL,
+    LLM_BATCH_TEMPLATE,
+    LLM_BATCH_ROUTES,
+    LLM_BATCH_WINDOW_MS,
+    LLM_BATCH_MAX_SIZE,
+    LLM_BATCH_MAX_INFLIGHT,
+    LLM_BATCH_TIMEOUT_SECONDS,
+)
+from backend.batching import CHAT_TEMPLATES, CompletionsClient, MicroBatcher, render_prompt
+from backend.structured import parse_structured, structured_output
+from backend.metrics import metrics
+from backend.degrade import degradation
+from backend.profiling import track_llm_call
 from dotenv import load_dotenv
+import logging
+import os
 
 load_dotenv()
 
-llm = ChatOllama(
-    model="gpt-oss:120b-cloud",
-    temperature=0.5
-)
+logger = logging.getLogger(__name__)
+
+# Optional per-model server override, e.g. a CPU box for the small model
+MODEL_BASE_URLS: Dict[str, Optional[str]] = {
+    MODEL_LARGE: os.getenv("LLM_BASE_URL_LARGE"),
+    MODEL_SMALL: os.getenv("LLM_BASE_URL_SMALL"),
+}
+
+_active_routes: Dict[str, dict] = {}
+_routes_version = 0
+
+
+def set_routing_profile(profile: Union[str, Dict[str, dict]]):
+    """
+    Activate a routing profile by name (see ROUTING_PROFILES) or as an explicit
+    route → settings mapping. Already-built route clients are discarded.
+    """
+    global _active_routes, _routes_version
+    if isinstance(profile, str):
+        if profile not in ROUTING_PROFILES:
+            raise ValueError(f"Unknown routing profile '{profile}'. Must be one of: {list(ROUTING_PROFILES)}")
+        routes = ROUTING_PROFILES[profile]
+    else:
+        routes = profile
+    _active_routes = {name: dict(cfg) for name, cfg in routes.items()}
+    _routes_version += 1
+    logger.info(
+        "LLM routing: "
+        + ", ".join(f"{name}={cfg['model']}" for name, cfg in _active_routes.items())
+    )
+
+
+def get_route(route: str) -> dict:
+    """Return the active settings for a route."""
+    if route not in _active_routes:
+        raise KeyError(f"No LLM route configured for '{route}'")
+    return _active_routes[route]
+
+
+def chat_model(
+    model: str,
+    temperature: float = 0.5,
+    num_predict: Optional[int] = None,
+    base_url: Optional[str] = None,
+) -> ChatOllama:
+    """Build a chat client for one model on its (optionally overridden) server."""
+    return ChatOllama(
+        model=model,
+        temperature=temperature,
+        num_predict=num_predict,
+        base_url=base_url or MODEL_BASE_URLS.get(model),
+    )
+
+
+_batcher: Optional[MicroBatcher] = None
+_batched_routes: frozenset = frozenset()
+
+
+def configure_batching(base_url: Optional[str], routes: Iterable[str] = LLM_BATCH_ROUTES,
+                       model: Optional[str] = LLM_BATCH_MODEL, template: Optional[str] = LLM_BATCH_TEMPLATE,
+                       window_ms: float = LLM_BATCH_WINDOW_MS, max_batch: int = LLM_BATCH_MAX_SIZE,
+                       max_inflight: int = LLM_BATCH_MAX_INFLIGHT):
+    """
+    Send `routes` through cross-session micro-batches to `model` on an OpenAI-compatible
+    server at `base_url`, with prompts in its chat `template`; None turns batching off.
+    Streaming calls are never batched.
+    """
+    global _batcher, _batched_routes
+    if not base_url:
+        _batcher, _batched_routes = None, frozenset()
+        return
+    # The batch server has its own model names, and a prompt in the wrong template still "works", badly
+    if not model:
+        raise ValueError("LLM_BATCH_MODEL must name the batch server's model when LLM_BATCH_URL is set")
+    if template not in CHAT_TEMPLATES:
+        raise ValueError(f"LLM_BATCH_TEMPLATE must be one of {list(CHAT_TEMPLATES)} when LLM_BATCH_URL is set, "
+                         f"got {template!r}")
+    client = CompletionsClient(base_url, timeout=LLM_BATCH_TIMEOUT_SECONDS)
+
+    def dispatch(key, batch: List[list]) -> List[str]:
+        route, schema = key
+        cfg = get_route(route)
+        return client.complete(
+            model,
+            [render_prompt(messages, template) for messages in batch],
+            temperature=cfg.get("temperature", 0.5),
+            max_tokens=cfg.get("num_predict") or 512,
+            json_schema=schema.model_json_schema(),
+        )
+
+    _batcher = MicroBatcher(dispatch, window_ms=window_ms, max_batch=max_batch, max_inflight=max_inflight)
+    _batched_routes = frozenset(routes)
+    logger.info(f"LLM micro-batching: {', '.join(sorted(_batched_routes))} via {model} ({template}) at {base_url}, "
+                f"{window_ms:g} ms window, up to {max_batch} per batch")
+
+
+def batching_stats() -> Dict[str, object]:
+    if _batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, "routes": sorted(_batched_routes), **_batcher.stats()}
+
+
+@lru_cache(maxsize=64)
+def _build_route(version: int, route: str, schema: type):
+    cfg = get_route(route)
+    primary = structured_output(
+        chat_model(cfg["model"], cfg.get("temperature", 0.5), cfg.get("num_predict"), cfg.get("base_url")),
+        schema,
+    )
+
+    fallbacks = [
+        structured_output(chat_model(model, cfg.get("temperature", 0.5), cfg.get("num_predict")), schema)
+        for model in cfg.get("fallbacks", [])
+    ]
+    return primary.with_fallbacks(fallbacks) if fallbacks else primary
+
+
+@lru_cache(maxsize=64)
+def _build_stream_route(version: int, route: str, schema: type):
+    cfg = get_route(route)
+    model = chat_model(cfg["model"], cfg.get("temperature", 0.5), cfg.get("num_predict"), cfg.get("base_url"))
+    return model.bind(format=schema.model_json_schema())
+
+
+class RoutedLLM:
+    """
+    Structured-output LLM bound to a route name.
+
+    The concrete model is resolved from the active routing profile on each call,
+    so switching profiles takes effect without re-importing the agents.
+    """
+
+    def __init__(self, route: str, schema: type):
+        self.route = route
+        self.schema = schema
+
+    def invoke(self, messages, **kwargs):
+        # Timed per route so the degradation controller can react to slow models,
+        # and per request for the inside/outside-LLM breakdown
+        with degradation.track(self.route), track_llm_call():
+            batcher = _batcher
+            if batcher is not None and self.route in _batched_routes and not kwargs:
+                try:
+                    text = batcher.submit((self.route, self.schema), messages, timeout=LLM_BATCH_TIMEOUT_SECONDS)
+                    return parse_structured(text, self.schema)
+                except Exception as e:
+                    # The route's own model (and its fallbacks) answers instead
+                    metrics.incr("llm.batch.fallbacks")
+                    logger.warning(f"Batched {self.route} call failed, calling the route directly: {e}")
+            return _build_route(_routes_version, self.route, self.schema).invoke(messages, **kwargs)
+
+    def invoke_streaming(self, messages, on_text: Callable[[str], None], **kwargs):
+        """
+        Like invoke, but the primary model's raw output is passed to `on_text` as it is generated.
+
+        If streaming or parsing fails, the regular invoke (with fallbacks) answers instead. Text
+        already passed to `on_text` is not withdrawn: the caller must reconcile it with the
+        returned result (SpeechChannel.finish does).
+        """
+        parts = []
+        try:
+            with degradation.track(self.route), track_llm_call():
+                for chunk in _build_stream_route(_routes_version, self.route, self.schema).stream(messages, **kwargs):
+                    parts.append(chunk.content)
+                    on_text(chunk.content)
+            return parse_structured("".join(parts), self.schema)
+        except Exception as e:
+            metrics.incr("llm.stream.fallbacks")
+            logger.warning(f"Streaming {self.route} call failed, retrying without streaming: {e}")
+        return self.invoke(messages, **kwargs)
+
+
+set_routing_profile(LLM_ROUTING_PROFILE)
+configure_batching(LLM_BATCH_URL)
+
+llm = chat_model(MODEL_LARGE, temperature=0.5)
 
-question_llm = llm.with_structured_output(Question)
-evaluation_llm = llm.with_structured_output(Evaluation)
-feedback_llm = llm.with_structured_output(Feedback)
-evaluation_with_feedback_llm = llm.with_structured_output(EvaluationWithFeedback)
-hint_llm = llm.with_structured_output(Hint)
-closing_llm = llm.with_structured_output(SpokenClosing)
-transition_llm = llm.with_structured_output(SpokenTransition)
+question_llm = RoutedLLM("question", Question)
+evaluation_llm = RoutedLLM("evaluation", Evaluation)
+feedback_llm = RoutedLLM("evaluation", Feedback)
+evaluation_with_feedback_llm = RoutedLLM("evaluation", EvaluationWithFeedback)
+hint_llm = RoutedLLM("hint", Hint)
+closing_llm = RoutedLLM("closing", SpokenClosing)
+transition_llm = RoutedLLM("transition", SpokenTransition)
+fused_turn_llm = RoutedLLM("turn", FusedTurn)
@@ -1,26 +1,78 @@
-from fastapi import FastAPI, HTTPException, File, UploadFile, WebSocket
+from fastapi import FastAPI, HTTPException, File, UploadFile, WebSocket, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import Literal, Optional
 from uuid import uuid4
 from langgraph.types import Command
 import base64
 import os
 import asyncio
+import itertools
 import json
 import logging
 import requests
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 from backend.models import InterviewState
-from typing import cast
-from backend.graph import build_graph_strict, build_graph_coach
+from backend.graph import (
+    build_graph_strict,
+    build_graph_strict_fused,
+    build_graph_coach,
+    build_native_strict,
+    build_native_strict_fused,
+    build_native_coach,
+)
 from backend.agents import hint_agent
+from backend.nodes import END_EARLY_SIGNAL, speculator, transcript_log, turn_precomputer
+from backend.metrics import metrics
+from backend.degrade import degradation
+from backend.llm import batching_stats
+from backend.structured import parse_failure_rates
+from backend.traffic import TrafficCaptureMiddleware
+from backend.profiling import ProfilingMiddleware, bind_thread, profiler
+from backend.sessionstate import session_states
+from backend.tts.pipeline import pipelined_speech, speech_channels
+from backend.stopping import question_limit
+from backend.topics import topic_index
+from backend.analytics import ResultsStore
+from backend.frontend import mount_frontend
+from backend.ratelimit import RateLimiter, client_key, create_bucket_store, parse_networks
+from backend.warmpool import WarmPool
+from backend.server import OrjsonResponse, configure_gc
+from backend.stt.stt_engine import create_stt_engine
 from backend.config import (
     DEFAULT_PERSONA,
     AVAILABLE_PERSONAS,
     SESSION_TTL_MINUTES,
-    MAX_SESSIONS
+    MAX_SESSIONS,
+    TRAFFIC_CAPTURE_PATH,
+    TRAFFIC_CAPTURE_SALT,
+    RESULTS_STORE_DIR,
+    RATE_LIMITS,
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_STORE_URL,
+    RATE_LIMIT_API_KEYS,
+    RATE_LIMIT_TRUSTED_PROXIES,
+    FRONTEND_DIST_DIR,
+    HINT_PREGENERATE,
+    HINT_PREGENERATE_WORKERS,
+    FUSED_TURNS,
+    INTERVIEW_ENGINE,
+    WARM_POOL_ENABLED,
+    WARM_POOL_MAX_PER_KEY,
+    WARM_POOL_MAX_TOTAL,
+    WARM_POOL_TTL_SECONDS,
+    WARM_POOL_DEMAND_WINDOW,
+    WARM_POOL_LEAD_SECONDS,
+    GC_FREEZE,
+    GC_GEN0_THRESHOLD,
+    SPEECH_PIPELINE,
+    SPEECH_STREAM_WAIT_SECONDS,
+    TTS_MAX_TEXT_CHARS,
 )
 
 # Configure logging
@@ -34,7 +86,7 @@ logger = logging.getLogger(__name__)
 # App
 # --------------------------------------------------
 
-app = FastAPI(title="Voice Interview Backend")
+app = FastAPI(title="Voice Interview Backend", default_response_class=OrjsonResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -42,28 +94,48 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Profile-Id"],
 )
 
+# Inside/outside-LLM timing, slow-request sampling and admin-triggered profiles
+app.add_middleware(ProfilingMiddleware)
+
+if TRAFFIC_CAPTURE_PATH:
+    # Record anonymized request traces for load-test replay
+    app.add_middleware(TrafficCaptureMiddleware, path=TRAFFIC_CAPTURE_PATH, salt=TRAFFIC_CAPTURE_SALT)
+
 # --------------------------------------------------
 # LangGraph (build once)
 # --------------------------------------------------
 
 try:
     # Maintain separate graphs per persona
-    graphs = {
-        "strict": build_graph_strict(),
-        "coach": build_graph_coach(),
-    }
-    logger.info("Interview graphs compiled successfully")
+    if INTERVIEW_ENGINE == "native":
+        graphs = {
+            "strict": build_native_strict_fused() if FUSED_TURNS else build_native_strict(),
+            "coach": build_native_coach(),
+        }
+    else:
+        graphs = {
+            "strict": build_graph_strict_fused() if FUSED_TURNS else build_graph_strict(),
+            "coach": build_graph_coach(),
+        }
+    logger.info(f"Interview graphs compiled successfully (engine={INTERVIEW_ENGINE})")
 except Exception as e:
     logger.error(f"Failed to compile graphs: {e}")
     raise
 
+# Completed interviews, appended off the request path
+results_store = ResultsStore(RESULTS_STORE_DIR or None)
+
 # Session management with TTL
 SESSION_PERSONAS: dict[str, str] = {}  # session_id → persona
 SESSION_TIMESTAMPS: dict[str, datetime] = {}  # session_id → last_access_time
 SESSION_LAST_PROMPT: dict[str, str] = {}  # session_id → latest question prompt
 SESSION_CONTEXT: dict[str, dict] = {}  # session_id → context (role, experience, persona)
+SESSION_HINTS: dict[str, tuple[str, Future]] = {}  # session_id → (question, pre-generated hint)
+
+hint_executor = ThreadPoolExecutor(max_workers=HINT_PREGENERATE_WORKERS, thread_name_prefix="hint")
 
 
 def cleanup_expired_sessions():
@@ -78,12 +150,35 @@ def cleanup_expired_sessions():
         SESSION_TIMESTAMPS.pop(sid, None)
         SESSION_LAST_PROMPT.pop(sid, None)
         SESSION_CONTEXT.pop(sid, None)
+        discard_hint(sid)
+        speculator.discard(sid)
+        turn_precomputer.discard(sid)
+        session_states.discard(sid)
+        speech_channels.discard(sid)
     if expired:
         logger.info(f"Cleaned up {len(expired)} expired sessions")
 
 
+rate_limiter = RateLimiter(RATE_LIMITS, create_bucket_store(RATE_LIMIT_STORE_URL), enabled=RATE_LIMIT_ENABLED)
+rate_limit_api_keys = frozenset(RATE_LIMIT_API_KEYS)
+rate_limit_proxies = parse_networks(RATE_LIMIT_TRUSTED_PROXIES)
+
+
+def enforce_rate_limit(request, endpoint: str, scope: Optional[str] = None):
+    """Reject with 429 + Retry-After when the client's bucket is empty. Call before any graph work."""
+    retry_after = rate_limiter.check(endpoint, client_key(request, rate_limit_api_keys, rate_limit_proxies), scope)
+    if retry_after is not None:
+        logger.warning(f"Rate limited: endpoint={endpoint}, retry_after={retry_after}s")
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests. Try again later.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
 def validate_session(session_id: str) -> str:
     """Validate session exists and return persona. Raises HTTPException if invalid."""
+    bind_thread()  # Attribute this worker thread's stacks to the request if it is profiled
     cleanup_expired_sessions()
     
     if session_id not in SESSION_PERSONAS:
@@ -94,8 +189,9 @@ def validate_session(session_id: str) -> str:
     return SESSION_PERSONAS[session_id]
 
 
-def create_session(persona: str) -> str:
+def create_session(persona: str, session_id: Optional[str] = None) -> str:
     """Create new session with persona. Enforces MAX_SESSIONS limit."""
+    bind_thread()
     cleanup_expired_sessions()
     
     if len(SESSION_PERSONAS) >= MAX_SESSIONS:
@@ -104,12 +200,58 @@ def create_session(persona: str) -> str:
             detail=f"Maximum concurrent sessions ({MAX_SESSIONS}) reached. Try again later."
         )
     
-    session_id = str(uuid4())
+    # A claimed warm-pool thread keeps its id
+    session_id = session_id or str(uuid4())
     SESSION_PERSONAS[session_id] = persona
     SESSION_TIMESTAMPS[session_id] = datetime.now()
     logger.info(f"Created session {session_id} with persona '{persona}'")
     return session_id
 
+
+def set_last_prompt(session_id: str, question: str):
+    """Record the session's current question and start generating its hint in the background."""
+    SESSION_LAST_PROMPT[session_id] = question
+    if not HINT_PREGENERATE:
+        return
+    pending = SESSION_HINTS.get(session_id)
+    if pending is not None and pending[0] == question:
+        return  # Same question re-shown (coach feedback step)
+    discard_hint(session_id)
+    # Don't add LLM load while hints are being shed
+    if degradation.sheds("no_hints"):
+        return
+    ctx = SESSION_CONTEXT.get(session_id, {})
+    future = hint_executor.submit(hint_agent, question, ctx.get("role"), ctx.get("experience"))
+    SESSION_HINTS[session_id] = (question, future)
+    metrics.incr("hints.pregenerated")
+
+
+def discard_hint(session_id: str):
+    pending = SESSION_HINTS.pop(session_id, None)
+    if pending is not None:
+        pending[1].cancel()
+
+
+def take_pregenerated_hint(session_id: str, question: str) -> Optional[str]:
+    """
+    Pre-generated hint for the current question, or None to fall back to a live call.
+
+    Blocks on a pre-generation still in flight, since it started before this
+    request and is ahead of a fresh call.
+    """
+    pending = SESSION_HINTS.get(session_id)
+    if pending is None or pending[0] != question:
+        return None
+    future = pending[1]
+    metrics.incr("hints.served_ready" if future.done() else "hints.served_waited")
+    try:
+        return future.result().hint or None
+    except Exception as e:
+        SESSION_HINTS.pop(session_id, None)
+        metrics.incr("hints.pregenerate_errors")
+        logger.warning(f"Pre-generated hint failed, generating live: {e}")
+        return None
+
 # --------------------------------------------------
 # Schemas
 # --------------------------------------------------
@@ -136,10 +278,109 @@ class ContinueRequest(BaseModel):
 class HintRequest(BaseModel):
     session_id: str
 
+
+class PartialTranscriptRequest(BaseModel):
+    session_id: str
+    text: str
+
 # --------------------------------------------------
-# STT endpoints removed - using Azure SDK in frontend
+# Streaming STT: audio frames in, transcript straight into the graph
 # --------------------------------------------------
 
+_stt_engine = None
+
+
+def get_stt_engine():
+    """Create the configured STT engine on first use."""
+    global _stt_engine
+    if _stt_engine is None:
+        _stt_engine = create_stt_engine()
+        logger.info(f"STT engine ready: {_stt_engine.name}")
+    return _stt_engine
+
+
+@app.websocket("/interview/answer/stream")
+async def stream_answer(websocket: WebSocket, session_id: str):
+    """
+    Recognize a spoken answer server-side and submit it without a client hop.
+
+    Client sends binary 16-bit mono PCM frames, then {"type": "end"}.
+    Server sends {"type": "partial", "text"} while recognizing and finally
+    {"type": "final", "transcript", "result"} where result is the same body
+    /interview/answer returns. {"type": "cancel"} discards the utterance.
+    """
+    await websocket.accept()
+    try:
+        enforce_rate_limit(websocket, "/interview/answer")
+        persona = validate_session(session_id)
+    except HTTPException as e:
+        error = {"type": "error", "detail": e.detail}
+        if e.status_code == 429:
+            error["retry_after"] = int(e.headers["Retry-After"])
+        await websocket.send_json(error)
+        await websocket.close(code=4000 + e.status_code)
+        return
+
+    loop = asyncio.get_running_loop()
+    partials: asyncio.Queue = asyncio.Queue()
+
+    question = SESSION_LAST_PROMPT.get(session_id)
+
+    def on_partial(text: str):
+        # Engines may call back from their own threads
+        speculator.observe(session_id, question, text)
+        loop.call_soon_threadsafe(partials.put_nowait, text)
+
+    try:
+        stream = await run_in_threadpool(get_stt_engine().start_stream, on_partial)
+    except Exception as e:
+        logger.error(f"Failed to start speech recognition: {e}")
+        await websocket.send_json({"type": "error", "detail": "Speech recognition unavailable"})
+        await websocket.close(code=1011)
+        return
+
+    async def forward_partials():
+        last = None
+        while True:
+            text = await partials.get()
+            if text and text != last:
+                last = text
+                await websocket.send_json({"type": "partial", "text": text})
+
+    forwarder = asyncio.create_task(forward_partials())
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                stream.close()
+                return
+            if message.get("bytes") is not None:
+                await run_in_threadpool(stream.push, message["bytes"])
+                continue
+            control = json.loads(message.get("text") or "{}")
+            if control.get("type") == "cancel":
+                stream.close()
+                await websocket.close()
+                return
+            if control.get("type") == "end":
+                break
+
+        transcript = await run_in_threadpool(stream.finish)
+        forwarder.cancel()
+        logger.info(f"Streamed answer recognized: session={session_id}, chars={len(transcript)}")
+        result = await run_in_threadpool(process_answer, session_id, persona, transcript)
+        await websocket.send_json({"type": "final", "transcript": transcript, "result": result})
+        await websocket.close()
+    except HTTPException as e:
+        await websocket.send_json({"type": "error", "detail": e.detail})
+        await websocket.close(code=1011)
+    except Exception as e:
+        logger.error(f"Streaming answer failed: {e}")
+        await websocket.send_json({"type": "error", "detail": "Failed to process spoken answer"})
+        await websocket.close(code=1011)
+    finally:
+        forwarder.cancel()
+
 # --------------------------------------------------
 # Azure Speech Token (Secure)
 # --------------------------------------------------
@@ -171,18 +412,207 @@ def get_speech_token():
         logger.error(f"Error getting speech token: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get speech token: {str(e)}")
 
+# --------------------------------------------------
+# Server-side speech synthesis
+# --------------------------------------------------
+
+class SynthesizeRequest(BaseModel):
+    session_id: str
+    text: str
+    format: Optional[str] = None  # "ogg", "mp3" or "wav"; otherwise negotiated from Accept
+
+
+@app.post("/speech/synthesize")
+def synthesize(req: SynthesizeRequest, request: Request):
+    """
+    Synthesize interviewer speech for an active session as a chunked audio response.
+
+    Text is limited to TTS_MAX_TEXT_CHARS. Format comes from `format` or the Accept header (Opus/OGG by default);
+    chunks are sent as the engine produces them so playback can start early.
+    """
+    from backend.tts.tts_engine import AUDIO_FORMATS, get_tts_engine, negotiate_audio_format
+
+    enforce_rate_limit(request, "/speech/synthesize")
+    validate_session(req.session_id)
+    if not req.text.strip():
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    if len(req.text) > TTS_MAX_TEXT_CHARS:
+        raise HTTPException(status_code=413, detail=f"Text is longer than {TTS_MAX_TEXT_CHARS} characters")
+    try:
+        audio_format = negotiate_audio_format(request.headers.get("accept"), req.format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        chunks = get_tts_engine().stream(req.text, audio_format)
+        # Pull the first chunk here so engine errors surface as a proper status
+        first = next(chunks, b"")
+    except Exception as e:
+        logger.error(f"Speech synthesis failed: {e}")
+        raise HTTPException(status_code=502, detail="Speech synthesis failed")
+
+    logger.info(f"Synthesizing speech: format={audio_format}, chars={len(req.text)}")
+    return StreamingResponse(
+        itertools.chain([first], chunks),
+        media_type=AUDIO_FORMATS[audio_format]["media_type"],
+        headers={"X-Audio-Format": audio_format, "Cache-Control": "no-store"},
+    )
+
+
+
+@app.get("/interview/{session_id}/speech/{kind}")
+def stream_session_speech(
+    session_id: str,
+    kind: Literal["feedback", "closing"],
+    request: Request,
+    number: int = 0,
+    format: Optional[str] = None,
+):
+    """
+    Speak coach feedback (for question `number`) or the closing while it is generated.
+
+    Open it together with the /interview/answer (or /interview/end) request
+    that produces the text. Each sentence is synthesized as soon as the LLM
+    has written it, and audio segments are sent in order. Needs SPEECH_PIPELINE.
+    """
+    from backend.tts.tts_engine import AUDIO_FORMATS, get_tts_engine, negotiate_audio_format
+
+    enforce_rate_limit(request, "/speech/synthesize")
+    if not SPEECH_PIPELINE:
+        raise HTTPException(status_code=404, detail="Speech pipelining is disabled")
+    validate_session(session_id)
+    try:
+        audio_format = negotiate_audio_format(request.headers.get("accept"), format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    channel = speech_channels.attach(session_id, kind, number if kind == "feedback" else 0)
+    if channel is None:
+        raise HTTPException(status_code=404, detail=f"A newer {kind} has replaced this one")
+
+    chunks = pipelined_speech(channel.sentences(timeout=SPEECH_STREAM_WAIT_SECONDS), get_tts_engine(), audio_format)
+    try:
+        # Wait for the first sentence's audio here so failures get a proper status
+        first = next(chunks, b"")
+    except TimeoutError:
+        speech_channels.release(session_id, kind, channel)
+        raise HTTPException(status_code=504, detail=f"No {kind} was generated in time")
+    except Exception as e:
+        speech_channels.release(session_id, kind, channel)
+        logger.error(f"Speech synthesis failed: {e}")
+        raise HTTPException(status_code=502, detail="Speech synthesis failed")
+
+    def stream():
+        try:
+            yield first
+            yield from chunks
+        except Exception as e:
+            logger.error(f"Pipelined speech stopped early: {e}")
+        finally:
+            speech_channels.release(session_id, kind, channel)
+
+    return StreamingResponse(
+        stream(),
+        media_type=AUDIO_FORMATS[audio_format]["media_type"],
+        headers={"X-Audio-Format": audio_format, "Cache-Control": "no-store"},
+    )
+
 # --------------------------------------------------
 
-@app.get("/")
 def health():
     return {"status": "ok"}
 
+
+app.add_api_route("/health", health, methods=["GET"])
+if not FRONTEND_DIST_DIR:
+    # Without a bundled frontend the root doubles as the health check
+    app.add_api_route("/", health, methods=["GET"])
+
+
+@app.get("/metrics")
+def get_metrics():
+    """In-process counters, gauges and latency percentiles."""
+    return {
+        **metrics.snapshot(),
+        "structured_output": parse_failure_rates(),
+        "speculation": speculator.stats(),
+        "degradation": degradation.stats(),
+        "warm_pool": warm_pool.stats(),
+        "coach_precompute": turn_precomputer.stats(),
+        "topics": topic_index.stats(),
+        "llm_batching": batching_stats(),
+    }
+
 # --------------------------------------------------
 # Start Interview
 # --------------------------------------------------
 
+def initial_state(role: str, experience: str, role_description: Optional[str], persona: str) -> InterviewState:
+    return {
+        "role": role,
+        "experience": experience,
+        "role_description": role_description or None,
+        "persona": persona,
+
+        "current_question": None,
+        "last_answer_text": None,
+
+        "evaluation": None,
+        "feedback": None,
+        "evaluations_history": [],
+
+        "score_history": [],
+        "weak_topics": set(),
+
+        "difficulty": "easy",
+        "question_count": 0,
+        "end_interview": False,
+        "asked_questions": [],
+
+        "summary": None,
+        "spoken_transition": None,
+        "spoken_closing": None,
+    }
+
+
+def run_first_question(thread_id: str, state: InterviewState) -> Optional[str]:
+    """Run a new graph thread up to its first answer interrupt and return the question."""
+    result = graphs[state["persona"]].invoke(state, config={"configurable": {"thread_id": thread_id}})
+    if "__interrupt__" not in result:
+        return None
+    return result["__interrupt__"][0].value["prompt"]
+
+
+def prestart_interview(role: str, experience: str, persona: str):
+    thread_id = str(uuid4())
+    question = run_first_question(thread_id, initial_state(role, experience, None, persona))
+    if question is None:
+        raise RuntimeError("Interview did not start")
+    return thread_id, question
+
+
+def discard_interview_thread(persona: str, thread_id: str):
+    graphs[persona].checkpointer.delete_thread(thread_id)
+    session_states.discard(thread_id)
+    speech_channels.discard(thread_id)
+    turn_precomputer.discard(thread_id)
+
+
+warm_pool = WarmPool(
+    fill=prestart_interview,
+    discard=discard_interview_thread,
+    max_per_key=WARM_POOL_MAX_PER_KEY,
+    max_total=WARM_POOL_MAX_TOTAL,
+    ttl_seconds=WARM_POOL_TTL_SECONDS,
+    demand_window=WARM_POOL_DEMAND_WINDOW,
+    lead_seconds=WARM_POOL_LEAD_SECONDS,
+    enabled=WARM_POOL_ENABLED,
+)
+
+
 @app.post("/interview/start")
-def start_interview(req: StartInterviewRequest):
+def start_interview(req: StartInterviewRequest, request: Request):
+    enforce_rate_limit(request, "/interview/start")
     logger.info(f"Starting interview: role={req.role}, experience={req.experience}, persona={req.persona}")
     
     # Validate persona
@@ -193,10 +623,17 @@ def start_interview(req: StartInterviewRequest):
             detail=f"Invalid persona '{persona}'. Must be one of: {AVAILABLE_PERSONAS}"
         )
 
+    # A pre-started interview skips question generation; custom role descriptions are always live
+    warm = None
+    if not req.role_description and req.role and req.role.strip() and req.experience and req.experience.strip():
+        warm = warm_pool.claim(req.role, req.experience, persona)
+
     # Create session with limit enforcement
     try:
-        session_id = create_session(persona)
+        session_id = create_session(persona, session_id=warm.thread_id if warm else None)
     except HTTPException:
+        if warm:
+            discard_interview_thread(persona, warm.thread_id)
         raise
 
     # Store lightweight session context for hinting
@@ -212,49 +649,24 @@ def start_interview(req: StartInterviewRequest):
     if not req.experience or not req.experience.strip():
         raise HTTPException(status_code=400, detail="Experience is required")
 
-    state: InterviewState = {
-        "role": req.role,
-        "experience": req.experience,
-        "role_description": req.role_description or None,
-        "persona": persona,
-
-        "current_question": None,
-        "last_answer_text": None,
-
-        "evaluation": None,
-        "feedback": None,
-        "evaluations_history": [],
-
-        "score_history": [],
-        "weak_topics": set(),
-
-        "difficulty": "easy",
-        "question_count": 0,
-        "end_interview": False,
-        "asked_questions": [],
-
-        "summary": None,
-        "spoken_transition": None,
-        "spoken_closing": None,
-    }
-
-    try:
-        result = graphs[persona].invoke(
-            state,
-            config={"configurable": {"thread_id": session_id}},
-        )
-    except Exception as e:
-        logger.error(f"Graph invocation failed: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to start interview: {str(e)}")
+    if warm:
+        question = warm.question
+        logger.info(f"Interview started from warm pool: session={session_id}")
+    else:
+        try:
+            question = run_first_question(
+                session_id, initial_state(req.role, req.experience, req.role_description, persona)
+            )
+        except Exception as e:
+            logger.error(f"Graph invocation failed: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to start interview: {str(e)}")
 
-    if "__interrupt__" not in result:
-        raise HTTPException(status_code=500, detail="Interview did not start")
+        if question is None:
+            raise HTTPException(status_code=500, detail="Interview did not start")
 
-    question = result["__interrupt__"][0].value["prompt"]
-    
-    logger.info(f"Interview started successfully: session={session_id}")
+        logger.info(f"Interview started successfully: session={session_id}")
 
-    SESSION_LAST_PROMPT[session_id] = question
+    set_last_prompt(session_id, question)
 
     return {
         "session_id": session_id,
@@ -266,20 +678,25 @@ def start_interview(req: StartInterviewRequest):
 # --------------------------------------------------
 
 @app.post("/interview/answer")
-def answer_interview(req: AnswerRequest):
+def answer_interview(req: AnswerRequest, request: Request):
+    enforce_rate_limit(request, "/interview/answer")
     # Validate session
     persona = validate_session(req.session_id)
+    return process_answer(req.session_id, persona, req.answer)
+
+
+def process_answer(session_id: str, persona: str, answer: str) -> dict:
+    """Resume the session's graph with an answer and shape the next-step response."""
+    answer_preview = (answer[:50] if answer else "EMPTY")
+    logger.info(f"Answer received: session={session_id}, preview='{answer_preview}...'")
     
-    answer_preview = (req.answer[:50] if req.answer else "EMPTY")
-    logger.info(f"Answer received: session={req.session_id}, preview='{answer_preview}...'")
-    
-    if not req.answer or not req.answer.strip():
-        logger.warning(f"Empty answer received for session {req.session_id}")
+    if not answer or not answer.strip():
+        logger.warning(f"Empty answer received for session {session_id}")
     
     try:
         result = graphs[persona].invoke(
-            Command(resume=req.answer),
-            config={"configurable": {"thread_id": req.session_id}},
+            Command(resume=answer),
+            config={"configurable": {"thread_id": session_id}},
         )
     except Exception as e:
         logger.error(f"Graph invocation failed: {e}")
@@ -290,7 +707,9 @@ def answer_interview(req: AnswerRequest):
     # Interview finished
     # -----------------------------
     if result.get("summary"):
-        logger.info(f"Interview completed: session={req.session_id}")
+        logger.info(f"Interview completed: session={session_id}")
+        results_store.record(SESSION_CONTEXT.get(session_id, {}), result)
+        discard_hint(session_id)
         
         if "spoken_closing" not in result:
             raise HTTPException(
@@ -325,18 +744,18 @@ def answer_interview(req: AnswerRequest):
         raise HTTPException(status_code=500, detail="Expected next step")
 
     # Distinguish between feedback pause (coach) vs next question
-    transition = result.get("spoken_transition")
     feedback = result.get("feedback")
     interrupt_payload = result["__interrupt__"][0].value
 
-    # Coach flow: pause after feedback and let user press Proceed
-    if feedback and not transition and interrupt_payload.get("continue"):
-        logger.info(f"Coach feedback step: session={req.session_id}")
+    # Coach flow: paused at await_continue after feedback; the user presses Proceed.
+    # The pause itself says so: spoken_transition is still set from the previous turn.
+    if interrupt_payload.get("continue"):
+        logger.info(f"Coach feedback step: session={session_id}")
 
         # Capture current question for retry and display
         question = result.get("current_question") or interrupt_payload.get("prompt")
         if question:
-            SESSION_LAST_PROMPT[req.session_id] = question
+            set_last_prompt(session_id, question)
         
         # Extract evaluation data for frontend tracking
         evaluation_data = None
@@ -361,10 +780,10 @@ def answer_interview(req: AnswerRequest):
     question = interrupt_payload.get("prompt")
     transition = result.get("spoken_transition") or ""
     
-    logger.info(f"Next question: session={req.session_id}")
+    logger.info(f"Next question: session={session_id}")
 
     if question:
-        SESSION_LAST_PROMPT[req.session_id] = question
+        set_last_prompt(session_id, question)
 
     # Extract evaluation data for frontend tracking (available for all personas)
     evaluation_data = None
@@ -391,6 +810,22 @@ def answer_interview(req: AnswerRequest):
         "evaluation": evaluation_data,
     }
 
+# --------------------------------------------------
+# Interim transcript (browser-side recognition)
+# --------------------------------------------------
+
+@app.post("/interview/partial")
+def partial_transcript(req: PartialTranscriptRequest, request: Request):
+    """
+    Report an interim transcript while the candidate is still speaking.
+    Once it stays stable, evaluation starts speculatively so that
+    /interview/answer can reuse the result.
+    """
+    enforce_rate_limit(request, "/interview/partial")
+    validate_session(req.session_id)
+    speculator.observe(req.session_id, SESSION_LAST_PROMPT.get(req.session_id), req.text)
+    return {"accepted": True}
+
 # --------------------------------------------------
 # End Interview Early
 # --------------------------------------------------
@@ -401,27 +836,24 @@ def end_interview(req: EndSessionRequest):
     
     # Validate session
     persona = validate_session(req.session_id)
-    
-    # Step 1: Resume to process current answer and get state
-    try:
-        result = graphs[persona].invoke(
-            Command(resume="[Session ended early by user]"),
-            config={"configurable": {"thread_id": req.session_id}},
-        )
-    except Exception as e:
-        logger.error(f"Error during resume: {e}")
-        result = {}
-    
-    # Step 2: If we don't have a summary, manually call end_interview_agent
-    if not result.get("summary"):
-        logger.info("No summary from graph, calling end_interview_agent directly")
-        from backend.agents import end_interview_agent
-        
-        # The end_interview_agent needs score_history and weak_topics from state
-        # which should be in the graph's memory now
-        summary_result = end_interview_agent(cast(InterviewState, result))
-        result.update(summary_result)
-    
+    config = {"configurable": {"thread_id": req.session_id}}
+    speculator.discard(req.session_id)
+    discard_hint(req.session_id)
+
+    snapshot = graphs[persona].get_state(config)
+    result = dict(snapshot.values or {})
+
+    # Thread paused at a question or feedback: jump straight to end_node using the
+    # checkpointed history (no evaluation of a placeholder answer, no next question)
+    if snapshot.next and not result.get("summary"):
+        try:
+            result = graphs[persona].invoke(Command(resume=END_EARLY_SIGNAL), config=config)
+        except Exception as e:
+            logger.error(f"Early end failed: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to end interview: {str(e)}")
+        if result.get("summary"):
+            results_store.record(SESSION_CONTEXT.get(req.session_id, {}), result)
+
     logger.info(f"Interview ended early: session={req.session_id}")
     
     if result.get("summary"):
@@ -444,8 +876,9 @@ def end_interview(req: EndSessionRequest):
 # --------------------------------------------------
 
 @app.post("/interview/continue")
-def continue_after_feedback(req: ContinueRequest):
+def continue_after_feedback(req: ContinueRequest, request: Request):
     logger.info(f"Continue after feedback: session={req.session_id}")
+    enforce_rate_limit(request, "/interview/continue")
     
     # Validate session
     persona = validate_session(req.session_id)
@@ -459,6 +892,17 @@ def continue_after_feedback(req: ContinueRequest):
         logger.error(f"Graph invocation failed: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to continue: {str(e)}")
 
+    # Proceeding after the last question's feedback finishes the interview
+    if result.get("summary"):
+        logger.info(f"Interview completed: session={req.session_id}")
+        results_store.record(SESSION_CONTEXT.get(req.session_id, {}), result)
+        discard_hint(req.session_id)
+        return {
+            "final": True,
+            "summary": result["summary"],
+            "spoken_closing": result.get("spoken_closing", "Session ended. Thank you for the interview!"),
+        }
+
     if "__interrupt__" not in result:
         raise HTTPException(status_code=500, detail="Expected next question")
 
@@ -469,7 +913,7 @@ def continue_after_feedback(req: ContinueRequest):
     logger.info(f"Next question after continue: session={req.session_id}")
 
     if question:
-        SESSION_LAST_PROMPT[req.session_id] = question
+        set_last_prompt(req.session_id, question)
 
     spoken_text = f"{transition} {question}" if transition else question
 
@@ -486,7 +930,7 @@ def continue_after_feedback(req: ContinueRequest):
 # --------------------------------------------------
 
 @app.post("/interview/hint")
-def get_hint(req: HintRequest):
+def get_hint(req: HintRequest, request: Request):
     logger.info(f"Hint requested: session={req.session_id}")
 
     # Validate session
@@ -496,13 +940,25 @@ def get_hint(req: HintRequest):
     if not question:
         raise HTTPException(status_code=400, detail="No active question found for this session")
 
-    ctx = SESSION_CONTEXT.get(req.session_id, {})
-    try:
-        hint = hint_agent(question, ctx.get("role"), ctx.get("experience"))
-        hint_text = hint.hint if hasattr(hint, "hint") else hint.get("hint") if isinstance(hint, dict) else None
-    except Exception as e:
-        logger.error(f"Hint generation failed: {e}")
-        raise HTTPException(status_code=500, detail="Failed to generate hint")
+    # Hint budget is per question, so a new question starts a fresh bucket
+    enforce_rate_limit(request, "/interview/hint", scope=f"{req.session_id}:{zlib.crc32(question.encode())}")
+
+    hint_text = take_pregenerated_hint(req.session_id, question)
+    if hint_text is None:
+        if degradation.sheds("no_hints"):
+            raise HTTPException(
+                status_code=503,
+                detail="Hints are temporarily unavailable. Please try again shortly.",
+                headers={"Retry-After": str(int(degradation.recover_seconds))},
+            )
+
+        metrics.incr("hints.live")
+        ctx = SESSION_CONTEXT.get(req.session_id, {})
+        try:
+            hint_text = hint_agent(question, ctx.get("role"), ctx.get("experience")).hint
+        except Exception as e:
+            logger.error(f"Hint generation failed: {e}")
+            raise HTTPException(status_code=500, detail="Failed to generate hint")
 
     if not hint_text:
         logger.warning(f"Hint empty for session {req.session_id}")
@@ -512,3 +968,138 @@ def get_hint(req: HintRequest):
         "hint": hint_text,
         "persona": persona,
     }
+
+
+# --------------------------------------------------
+# Transcript export
+# --------------------------------------------------
+
+@app.get("/interview/{session_id}/transcript")
+def export_transcript(session_id: str, request: Request):
+    """
+    Questions, answers, evaluations and summary logged for a session, in order.
+
+    Admin only: the log outlives the session (and restarts), so a session id alone is no proof of access.
+    """
+    require_admin(request)
+    if not transcript_log.enabled:
+        raise HTTPException(status_code=404, detail="Transcript logging is disabled")
+    events = transcript_log.export_session(session_id)
+    if not events:
+        raise HTTPException(status_code=404, detail="No transcript found for this session")
+    return {"session_id": session_id, "events": events}
+
+
+@app.get("/interview/{session_id}/state")
+async def session_state(session_id: str):
+    """
+    Where a session stands, for a client reconnecting after a reload or dropped connection.
+
+    Served from the read model kept up to date by the graph nodes: no graph
+    invocation, no checkpoint read, no LLM call. Async so reconnect bursts
+    don't queue behind graph work in the threadpool.
+    """
+    timestamp = SESSION_TIMESTAMPS.get(session_id)
+    record = session_states.get(session_id)
+    if timestamp is None or record is None or datetime.now() - timestamp > timedelta(minutes=SESSION_TTL_MINUTES):
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    SESSION_TIMESTAMPS[session_id] = datetime.now()
+    return {
+        "session_id": session_id,
+        "persona": SESSION_PERSONAS.get(session_id),
+        "question_limit": question_limit(),
+        **record,
+    }
+
+
+# --------------------------------------------------
+# Admin: request profiling
+# --------------------------------------------------
+
+def require_admin(request: Request):
+    if not profiler.admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN is not set)")
+    if not profiler.is_admin(request.headers.get("x-admin-token")):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@app.get("/admin/profiles/{profile_id}")
+def get_profile(profile_id: str, request: Request):
+    """Folded stacks of a profiled request, for flamegraph.pl, inferno or speedscope."""
+    require_admin(request)
+    folded = profiler.get_profile(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=404, detail="Profile not found or evicted")
+    return PlainTextResponse(
+        folded, headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.folded"'}
+    )
+
+
+@app.get("/admin/slow-requests")
+def get_slow_requests(request: Request, limit: int = 50):
+    """Most recent /interview/* requests above SLOW_REQUEST_MS, newest first."""
+    require_admin(request)
+    return {"threshold_ms": profiler.slow_ms, "requests": profiler.recent_slow(limit)}
+
+
+@app.get("/admin/request-breakdown")
+def get_request_breakdown(request: Request):
+    """Per-endpoint latency split into time inside LLM calls and everything else."""
+    require_admin(request)
+    return {"endpoints": profiler.breakdown()}
+
+
+# --------------------------------------------------
+# Cohort analytics over completed interviews
+# --------------------------------------------------
+
+@app.get("/analytics/scores")
+def analytics_scores(
+    request: Request,
+    group_by: str = "role",
+    role: Optional[str] = None,
+    experience: Optional[str] = None,
+    persona: Optional[str] = None,
+):
+    """Average-score percentiles per role, experience or persona."""
+    require_admin(request)
+    try:
+        groups = results_store.score_percentiles(group_by, role=role, experience=experience, persona=persona)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"group_by": group_by, "groups": groups}
+
+
+@app.get("/analytics/weak-topics")
+def analytics_weak_topics(
+    request: Request,
+    top: int = 20,
+    role: Optional[str] = None,
+    experience: Optional[str] = None,
+    persona: Optional[str] = None,
+):
+    """Most frequent weak topics across matching interviews."""
+    require_admin(request)
+    return {"topics": results_store.weak_topic_frequencies(top, role=role, experience=experience, persona=persona)}
+
+
+@app.get("/analytics/difficulty-transitions")
+def analytics_difficulty_transitions(
+    request: Request,
+    role: Optional[str] = None,
+    experience: Optional[str] = None,
+    persona: Optional[str] = None,
+):
+    """Difficulty moves between consecutive questions, overall and per turn."""
+    require_admin(request)
+    return results_store.difficulty_transitions(role=role, experience=experience, persona=persona)
+
+# --------------------------------------------------
+# Built frontend (same-origin, mounted last so API routes win)
+# --------------------------------------------------
+
+if FRONTEND_DIST_DIR:
+    mount_frontend(app, FRONTEND_DIST_DIR)
+
+# Everything above is start-up state; keep it out of GC passes
+configure_gc(GC_FREEZE, GC_GEN0_THRESHOLD)
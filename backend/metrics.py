@@ -0,0 +1,75 @@
+"""
+In-process counters, gauges and latency samples for the interview backend.
+"""
+
+from collections import deque
+from typing import Deque, Dict
+import threading
+
+TIMING_WINDOW = 2048  # Latency samples kept per series
+
+
+def _percentile(ordered, pct: float) -> float:
+    if not ordered:
+        return 0.0
+    idx = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[idx]
+
+
+class Metrics:
+    """Thread-safe registry of named counters, gauges and rolling timings."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._timings: Dict[str, Deque[float]] = {}
+
+    def incr(self, name: str, value: float = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float):
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, ms: float):
+        with self._lock:
+            series = self._timings.get(name)
+            if series is None:
+                series = self._timings[name] = deque(maxlen=TIMING_WINDOW)
+            series.append(ms)
+
+    def counter(self, name: str) -> float:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def timing(self, name: str) -> Dict[str, float]:
+        with self._lock:
+            ordered = sorted(self._timings.get(name, ()))
+        return {
+            "count": len(ordered),
+            "p50_ms": round(_percentile(ordered, 50), 2),
+            "p95_ms": round(_percentile(ordered, 95), 2),
+            "p99_ms": round(_percentile(ordered, 99), 2),
+        }
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            names = list(self._timings)
+        return {
+            "counters": counters,
+            "gauges": gauges,
+            "timings": {name: self.timing(name) for name in names},
+        }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timings.clear()
+
+
+metrics = Metrics()
@@ -1,4 +1,4 @@
-from typing import TypedDict, List, Set, Optional, Dict
+from typing import TypedDict, List, Literal, Set, Optional, Dict
 from pydantic import BaseModel
 
 
@@ -25,9 +25,9 @@ class EvaluationWithFeedback(BaseModel):
     """Combined evaluation and feedback in a single LLM call."""
     score: float
     topic: str
+    feedback: str  # Before the lists: constrained decoding follows field order, so speech can start early
     strengths: List[str]
     weaknesses: List[str]
-    feedback: str
 
 
 class FeedbackAndTransition(BaseModel):
@@ -35,6 +35,18 @@ class FeedbackAndTransition(BaseModel):
     transition: str
 
 
+class FusedTurn(BaseModel):
+    """Evaluation, feedback, transition and next question in a single LLM call (fused-turn mode)."""
+    score: float
+    topic: str
+    strengths: List[str]
+    weaknesses: List[str]
+    feedback: str
+    next_difficulty: Literal["easy", "hard"]
+    transition: str
+    next_question: str
+
+
 class SpokenTransition(BaseModel):
     transition: str
 
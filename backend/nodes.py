@@ -1,26 +1,58 @@
-from typing import Dict
-from langgraph.types import interrupt
-from backend.models import InterviewState
+from typing import Callable, Dict, Optional
+from langchain_core.runnables import RunnableConfig
+from backend.engine import interrupt
+from backend.models import InterviewState, Evaluation
+from backend.prescreen import prescreen_answer
+from backend.speculation import SpeculativeEvaluator
+from backend.precompute import TurnPrecomputer
+from backend.degrade import degradation
+from backend.metrics import metrics
+from backend.transcripts import TranscriptLog
+from backend.stopping import likely_to_stop, question_limit
+from backend.topics import canonical_topic
+from backend.tts.pipeline import field_feeder, speech_channels
+from backend.config import (
+    PRESCREEN_ANSWERS,
+    SPECULATIVE_EVALUATION,
+    SPECULATION_STABLE_MS,
+    SPECULATION_SIMILARITY,
+    SPECULATION_MAX_PER_ANSWER,
+    TRANSCRIPT_LOG_DIR,
+    TRANSCRIPT_FSYNC,
+    SPEECH_PIPELINE,
+    COACH_PRECOMPUTE,
+    COACH_PRECOMPUTE_WORKERS,
+)
 from backend.agents import (
     ask_question_agent,
     evaluate_with_feedback_agent,
     decision_agent,
     end_interview_agent,
+    fused_turn_agent,
     transition_agent
 )
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# Resume value sent by /interview/end to route an interrupted thread straight to end_node
+END_EARLY_SIGNAL = {"end_early": True}
+
+
+def is_end_early(resume_value) -> bool:
+    return isinstance(resume_value, dict) and bool(resume_value.get("end_early"))
+
 
-def _extract_attr(obj, attr_name):
-    """Safely extract attribute from Pydantic model or dict."""
-    if isinstance(obj, dict):
-        return obj.get(attr_name)
-    return getattr(obj, attr_name, None)
+# Durable record of each session's questions, answers and evaluations
+transcript_log = TranscriptLog(TRANSCRIPT_LOG_DIR or None, fsync=TRANSCRIPT_FSYNC)
 
 
-def ask_question_node(state: InterviewState) -> Dict:
+def _thread_id(config: Optional[RunnableConfig]) -> Optional[str]:
+    return (config or {}).get("configurable", {}).get("thread_id")
+
+
+def ask_question_node(state: InterviewState, config: Optional[RunnableConfig] = None) -> Dict:
     """
     Generate the next interview question.
 
@@ -31,12 +63,25 @@ def ask_question_node(state: InterviewState) -> Dict:
     Update the current question and track it as asked.
     """
     logger.debug(f"Generating question (difficulty={state['difficulty']}, count={state['question_count']})")
+    return _question_updates(state, _generate_question(state), _thread_id(config))
+
+
+def _generate_question(state: InterviewState) -> str:
     q = ask_question_agent(state)
-    question_text = _extract_attr(q, "question")
+    question_text = q.question.strip()
     if not question_text:
-        logger.error(f"Question generation failed: got {type(q).__name__} = {q}")
+        logger.error(f"Question generation failed: got {q!r}")
         raise ValueError(f"Question generation failed: missing 'question' field")
+    return question_text
+
+
+def _question_updates(state: InterviewState, question_text: str, thread_id: Optional[str]) -> Dict:
     logger.info(f"Generated question: {question_text[:100]}...")
+    transcript_log.append(thread_id, "question", {
+        "number": state["question_count"] + 1,
+        "difficulty": state["difficulty"],
+        "question": question_text,
+    })
     return {
         "current_question": question_text,
         "asked_questions": state["asked_questions"] + [question_text],
@@ -49,12 +94,44 @@ def await_answer_node(state: InterviewState) -> Dict:
 
     Present the current question as a prompt and stop execution
     until an external system resumes the graph with the answer text.
+    Resuming with END_EARLY_SIGNAL skips evaluation and ends the interview.
     """
     answer = interrupt({"prompt": state["current_question"]})
+    if is_end_early(answer):
+        logger.info("Interview ended early while awaiting an answer")
+        return {"end_interview": True}
     return {"last_answer_text": answer}
 
 
-def evaluate_node(state: InterviewState) -> Dict:
+def run_evaluation(state: InterviewState, on_text: Optional[Callable[[str], None]] = None):
+    """
+    Pre-screen the answer, then evaluate it with feedback if it needs the LLM.
+
+    Only `current_question` and `last_answer_text` are read, so this can also
+    run speculatively on interim transcripts. `on_text` receives the raw LLM
+    reply as it streams.
+    """
+    screen = prescreen_answer(state["last_answer_text"]) if PRESCREEN_ANSWERS else None
+
+    if screen and screen["action"] == "score":
+        # Obvious non-answer: templated evaluation, no LLM call
+        return screen["evaluation"]
+    if screen and screen["action"] == "condense":
+        return evaluate_with_feedback_agent({**state, "last_answer_text": screen["answer"]}, on_text)
+    # Structured output is schema-validated, so every field is present
+    return evaluate_with_feedback_agent(state, on_text)
+
+
+speculator = SpeculativeEvaluator(
+    run_evaluation,
+    stable_ms=SPECULATION_STABLE_MS,
+    threshold=SPECULATION_SIMILARITY,
+    max_per_answer=SPECULATION_MAX_PER_ANSWER,
+    enabled=SPECULATIVE_EVALUATION,
+)
+
+
+def evaluate_node(state: InterviewState, config: Optional[RunnableConfig] = None) -> Dict:
     """
     Evaluate the candidate's answer AND generate feedback.
     
@@ -62,46 +139,69 @@ def evaluate_node(state: InterviewState) -> Dict:
     Analyze the answer for quality and understanding.
     Assign a numeric score and identify the primary topic,
     strengths, and weaknesses.
+    A matching speculative evaluation of the interim transcript is reused.
     """
     logger.debug(f"Evaluating answer (length={len(state['last_answer_text'] or '')} chars)")
-    ev = evaluate_with_feedback_agent(state)
-    
-    # Support dict return shape as well as Pydantic object
-    score = _extract_attr(ev, "score")
-    topic = _extract_attr(ev, "topic")
-    strengths = _extract_attr(ev, "strengths") or []
-    weaknesses = _extract_attr(ev, "weaknesses") or []
-    feedback_text = _extract_attr(ev, "feedback")
+    thread_id = _thread_id(config)
+    # Coach feedback is spoken: stream it to the session's speech channel as it is generated
+    channel = None
+    if SPEECH_PIPELINE and thread_id and state.get("persona") == "coach":
+        channel = speech_channels.open(thread_id, "feedback", state["question_count"] + 1)
+    try:
+        ev = speculator.take(thread_id, state["current_question"], state["last_answer_text"])
+        if ev is None:
+            ev = run_evaluation(state, field_feeder(channel, "feedback") if channel else None)
+    except Exception:
+        if channel:
+            channel.fail()
+        raise
+    if channel:
+        channel.finish(ev.feedback)
+    return _evaluation_updates(state, ev, thread_id)
 
-    if score is None or topic is None:
-        logger.error(f"Evaluation failed: got {type(ev).__name__} = {ev}")
-        raise ValueError(f"Evaluation failed: missing score or topic")
 
-    logger.info(f"Evaluation: score={score}, topic={topic}")
+def _evaluation_updates(state: InterviewState, ev, thread_id: Optional[str]) -> Dict:
+    topic = canonical_topic(ev.topic)
+    logger.info(f"Evaluation: score={ev.score}, topic={topic} (reported as {ev.topic!r})")
+    transcript_log.append(thread_id, "answer", {"answer": state["last_answer_text"]})
+    transcript_log.append(thread_id, "evaluation", {
+        "score": ev.score,
+        "topic": topic,
+        "reported_topic": ev.topic,
+        "strengths": ev.strengths,
+        "weaknesses": ev.weaknesses,
+        "feedback": ev.feedback,
+    })
 
-    from backend.models import Evaluation
     evaluation = Evaluation(
-        score=score,
+        score=ev.score,
         topic=topic,
-        strengths=strengths,
-        weaknesses=weaknesses
+        strengths=ev.strengths,
+        weaknesses=ev.weaknesses
     )
 
     return {
         "evaluation": evaluation,
-        "feedback": feedback_text,  # Set feedback here instead of in feedback_node
-        "score_history": state["score_history"] + [score],
+        "feedback": ev.feedback,  # Set feedback here instead of in feedback_node
+        "score_history": state["score_history"] + [ev.score],
         "evaluations_history": state["evaluations_history"] + [evaluation],
     }
 
 
-def await_continue_node(state: InterviewState) -> Dict:
+def await_continue_node(state: InterviewState, config: Optional[RunnableConfig] = None) -> Dict:
     """
     In coach persona, pause after feedback and wait for user to proceed.
     This allows the UI to present the voice feedback summary screen with a
     "Proceed to next question" option.
+    The next turn is prepared in the background meanwhile (see advance_node).
     """
+    thread_id = _thread_id(config)
+    turn_precomputer.start(thread_id, _turn_key(state), state)
     resume_val = interrupt({"continue": True})
+    if is_end_early(resume_val):
+        logger.info("Interview ended early during feedback pause")
+        turn_precomputer.discard(thread_id)
+        return {"end_interview": True}
     return {"proceed": resume_val}
 
 
@@ -117,7 +217,10 @@ def decision_node(state: InterviewState) -> Dict:
     if not state["evaluation"]:
         logger.error("decision_node called without evaluation")
         raise ValueError("Evaluation is required for decision")
-        
+    return _decision_updates(state)
+
+
+def _decision_updates(state: InterviewState) -> Dict:
     d = decision_agent(state, state["evaluation"])
 
     weak_topics = set(state["weak_topics"])
@@ -135,11 +238,133 @@ def decision_node(state: InterviewState) -> Dict:
     }
 
 def transition_node(state: InterviewState) -> Dict:
+    if degradation.sheds("skip_transition"):
+        # Under load the next question is spoken without a lead-in
+        return {"spoken_transition": None}
     t = transition_agent(state)
-    transition_text = _extract_attr(t, "transition")
-    return {"spoken_transition": transition_text}
+    return {"spoken_transition": t.transition}
+
+
+def prepare_next_turn(state: InterviewState) -> Dict:
+    """
+    Decision, transition and next question for the turn after `state`.
+
+    No side effects (transcript entries are written when the turn is
+    applied), so a discarded preparation leaves no trace.
+    """
+    decision = _decision_updates(state)
+    if decision["end_interview"]:
+        return {"decision": decision, "transition": None, "question": None}
+    next_state = {**state, **decision}
+    return {
+        "decision": decision,
+        "transition": transition_node(next_state)["spoken_transition"],
+        "question": _generate_question(next_state),
+    }
+
+
+def _turn_key(state: InterviewState):
+    """Identifies the paused state a preparation started from."""
+    return (state["question_count"], state["current_question"], len(state["score_history"]))
+
+
+turn_precomputer = TurnPrecomputer(prepare_next_turn, max_workers=COACH_PRECOMPUTE_WORKERS, enabled=COACH_PRECOMPUTE)
+
+
+def advance_node(state: InterviewState, config: Optional[RunnableConfig] = None) -> Dict:
+    """
+    Coach persona, after Proceed: apply the next turn prepared during the
+    feedback pause (decide, transition, ask), or compute it now on a miss.
+    """
+    thread_id = _thread_id(config)
+    prepared = turn_precomputer.take(thread_id, _turn_key(state))
+    if prepared is None:
+        prepared = prepare_next_turn(state)
+
+    updates = dict(prepared["decision"])
+    if updates["end_interview"]:
+        return updates
+    updates.update(_question_updates({**state, **updates}, prepared["question"], thread_id))
+    updates["spoken_transition"] = prepared["transition"]
+    return updates
+
+
+def _normalize_question(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def check_fused_question(turn, difficulty: str, asked_questions) -> Optional[str]:
+    """Why the fused turn's next question can't be used as is, or None if it can."""
+    question = turn.next_question.strip()
+    if not question:
+        return "empty"
+    if turn.next_difficulty != difficulty:
+        return "difficulty"
+    if _normalize_question(question) in {_normalize_question(q) for q in asked_questions}:
+        return "repeat"
+    return None
+
+
+def fused_turn_node(state: InterviewState, config: Optional[RunnableConfig] = None) -> Dict:
+    """
+    Evaluate, decide, transition and ask the next question as one step.
+
+    One fused LLM call replaces the evaluation, transition and question
+    calls. The difficulty and weak-topic decision is always made locally by
+    `decision_agent`; if the model's next question was written for another
+    difficulty (or is empty or a repeat) it is regenerated with the regular
+    question agent. The last turn, a matching speculative evaluation, a
+    pre-screened non-answer and the short-evaluation degradation level all
+    use the regular evaluation and skip the fused call. So does a turn after
+    which adaptive stopping is likely to end the interview, since its next
+    question would be discarded.
+    """
+    thread_id = _thread_id(config)
+    ev = speculator.take(thread_id, state["current_question"], state["last_answer_text"])
+    turn = None
+    last_turn = state["question_count"] >= question_limit() - 1
+    if not last_turn and likely_to_stop(state["score_history"]):
+        metrics.incr("fused.skipped.stop_likely")
+        last_turn = True
+
+    if ev is None and not last_turn and not degradation.sheds("short_evaluation"):
+        screen = prescreen_answer(state["last_answer_text"]) if PRESCREEN_ANSWERS else None
+        if screen and screen["action"] == "score":
+            ev = screen["evaluation"]
+        else:
+            answer = screen["answer"] if screen and screen["action"] == "condense" else state["last_answer_text"]
+            ev = turn = fused_turn_agent({**state, "last_answer_text": answer})
+            metrics.incr("fused.turns")
+    if ev is None:
+        ev = run_evaluation(state)
+
+    updates = _evaluation_updates(state, ev, thread_id)
+    updates.update(_decision_updates({**state, **updates}))
+    if updates["end_interview"]:
+        return updates
+
+    next_state = {**state, **updates}
+    reason = check_fused_question(turn, next_state["difficulty"], state["asked_questions"]) if turn else None
+    if turn is not None and reason is None:
+        question_text = turn.next_question.strip()
+    else:
+        if reason:
+            metrics.incr(f"fused.corrected.{reason}")
+            logger.info(f"Fused question rejected ({reason}), regenerating")
+        question_text = _generate_question(next_state)
+
+    if degradation.sheds("skip_transition"):
+        transition = None
+    elif turn is not None:
+        transition = turn.transition
+    else:
+        transition = transition_agent(next_state).transition
+
+    updates.update(_question_updates(next_state, question_text, thread_id))
+    updates["spoken_transition"] = transition
+    return updates
 
-def end_node(state: InterviewState) -> Dict:
+def end_node(state: InterviewState, config: Optional[RunnableConfig] = None) -> Dict:
     """
     Produce the final interview summary.
 
@@ -147,6 +372,19 @@ def end_node(state: InterviewState) -> Dict:
     and generate an overall performance verdict.
     """
     logger.info("Generating final interview summary")
-    result = end_interview_agent(state)
+    thread_id = _thread_id(config)
+    channel = speech_channels.open(thread_id, "closing") if SPEECH_PIPELINE and thread_id else None
+    try:
+        result = end_interview_agent(state, field_feeder(channel, "spoken_closing") if channel else None)
+    except Exception:
+        if channel:
+            channel.fail()
+        raise
+    if channel:
+        channel.finish(result["spoken_closing"])
     logger.info(f"Interview completed: verdict={result['summary']['verdict']}")
+    transcript_log.append(thread_id, "summary", {
+        "summary": result["summary"],
+        "spoken_closing": result["spoken_closing"],
+    })
     return result
@@ -0,0 +1,116 @@
+"""
+Next-turn precomputation during the coach persona's feedback pause.
+
+While the candidate reads or listens to feedback, the graph waits at
+`await_continue`. Everything the next turn needs (decision, transition,
+next question) is known at that point, so it is prepared in the background
+and `/interview/continue` only applies the result. Ending the session
+instead discards it.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Optional
+from backend.metrics import metrics
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class _Prepared:
+    __slots__ = ("key", "future", "started_at", "finished_at")
+
+    def __init__(self, key: Hashable, future: Future, started_at: float):
+        self.key = key
+        self.future = future
+        self.started_at = started_at
+        self.finished_at = None
+
+
+class TurnPrecomputer:
+    """
+    One background preparation per session, keyed by the state it started from.
+
+    `prepare` receives a snapshot of the paused graph state and returns the
+    next turn; it must not have side effects, since a result can be thrown away.
+    """
+
+    def __init__(self, prepare: Callable[[Dict], object], max_workers: int = 4, enabled: bool = True):
+        self.prepare = prepare
+        self.enabled = enabled
+        self._sessions: Dict[str, _Prepared] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="precompute")
+
+    def start(self, session_id: Optional[str], key: Hashable, state: Dict):
+        """Begin preparing the next turn; a no-op if it is already under way for this key."""
+        if not self.enabled or not session_id:
+            return
+        with self._lock:
+            current = self._sessions.get(session_id)
+            if current is not None and current.key == key:
+                return  # The pausing node runs again when the graph is resumed
+            self._cancel(current)
+            prepared = _Prepared(key, self._executor.submit(self.prepare, dict(state)), time.monotonic())
+            self._sessions[session_id] = prepared
+
+        def finished(_):
+            prepared.finished_at = time.monotonic()
+
+        prepared.future.add_done_callback(finished)
+        metrics.incr("precompute.started")
+
+    def take(self, session_id: Optional[str], key: Hashable):
+        """
+        Return the prepared turn, or None on a miss or failure.
+
+        Blocks while the preparation is still running: it has a head start on
+        a fresh computation.
+        """
+        if not self.enabled or not session_id:
+            return None
+        with self._lock:
+            prepared = self._sessions.pop(session_id, None)
+        if prepared is None or prepared.key != key:
+            self._cancel(prepared)
+            metrics.incr("precompute.misses")
+            return None
+
+        taken_at = time.monotonic()
+        try:
+            result = prepared.future.result()
+        except Exception as e:
+            metrics.incr("precompute.errors")
+            logger.warning(f"Next-turn preparation failed, computing it now: {e}")
+            return None
+
+        finished = prepared.finished_at or time.monotonic()
+        metrics.incr("precompute.hits")
+        metrics.observe("precompute.saved_ms", max(min(finished, taken_at) - prepared.started_at, 0.0) * 1000)
+        metrics.observe("precompute.wait_ms", max(finished - taken_at, 0.0) * 1000)
+        return result
+
+    def discard(self, session_id: Optional[str]):
+        with self._lock:
+            prepared = self._sessions.pop(session_id, None)
+        if prepared is not None:
+            metrics.incr("precompute.discarded")
+            self._cancel(prepared)
+
+    def stats(self) -> Dict[str, object]:
+        hits = metrics.counter("precompute.hits")
+        misses = metrics.counter("precompute.misses")
+        return {
+            "started": metrics.counter("precompute.started"),
+            "hits": hits,
+            "misses": misses,
+            "discarded": metrics.counter("precompute.discarded"),
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "saved_ms": metrics.timing("precompute.saved_ms"),
+            "wait_ms": metrics.timing("precompute.wait_ms"),
+        }
+
+    def _cancel(self, prepared: Optional[_Prepared]):
+        if prepared is not None and prepared.future.cancel():
+            metrics.incr("precompute.cancelled")
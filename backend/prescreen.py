@@ -0,0 +1,132 @@
+"""
+Local pre-screening of candidate answers before LLM evaluation.
+
+Empty answers and explicit non-answers ("I don't know", "no idea", "skip")
+are scored deterministically with templated feedback, and oversized answers are
+condensed to a token budget so the evaluation prompt stays bounded.
+"""
+
+from typing import Dict, Optional
+from backend.models import EvaluationWithFeedback
+from backend.metrics import metrics
+from backend.config import ANSWER_TOKEN_BUDGET
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4  # Rough English average, good enough for budgeting
+UNANSWERED_TOPIC = "Unanswered question"  # Topic of locally scored answers; not a subject to revisit
+
+_NON_ANSWER_RE = re.compile(
+    r"^(?:"
+    r"i\s*(?:do\s*not|don'?t|dont)\s*(?:really\s*)?know(?:\s*(?:the\s*answer|this|that))?"
+    r"|i\s*(?:have|'?ve\s*got)\s*no\s*idea|no\s*idea|idk|dunno|not\s*sure|no\s*clue"
+    r"|i\s*(?:can'?t|cannot)\s*(?:answer|remember)(?:\s*(?:this|that))?"
+    r"|skip|next(?:\s*question)?|no\s*answer|n\s*/\s*a|asdf\w*|lorem\s*ipsum.*"
+    r")$"
+)
+_FILLER_RE = re.compile(r"\b(?:um+|uh+|er+|hmm+|well|so|sorry|honestly|really)\b")
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _normalize(text: str) -> str:
+    text = text.lower().replace("’", "'")
+    text = re.sub(r"[^a-z0-9'/ ]+", " ", text)
+    text = _FILLER_RE.sub(" ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _non_answer_reason(answer: str) -> Optional[str]:
+    # Short or symbolic text ("O(1)", "42", "[1, 2, 3]", non-Latin scripts) can be a real answer, so only
+    # empty input and the phrases above are decided here; everything else goes to the evaluator
+    stripped = answer.strip()
+    if not stripped:
+        return "empty"
+    if _NON_ANSWER_RE.match(_normalize(stripped)):
+        return "non_answer"
+    return None
+
+
+def _templated_evaluation(reason: str) -> EvaluationWithFeedback:
+    if reason == "non_answer":
+        feedback = (
+            "It's fine not to know everything, but an interviewer needs something to work with. "
+            "Next time, talk through what you do know, relate it to something similar you've worked on, "
+            "or explain how you would find the answer."
+        )
+        weakness = "Did not attempt the question"
+    else:
+        feedback = (
+            "No answer was captured for this question. Make sure your microphone is picking you up, "
+            "and try to structure a response even if you are unsure: state the core idea, then give an example."
+        )
+        weakness = "No substantive answer was given"
+    return EvaluationWithFeedback(
+        score=1.0 if reason == "non_answer" else 0.0,
+        topic=UNANSWERED_TOPIC,
+        strengths=[],
+        weaknesses=[weakness],
+        feedback=feedback,
+    )
+
+
+def condense_answer(answer: str, token_budget: int = ANSWER_TOKEN_BUDGET) -> str:
+    """
+    Trim an answer to roughly `token_budget` tokens.
+
+    Repeated lines (common in pasted blobs) are dropped first; if still over
+    budget, the opening and closing parts are kept since that is where
+    candidates usually state and summarise their point.
+    """
+    seen = set()
+    lines = []
+    for line in answer.splitlines():
+        key = line.strip().lower()
+        if key and key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+    text = re.sub(r"[ \t]+", " ", "\n".join(lines)).strip()
+
+    budget_chars = token_budget * CHARS_PER_TOKEN
+    if len(text) <= budget_chars:
+        return text
+
+    head = text[: int(budget_chars * 0.7)].rsplit(" ", 1)[0]
+    tail = text[-int(budget_chars * 0.3):].split(" ", 1)[-1]
+    omitted = len(text.split()) - len(head.split()) - len(tail.split())
+    return f"{head} [... {omitted} words omitted ...] {tail}"
+
+
+def prescreen_answer(answer: Optional[str]) -> Dict:
+    """
+    Decide how an answer should be evaluated.
+
+    Returns a dict with:
+    - action: "score" (use `evaluation`, no LLM call), "condense" or "evaluate"
+    - answer: the text to send to the evaluator
+    - evaluation: templated EvaluationWithFeedback when action is "score"
+    - reason: why the answer was scored locally, if it was
+    """
+    answer = answer or ""
+    reason = _non_answer_reason(answer)
+    if reason:
+        metrics.incr("prescreen.llm_calls_saved")
+        metrics.incr(f"prescreen.scored.{reason}")
+        logger.info(f"Pre-screen scored answer locally ({reason})")
+        return {"action": "score", "answer": answer, "evaluation": _templated_evaluation(reason), "reason": reason}
+
+    tokens = estimate_tokens(answer)
+    if tokens > ANSWER_TOKEN_BUDGET:
+        condensed = condense_answer(answer)
+        metrics.incr("prescreen.condensed")
+        metrics.incr("prescreen.tokens_trimmed", tokens - estimate_tokens(condensed))
+        logger.info(f"Pre-screen condensed answer from ~{tokens} to ~{estimate_tokens(condensed)} tokens")
+        return {"action": "condense", "answer": condensed, "evaluation": None, "reason": None}
+
+    metrics.incr("prescreen.passed")
+    return {"action": "evaluate", "answer": answer, "evaluation": None, "reason": None}
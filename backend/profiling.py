@@ -0,0 +1,284 @@
+"""
+Request profiling for /interview/* endpoints.
+
+- Every request is split into time inside routed LLM calls and time outside
+  them (graph, validation, checkpointing, serialization).
+- Requests slower than SLOW_REQUEST_MS land in a bounded ring buffer.
+- A statistical stack sampler profiles a request on demand (admin
+  `X-Profile: 1` header) or at random (SLOW_PROFILE_SAMPLE_RATE, kept only
+  if the request turns out slow). Profiles are folded stacks, the input
+  format of flamegraph.pl, inferno and speedscope.
+
+The per-request accumulator lives in a contextvar, which Starlette copies
+into the worker thread that runs a sync endpoint.
+"""
+
+from collections import Counter, OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional, Set
+from uuid import uuid4
+from backend.metrics import metrics
+from backend.config import (
+    ADMIN_TOKEN,
+    SLOW_REQUEST_MS,
+    SLOW_REQUEST_BUFFER,
+    SLOW_PROFILE_SAMPLE_RATE,
+    PROFILE_INTERVAL_MS,
+)
+import hmac
+import logging
+import os
+import random
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PROFILED_PREFIX = "/interview/"
+PROFILE_HEADER = b"x-profile"
+ADMIN_HEADER = b"x-admin-token"
+MAX_STORED_PROFILES = 50
+MAX_STACK_DEPTH = 128
+
+
+class RequestTiming:
+    """Accumulates LLM time for one request; optionally collects stack samples."""
+
+    __slots__ = ("llm_ms", "llm_calls", "threads", "samples")
+
+    def __init__(self, profiled: bool):
+        self.llm_ms = 0.0
+        self.llm_calls = 0
+        self.threads: Set[int] = set()
+        self.samples: Optional[Counter] = Counter() if profiled else None
+
+
+_current: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+def bind_thread():
+    """Attribute the calling thread's stacks to the current request while it is profiled."""
+    timing = _current.get()
+    if timing is not None and timing.samples is not None:
+        timing.threads.add(threading.get_ident())
+
+
+@contextmanager
+def track_llm_call():
+    """Count the enclosed block as time inside the LLM for the current request."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    bind_thread()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.llm_ms += (time.perf_counter() - start) * 1000
+        timing.llm_calls += 1
+
+
+def _frame_label(code) -> str:
+    path = code.co_filename
+    short = os.sep.join(path.split(os.sep)[-2:])
+    return f"{code.co_name} ({short}:{code.co_firstlineno})".replace(";", ",")
+
+
+def fold(frame) -> str:
+    """Root-first, semicolon-separated stack of a frame."""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """One background thread sampling the threads bound to active profiles."""
+
+    def __init__(self, interval_ms: float):
+        self.interval = interval_ms / 1000
+        self._active: Set[RequestTiming] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self, timing: RequestTiming):
+        with self._lock:
+            self._active.add(timing)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def stop(self, timing: RequestTiming):
+        with self._lock:
+            self._active.discard(timing)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                active = list(self._active)
+            if not active:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            frames = sys._current_frames()
+            for timing in active:
+                for tid in list(timing.threads):
+                    frame = frames.get(tid)
+                    if frame is not None:
+                        timing.samples[fold(frame)] += 1
+            del frames
+            time.sleep(self.interval)
+
+
+class RequestProfiler:
+    """Slow-request ring buffer, stored profiles and per-endpoint LLM breakdown."""
+
+    def __init__(
+        self,
+        admin_token: Optional[str],
+        slow_ms: float,
+        buffer_size: int,
+        sample_rate: float,
+        interval_ms: float,
+    ):
+        self.admin_token = admin_token
+        self.slow_ms = slow_ms
+        self.sample_rate = sample_rate
+        self.sampler = StackSampler(interval_ms)
+        self.slow_requests: Deque[dict] = deque(maxlen=buffer_size)
+        self.profiles: "OrderedDict[str, str]" = OrderedDict()
+        self.endpoints: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def is_admin(self, token: Optional[str]) -> bool:
+        return bool(self.admin_token and token and hmac.compare_digest(token, self.admin_token))
+
+    def store_profile(self, samples: Counter) -> str:
+        profile_id = uuid4().hex[:12]
+        folded = "\n".join(f"{stack} {count}" for stack, count in samples.most_common()) + "\n"
+        with self._lock:
+            self.profiles[profile_id] = folded
+            while len(self.profiles) > MAX_STORED_PROFILES:
+                self.profiles.popitem(last=False)
+        return profile_id
+
+    def get_profile(self, profile_id: str) -> Optional[str]:
+        with self._lock:
+            return self.profiles.get(profile_id)
+
+    def record(self, method: str, path: str, status: int, total_ms: float, timing: RequestTiming,
+               profile_id: Optional[str]):
+        outside_ms = max(total_ms - timing.llm_ms, 0.0)
+        self.endpoints.add(path)
+        metrics.observe(f"request.{path}.total_ms", total_ms)
+        metrics.observe(f"request.{path}.llm_ms", timing.llm_ms)
+        metrics.observe(f"request.{path}.outside_llm_ms", outside_ms)
+        if total_ms >= self.slow_ms:
+            metrics.incr("request.slow")
+            self.slow_requests.append({
+                "at": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                "method": method,
+                "path": path,
+                "status": status,
+                "total_ms": round(total_ms, 1),
+                "llm_ms": round(timing.llm_ms, 1),
+                "outside_llm_ms": round(outside_ms, 1),
+                "llm_calls": timing.llm_calls,
+                "profile_id": profile_id,
+            })
+
+    def breakdown(self) -> Dict[str, Dict]:
+        return {
+            path: {
+                "total": metrics.timing(f"request.{path}.total_ms"),
+                "inside_llm": metrics.timing(f"request.{path}.llm_ms"),
+                "outside_llm": metrics.timing(f"request.{path}.outside_llm_ms"),
+            }
+            for path in sorted(self.endpoints)
+        }
+
+    def recent_slow(self, limit: int = 50) -> List[dict]:
+        return list(self.slow_requests)[-limit:][::-1]
+
+
+profiler = RequestProfiler(
+    admin_token=ADMIN_TOKEN,
+    slow_ms=SLOW_REQUEST_MS,
+    buffer_size=SLOW_REQUEST_BUFFER,
+    sample_rate=SLOW_PROFILE_SAMPLE_RATE,
+    interval_ms=PROFILE_INTERVAL_MS,
+)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware timing /interview/* requests and profiling selected ones.
+
+    Admin requests (X-Admin-Token) get a Server-Timing header; with
+    `X-Profile: 1` the request is profiled and X-Profile-Id names the folded
+    stacks at GET /admin/profiles/{id}.
+    """
+
+    def __init__(self, app, profiler: RequestProfiler = profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(PROFILED_PREFIX):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        admin = self.profiler.is_admin(headers.get(ADMIN_HEADER, b"").decode() or None)
+        requested = admin and headers.get(PROFILE_HEADER, b"") in (b"1", b"true")
+        sampled = not requested and self.profiler.sample_rate > 0 and random.random() < self.profiler.sample_rate
+
+        timing = RequestTiming(profiled=requested or sampled)
+        token = _current.set(timing)
+        if timing.samples is not None:
+            self.profiler.sampler.start(timing)
+
+        start = time.perf_counter()
+        state = {"status": 0, "profile_id": None, "stopped": False}
+
+        def finish_profile():
+            if timing.samples is None or state["stopped"]:
+                return
+            state["stopped"] = True
+            self.profiler.sampler.stop(timing)
+            slow = (time.perf_counter() - start) * 1000 >= self.profiler.slow_ms
+            if timing.samples and (requested or slow):
+                state["profile_id"] = self.profiler.store_profile(timing.samples)
+
+        async def timed_send(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                # The handler has returned by now; stop sampling before the body is sent
+                finish_profile()
+                if admin:
+                    total_ms = (time.perf_counter() - start) * 1000
+                    extra = [(
+                        b"server-timing",
+                        f"llm;dur={timing.llm_ms:.1f}, app;dur={max(total_ms - timing.llm_ms, 0):.1f}".encode(),
+                    )]
+                    if state["profile_id"]:
+                        extra.append((b"x-profile-id", state["profile_id"].encode()))
+                    message = {**message, "headers": list(message.get("headers", [])) + extra}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            finish_profile()
+            _current.reset(token)
+            total_ms = (time.perf_counter() - start) * 1000
+            # Route template (set on the scope by the router) keeps per-session paths in one series
+            path = getattr(scope.get("route"), "path", scope["path"])
+            self.profiler.record(scope["method"], path, state["status"], total_ms, timing, state["profile_id"])
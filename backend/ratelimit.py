@@ -0,0 +1,194 @@
+"""
+Per-client token-bucket rate limiting for LLM-backed endpoints.
+
+Each (endpoint, client[, scope]) pair has a bucket of `capacity` tokens
+refilled at `capacity / per_seconds` tokens per second. A request takes one
+token; an empty bucket yields the seconds until the next token, which the
+caller returns as Retry-After. Checks are O(1) in the in-process store; the
+Redis store shares buckets between workers with a single atomic script call.
+"""
+
+from collections import OrderedDict
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
+from backend.metrics import metrics
+import hashlib
+import ipaddress
+import logging
+import math
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+API_KEY_HEADER = "x-api-key"
+FORWARDED_FOR_HEADER = "x-forwarded-for"
+
+
+class MemoryBucketStore:
+    """Buckets in a bounded LRU dict; evicted buckets come back full."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, rate: float, now: float, cost: float = 1.0) -> Tuple[bool, float]:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [capacity, now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return True, 0.0
+            return False, (cost - bucket[0]) / rate
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+_REDIS_TAKE = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - ts, 0) * rate)
+local wait = 0
+if tokens >= cost then
+  tokens = tokens - cost
+else
+  wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class RedisBucketStore:
+    """
+    Buckets shared between workers through Redis.
+
+    Pass a `client` (e.g. a fakeredis instance in tests) or a URL. Idle
+    buckets expire once they would have refilled.
+    """
+
+    def __init__(self, url: Optional[str] = None, client=None, prefix: str = "ratelimit:"):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url)
+        self._client = client
+        self._script = client.register_script(_REDIS_TAKE)
+        self.prefix = prefix
+
+    def take(self, key: str, capacity: float, rate: float, now: float, cost: float = 1.0) -> Tuple[bool, float]:
+        wait = float(self._script(keys=[self.prefix + key], args=[capacity, rate, now, cost]))
+        return wait == 0.0, wait
+
+    def reset(self):
+        for key in self._client.scan_iter(self.prefix + "*"):
+            self._client.delete(key)
+
+
+def create_bucket_store(url: Optional[str] = None):
+    """In-process store by default; a redis:// URL shares buckets between workers."""
+    if url:
+        return RedisBucketStore(url)
+    return MemoryBucketStore()
+
+
+def parse_networks(values: Iterable[str]) -> List:
+    """IP networks from addresses or CIDRs; invalid entries are logged and skipped."""
+    networks = []
+    for value in values:
+        try:
+            networks.append(ipaddress.ip_network(value.strip(), strict=False))
+        except ValueError:
+            logger.warning(f"Ignoring invalid trusted proxy {value!r}")
+    return networks
+
+
+def _trusted(address: str, proxies) -> bool:
+    try:
+        ip = ipaddress.ip_address(address.strip())
+    except ValueError:
+        return False
+    return any(ip in network for network in proxies)
+
+
+def client_ip(request, trusted_proxies=()) -> str:
+    """
+    The caller's IP. When the peer is a trusted proxy, X-Forwarded-For is
+    read from the right, skipping trusted hops; the first untrusted address
+    is the client (addresses further left are client-supplied).
+    """
+    address = request.client.host if request.client else "unknown"
+    if not trusted_proxies or not _trusted(address, trusted_proxies):
+        return address
+    for hop in reversed(request.headers.get(FORWARDED_FOR_HEADER, "").split(",")):
+        hop = hop.strip()
+        if not hop:
+            continue
+        address = hop
+        if not _trusted(hop, trusted_proxies):
+            break
+    return address
+
+
+def client_key(request, api_keys: Collection[str] = (), trusted_proxies=()) -> str:
+    """
+    Identify the caller by API key when it is one of `api_keys`, otherwise by client IP.
+
+    Unknown keys are ignored, so sending a fresh key per request does not get a fresh bucket.
+    """
+    api_key = request.headers.get(API_KEY_HEADER)
+    if api_key and api_key in api_keys:
+        # Buckets (possibly in a shared store) are named by a digest, never the key itself
+        return f"key:{hashlib.sha256(api_key.encode()).hexdigest()[:16]}"
+    return f"ip:{client_ip(request, trusted_proxies)}"
+
+
+class RateLimiter:
+    """
+    Applies `limits` (endpoint → {"capacity", "per_seconds"}) to clients.
+
+    Endpoints without an entry are unlimited. A `scope` narrows the bucket,
+    e.g. to the current question for per-question hint limits.
+    """
+
+    def __init__(self, limits: Dict[str, Dict], store=None, enabled: bool = True):
+        self.limits = limits
+        self.store = store or MemoryBucketStore()
+        self.enabled = enabled
+
+    def check(self, endpoint: str, client: str, scope: Optional[str] = None) -> Optional[int]:
+        """Take a token; return None if allowed, else whole seconds to wait."""
+        limit = self.limits.get(endpoint)
+        if not self.enabled or not limit:
+            return None
+        capacity = limit["capacity"]
+        rate = capacity / limit["per_seconds"]
+        key = f"{endpoint}|{client}" if scope is None else f"{endpoint}|{client}|{scope}"
+
+        try:
+            allowed, wait = self.store.take(key, capacity, rate, time.time())
+        except Exception as e:
+            # A shared store outage must not take the API down with it
+            logger.warning(f"Rate limit store unavailable, allowing request: {e}")
+            metrics.incr("ratelimit.store_errors")
+            return None
+
+        if allowed:
+            return None
+        metrics.incr(f"ratelimit.{endpoint}.rejected")
+        return max(math.ceil(wait), 1)
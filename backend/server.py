@@ -0,0 +1,84 @@
+"""
+Production server profile and launcher.
+
+    python -m backend.server --port 8000
+
+Runs uvicorn without reload, on uvloop and httptools when installed, with a
+longer keep-alive and a deeper accept backlog. It also enables the GC tuning
+applied at the end of `backend.main`: after the graphs are compiled,
+everything allocated so far is frozen out of the collector, and the
+generation-0 threshold is raised so collections under load are rarer.
+
+Sessions and graph checkpoints live in process memory, so run one worker
+unless the load balancer pins each session to a worker.
+"""
+
+from starlette.responses import JSONResponse
+import argparse
+import gc
+import importlib.util
+import logging
+import os
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+class OrjsonResponse(JSONResponse):
+    """Default response class: orjson rendering for the larger evaluation and summary payloads."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def configure_gc(freeze: bool, gen0_threshold: int):
+    """Call once start-up allocations are done (compiled graphs, models, clients)."""
+    if gen0_threshold:
+        _, gen1, gen2 = gc.get_threshold()
+        gc.set_threshold(gen0_threshold, gen1, gen2)
+    if freeze:
+        gc.collect()
+        gc.freeze()
+        logger.info(f"GC: froze {gc.get_freeze_count()} start-up objects, thresholds={gc.get_threshold()}")
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the interview backend with the production server profile")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="Only >1 with session-sticky load balancing")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    # Read by backend.config when the app is imported below
+    os.environ.setdefault("GC_FREEZE", "true")
+    os.environ.setdefault("GC_GEN0_THRESHOLD", "50000")
+
+    import uvicorn
+    from backend.config import SERVER_KEEPALIVE_SECONDS, SERVER_BACKLOG
+
+    loop = "uvloop" if _available("uvloop") else "asyncio"
+    http = "httptools" if _available("httptools") else "h11"
+    if loop != "uvloop" or http != "httptools":
+        logger.warning(f"Production profile running on loop={loop}, http={http}; install uvloop and httptools")
+
+    uvicorn.run(
+        "backend.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop=loop,
+        http=http,
+        timeout_keep_alive=SERVER_KEEPALIVE_SECONDS,
+        backlog=SERVER_BACKLOG,
+        access_log=False,
+        log_level=args.log_level,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Read model of each session's progress, for reconnecting clients.
+
+Graph nodes are wrapped (see `graph.projected`) so that every completed node
+projects its updates into a small per-session record: the step the client
+should show, the current question, the latest feedback and evaluation,
+question_count and difficulty. `/interview/{session_id}/state` serves the
+record from memory, without invoking the graph or loading a checkpoint.
+"""
+
+from typing import Dict, Optional
+from backend.metrics import metrics
+import threading
+import time
+
+# Steps a client can be in; "processing" means the graph is between pauses
+STEP_QUESTION = "question"  # Waiting for an answer to `question`
+STEP_FEEDBACK = "feedback"  # Coach pause: showing `feedback` until the candidate proceeds
+STEP_PROCESSING = "processing"
+STEP_FINAL = "final"
+
+# Graph state key → read-model field
+PROJECTED_FIELDS = {
+    "current_question": "question",
+    "spoken_transition": "spoken_transition",
+    "feedback": "feedback",
+    "evaluation": "evaluation",
+    "question_count": "question_count",
+    "difficulty": "difficulty",
+    "summary": "summary",
+    "spoken_closing": "spoken_closing",
+}
+
+
+def _evaluation_view(ev) -> Optional[Dict]:
+    if ev is None:
+        return None
+    if isinstance(ev, dict):
+        return {k: ev.get(k) for k in ("score", "topic", "strengths", "weaknesses")}
+    return {"score": ev.score, "topic": ev.topic, "strengths": ev.strengths, "weaknesses": ev.weaknesses}
+
+
+class SessionStateStore:
+    """
+    Latest projected state per graph thread.
+
+    Records are replaced, never mutated, so a reader always sees one
+    consistent version. A thread's nodes run one at a time, so only
+    `discard` races with `apply`; the lock keeps a late node from
+    resurrecting a discarded session.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records: Dict[str, Dict] = {}
+        self._discarded: Dict[str, float] = {}
+
+    def apply(self, thread_id: Optional[str], step: str, state: Dict, updates: Optional[Dict]):
+        """Project a completed node: `state` as the node saw it, plus its `updates`."""
+        if not thread_id:
+            return
+        updates = updates or {}
+        record = {}
+        for key, field in PROJECTED_FIELDS.items():
+            value = updates[key] if key in updates else state.get(key)
+            record[field] = _evaluation_view(value) if key == "evaluation" else value
+        if updates.get("summary"):
+            step = STEP_FINAL
+        elif updates.get("end_interview"):
+            step = STEP_PROCESSING  # Heading to the summary
+        record["step"] = step
+        with self._lock:
+            if thread_id in self._discarded:
+                return
+            previous = self._records.get(thread_id)
+            record["version"] = previous["version"] + 1 if previous else 1
+            record["updated_at"] = time.time()
+            self._records[thread_id] = record
+        metrics.incr("session_state.projections")
+
+    def get(self, thread_id: str) -> Optional[Dict]:
+        return self._records.get(thread_id)
+
+    def discard(self, thread_id: str):
+        with self._lock:
+            self._records.pop(thread_id, None)
+            self._discarded[thread_id] = time.monotonic()
+            # Tombstones only need to outlive a node still running for the thread
+            cutoff = time.monotonic() - 600
+            for tid in [t for t, at in self._discarded.items() if at < cutoff]:
+                del self._discarded[tid]
+
+
+session_states = SessionStateStore()
@@ -0,0 +1,191 @@
+"""
+Speculative answer evaluation on stabilized interim transcripts.
+
+While the candidate is speaking, interim transcripts are observed per
+session. Once the text has not changed for SPECULATION_STABLE_MS, an
+evaluation is started in the background. A running evaluation cannot be
+stopped, so each session has at most one running: a newer stable text waits
+for it to finish, and only the newest waiting text is then evaluated. When
+the final answer arrives, the speculative result is committed if the texts
+are similar enough; otherwise it is discarded and the answer is evaluated
+normally.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from difflib import SequenceMatcher
+from typing import Callable, Dict, Optional
+from backend.metrics import metrics
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SCAN_INTERVAL_SECONDS = 0.1
+
+
+def normalize_transcript(text: Optional[str]) -> str:
+    return " ".join(re.sub(r"[^\w\s']", " ", (text or "").lower()).split())
+
+
+def similarity(a: str, b: str) -> float:
+    if a == b:
+        return 1.0
+    return SequenceMatcher(None, a.split(), b.split(), autojunk=False).ratio()
+
+
+class _Pending:
+    __slots__ = ("question", "text", "raw_text", "changed_at", "spec_text", "future", "started_at", "finished_at",
+                 "started")
+
+    def __init__(self, question: str):
+        self.question = question
+        self.text = ""
+        self.raw_text = ""
+        self.changed_at = 0.0
+        self.spec_text = None
+        self.future: Optional[Future] = None
+        self.started_at = 0.0
+        self.finished_at = None
+        self.started = 0  # Speculations started for this question
+
+
+class SpeculativeEvaluator:
+    """
+    Tracks interim transcripts per session and evaluates them ahead of time.
+
+    `evaluate` receives a minimal state dict with `current_question` and
+    `last_answer_text` and returns the evaluation result. At most
+    `max_per_answer` speculations are started per question.
+    """
+
+    def __init__(
+        self,
+        evaluate: Callable[[Dict], object],
+        stable_ms: float,
+        threshold: float,
+        max_workers: int = 8,
+        max_per_answer: int = 3,
+        enabled: bool = True,
+    ):
+        self.evaluate = evaluate
+        self.stable_ms = stable_ms
+        self.threshold = threshold
+        self.max_per_answer = max_per_answer
+        self.enabled = enabled
+        self._sessions: Dict[str, _Pending] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculate")
+        self._thread = threading.Thread(target=self._run, name="speculation-scheduler", daemon=True)
+        self._thread.start()
+
+    def observe(self, session_id: str, question: Optional[str], text: str):
+        """Record an interim transcript for the session's current question."""
+        if not self.enabled or not question:
+            return
+        normalized = normalize_transcript(text)
+        with self._lock:
+            pending = self._sessions.get(session_id)
+            if pending is None or pending.question != question:
+                self._cancel(pending)
+                pending = self._sessions[session_id] = _Pending(question)
+            if normalized != pending.text:
+                pending.text = normalized
+                pending.changed_at = time.monotonic()
+                pending.raw_text = text
+        self._wake.set()
+
+    def take(self, session_id: Optional[str], question: Optional[str], answer: Optional[str]):
+        """
+        Return the speculative result for a final answer, or None on a miss.
+
+        Blocks on an in-flight speculation when the texts match, since it is
+        already ahead of a fresh call.
+        """
+        if not session_id:
+            return None
+        with self._lock:
+            pending = self._sessions.pop(session_id, None)
+        if pending is None or pending.future is None:
+            return None
+
+        committed_at = time.monotonic()
+        score = similarity(normalize_transcript(answer), pending.spec_text or "")
+        if pending.question != question or score < self.threshold:
+            self._cancel(pending)
+            metrics.incr("speculation.misses")
+            logger.info(f"Speculation miss: session={session_id}, similarity={score:.2f}")
+            return None
+
+        try:
+            result = pending.future.result()
+        except Exception as e:
+            metrics.incr("speculation.errors")
+            logger.warning(f"Speculative evaluation failed, evaluating normally: {e}")
+            return None
+
+        finished = pending.finished_at or time.monotonic()
+        saved_ms = max(min(finished, committed_at) - pending.started_at, 0.0) * 1000
+        metrics.incr("speculation.hits")
+        metrics.observe("speculation.saved_ms", saved_ms)
+        logger.info(f"Speculation hit: session={session_id}, similarity={score:.2f}, saved={saved_ms:.0f}ms")
+        return result
+
+    def discard(self, session_id: str):
+        with self._lock:
+            self._cancel(self._sessions.pop(session_id, None))
+
+    def stats(self) -> Dict[str, float]:
+        hits = metrics.counter("speculation.hits")
+        misses = metrics.counter("speculation.misses")
+        return {
+            "started": metrics.counter("speculation.started"),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "saved_ms": metrics.timing("speculation.saved_ms"),
+        }
+
+    def _cancel(self, pending: Optional[_Pending]):
+        if pending is not None and pending.future is not None and pending.future.cancel():
+            metrics.incr("speculation.cancelled")
+
+    def _run(self):
+        while True:
+            self._wake.wait(SCAN_INTERVAL_SECONDS)
+            self._wake.clear()
+            now = time.monotonic()
+            with self._lock:
+                for pending in self._sessions.values():
+                    stable = (now - pending.changed_at) * 1000 >= self.stable_ms
+                    if pending.text and stable and pending.text != pending.spec_text:
+                        self._start(pending, now)
+
+    def _start(self, pending: _Pending, now: float):
+        if pending.future is not None and not pending.future.done():
+            # A newer stable text supersedes a queued speculation; a running one is left to finish,
+            # and the newest text is started on the first scan after it has
+            if not pending.future.cancel():
+                return
+            metrics.incr("speculation.cancelled")
+            pending.started -= 1
+        if pending.started >= self.max_per_answer:
+            return
+        state = {"current_question": pending.question, "last_answer_text": pending.raw_text}
+        pending.spec_text = pending.text
+        pending.started_at = now
+        pending.finished_at = None
+        pending.started += 1
+
+        future = self._executor.submit(self.evaluate, state)
+        pending.future = future
+
+        def finished(f):
+            if pending.future is f:
+                pending.finished_at = time.monotonic()
+            self._wake.set()  # A newer text may be waiting for this one
+
+        future.add_done_callback(finished)
+        metrics.incr("speculation.started")
@@ -0,0 +1,111 @@
+"""
+Adaptive early stopping: end the interview once the verdict is settled.
+
+The final verdict is the band (SCORE_EXCELLENT ... SCORE_NEEDS_IMPROVEMENT)
+containing the average score. After each answer, a confidence interval is
+put around the candidate's underlying mean score; when the whole interval
+lies inside one band, more questions are unlikely to change the verdict and
+the interview ends. The standard deviation is shrunk towards a prior
+(STOPPING_PRIOR_SD) so two identical early scores don't look like certainty.
+"""
+
+from statistics import NormalDist, mean
+from typing import List, Tuple
+from backend.config import (
+    MAX_QUESTIONS,
+    ADAPTIVE_STOPPING,
+    STOPPING_MIN_QUESTIONS,
+    STOPPING_MAX_QUESTIONS,
+    STOPPING_CONFIDENCE,
+    STOPPING_PRIOR_SD,
+    STOPPING_PRIOR_WEIGHT,
+    SCORE_EXCELLENT,
+    SCORE_GOOD,
+    SCORE_SATISFACTORY,
+    SCORE_NEEDS_IMPROVEMENT,
+)
+
+# Lower edges of the verdict bands, best first (see end_interview_agent)
+VERDICT_EDGES = [SCORE_EXCELLENT, SCORE_GOOD, SCORE_SATISFACTORY, SCORE_NEEDS_IMPROVEMENT]
+
+
+def check_settings(
+    min_questions: int = STOPPING_MIN_QUESTIONS,
+    max_questions: int = STOPPING_MAX_QUESTIONS,
+    confidence: float = STOPPING_CONFIDENCE,
+    prior_weight: float = STOPPING_PRIOR_WEIGHT,
+):
+    """Raise ValueError for settings under which the interval is undefined or stopping can't work."""
+    if not 1 <= min_questions <= max_questions:
+        raise ValueError(f"Need 1 <= STOPPING_MIN_QUESTIONS <= STOPPING_MAX_QUESTIONS, "
+                         f"got {min_questions} and {max_questions}")
+    if not 0 < confidence < 1:
+        raise ValueError(f"STOPPING_CONFIDENCE must be between 0 and 1, got {confidence}")
+    if prior_weight < 0 or prior_weight + min_questions <= 1:
+        # The shrunk variance divides by prior_weight + n - 1
+        raise ValueError(f"STOPPING_PRIOR_WEIGHT must be >= 0 and STOPPING_PRIOR_WEIGHT + STOPPING_MIN_QUESTIONS "
+                         f"above 1, got {prior_weight} and {min_questions}")
+
+
+def question_limit() -> int:
+    """Most questions an interview can have under the active stopping mode."""
+    return STOPPING_MAX_QUESTIONS if ADAPTIVE_STOPPING else MAX_QUESTIONS
+
+
+def verdict_band(avg: float) -> int:
+    """0 for the best verdict band, len(VERDICT_EDGES) for the worst."""
+    for band, edge in enumerate(VERDICT_EDGES):
+        if avg >= edge:
+            return band
+    return len(VERDICT_EDGES)
+
+
+def mean_interval(
+    scores: List[float],
+    confidence: float = STOPPING_CONFIDENCE,
+    prior_sd: float = STOPPING_PRIOR_SD,
+    prior_weight: float = STOPPING_PRIOR_WEIGHT,
+) -> Tuple[float, float]:
+    """Two-sided confidence interval for the mean score, with a shrunk standard deviation."""
+    n = len(scores)
+    if prior_weight + n - 1 <= 0:
+        raise ValueError(f"No spread estimate for {n} score(s) with prior weight {prior_weight}")
+    avg = mean(scores)
+    sample_ss = sum((s - avg) ** 2 for s in scores)
+    sd = ((prior_weight * prior_sd ** 2 + sample_ss) / (prior_weight + n - 1)) ** 0.5
+    half = NormalDist().inv_cdf(0.5 + confidence / 2) * sd / n ** 0.5
+    return avg - half, avg + half
+
+
+def should_stop(
+    scores: List[float],
+    min_questions: int = STOPPING_MIN_QUESTIONS,
+    max_questions: int = STOPPING_MAX_QUESTIONS,
+    confidence: float = STOPPING_CONFIDENCE,
+    prior_sd: float = STOPPING_PRIOR_SD,
+    prior_weight: float = STOPPING_PRIOR_WEIGHT,
+) -> bool:
+    """True when the interview should end after these scores."""
+    n = len(scores)
+    if n >= max_questions:
+        return True
+    if n < min_questions:
+        return False
+    low, high = mean_interval(scores, confidence, prior_sd, prior_weight)
+    return verdict_band(max(low, 0.0)) == verdict_band(min(high, 10.0))
+
+
+def likely_to_stop(scores: List[float]) -> bool:
+    """
+    True when adaptive stopping would end the interview if the next answer
+    scored the candidate's current mean (the likeliest next score).
+
+    Used before an answer is evaluated, to avoid writing a next question
+    that would be thrown away.
+    """
+    if not ADAPTIVE_STOPPING or not scores:
+        return False
+    return should_stop(list(scores) + [mean(scores)])
+
+
+check_settings()
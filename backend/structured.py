@@ -0,0 +1,161 @@
+"""
+Schema-constrained structured output for the LLM routes.
+
+The Pydantic JSON schema is sent as the server's `format` option so decoding
+is constrained to valid output. Replies are parsed through a fast JSON path,
+truncated JSON is repaired locally, and parse outcomes are counted per schema.
+"""
+
+from typing import Optional, Type
+from langchain_core.exceptions import OutputParserException
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel, ValidationError
+from backend.metrics import metrics
+import json
+import logging
+import re
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+_PARTIAL_NUMBER_END = re.compile(r"(?<=\d)(?:\.|[eE][+-]?)$")  # "7." or "1e-" cut mid-number
+_PARTIAL_LITERAL = re.compile(r"(?<=[:\[,])\s*(?:-|t|tr|tru|f|fa|fal|fals|n|nu|nul)$")  # "tru", "nul", a lone "-"
+
+
+def repair_json(text: str) -> Optional[str]:
+    """
+    Best-effort repair of a truncated or wrapped JSON object.
+
+    Strips code fences and leading prose, closes an unterminated string,
+    completes a cut-off number, drops a dangling key, partial literal or
+    trailing comma and closes any open brackets.
+    Returns None when there is no object to repair.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+    body = text[start:]
+
+    stack = []
+    in_string = False
+    escaped = False
+    string_start = 0
+    for i, ch in enumerate(body):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+            string_start = i
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            if not stack:
+                # Complete object followed by trailing text (e.g. a closing code fence)
+                return body[: i + 1]
+
+    if in_string:
+        body = (body[:-1] if escaped else body) + '"'
+    else:
+        body = body.rstrip()
+        body = _PARTIAL_NUMBER_END.sub("", _PARTIAL_NUMBER_END.sub("", body))
+        body = _PARTIAL_LITERAL.sub("", body)
+    if body.endswith('"') and stack and stack[-1] == "}" and body[:string_start].rstrip().endswith(("{", ",")):
+        # The last string was a key (truncated or awaiting its colon), not a value
+        body = body[:string_start]
+
+    body = body.rstrip()
+    if body.endswith(":"):
+        body = body[: body.rfind('"', 0, body.rfind('"'))].rstrip()
+    body = body.rstrip(",").rstrip()
+
+    return body + "".join(reversed(stack))
+
+
+def _fill_missing_lists(data: dict, schema: Type[BaseModel]) -> dict:
+    """Default list fields lost to truncation to empty lists."""
+    for name, field in schema.model_fields.items():
+        if name not in data and getattr(field.annotation, "__origin__", None) is list:
+            data[name] = []
+    return data
+
+
+def parse_structured(text: str, schema: Type[BaseModel]) -> BaseModel:
+    """
+    Parse and validate model output against `schema`.
+
+    Raises OutputParserException when the output cannot be recovered, so a
+    route's fallback model can take over.
+    """
+    name = schema.__name__
+    metrics.incr(f"structured.{name}.calls")
+
+    try:
+        data = _loads(text)
+    except ValueError:
+        data = None
+    if data is not None:
+        try:
+            result = schema.model_validate(data)
+            metrics.incr(f"structured.{name}.ok")
+            return result
+        except ValidationError as e:
+            metrics.incr(f"structured.{name}.failed")
+            raise OutputParserException(f"{name} output failed validation: {e}", llm_output=text)
+
+    repaired = repair_json(text)
+    if repaired is not None:
+        try:
+            data = _loads(repaired)
+            if isinstance(data, dict):
+                data = _fill_missing_lists(data, schema)
+            result = schema.model_validate(data)
+            metrics.incr(f"structured.{name}.repaired")
+            logger.info(f"Repaired truncated {name} output locally ({len(text)} chars)")
+            return result
+        except ValueError:  # includes pydantic's ValidationError
+            pass
+
+    metrics.incr(f"structured.{name}.failed")
+    logger.warning(f"Unparseable {name} output: {text[:200]!r}")
+    raise OutputParserException(f"Could not parse {name} output", llm_output=text)
+
+
+def structured_output(model, schema: Type[BaseModel]):
+    """Bind `schema` as the constrained-decoding format and parse the reply into it."""
+    return model.bind(format=schema.model_json_schema()) | RunnableLambda(
+        lambda message: parse_structured(message.content, schema)
+    )
+
+
+def parse_failure_rates() -> dict:
+    """Per-schema parse outcome counts and failure/repair rates."""
+    counters = metrics.snapshot()["counters"]
+    rates = {}
+    for key, calls in counters.items():
+        if not (key.startswith("structured.") and key.endswith(".calls")):
+            continue
+        name = key[len("structured."):-len(".calls")]
+        failed = counters.get(f"structured.{name}.failed", 0)
+        repaired = counters.get(f"structured.{name}.repaired", 0)
+        rates[name] = {
+            "calls": calls,
+            "repaired": repaired,
+            "failed": failed,
+            "failure_rate": round(failed / calls, 4) if calls else 0.0,
+            "repair_rate": round(repaired / calls, 4) if calls else 0.0,
+        }
+    return rates
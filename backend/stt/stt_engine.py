@@ -0,0 +1,215 @@
+"""
+Pluggable streaming speech-to-text engines.
+
+Audio is pushed as raw 16-bit mono PCM frames at STT_SAMPLE_RATE. Engines
+report interim transcripts through `on_partial` while audio is streaming and
+return the final transcript from `finish()`.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+import json
+import os
+import threading
+
+from dotenv import load_dotenv
+from backend.config import DEFAULT_STT_LANGUAGE, STT_ENGINE, STT_SAMPLE_RATE, VOSK_MODEL_PATH
+
+load_dotenv()
+
+PartialCallback = Callable[[str], None]
+
+
+class RecognitionStream(ABC):
+    """One utterance being recognized."""
+
+    @abstractmethod
+    def push(self, frame: bytes) -> None:
+        """Feed a chunk of PCM audio."""
+
+    @abstractmethod
+    def finish(self) -> str:
+        """Signal end of audio and block until the final transcript is available."""
+
+    def close(self) -> None:
+        """Release resources without waiting for a result."""
+
+
+class STTEngine(ABC):
+    """Factory for recognition streams."""
+
+    name = "base"
+
+    @abstractmethod
+    def start_stream(
+        self,
+        on_partial: Optional[PartialCallback] = None,
+        language: str = DEFAULT_STT_LANGUAGE,
+    ) -> RecognitionStream:
+        """Open a stream; `on_partial` may be called from a background thread."""
+
+
+# --------------------------------------------------
+# Azure AI Speech
+# --------------------------------------------------
+
+class _AzureStream(RecognitionStream):
+    def __init__(self, speechsdk, speech_config, on_partial, finish_timeout):
+        self._sdk = speechsdk
+        self._finish_timeout = finish_timeout
+        self._segments = []
+        self._done = threading.Event()
+        self._error = None
+
+        fmt = speechsdk.audio.AudioStreamFormat(samples_per_second=STT_SAMPLE_RATE, bits_per_sample=16, channels=1)
+        self._push_stream = speechsdk.audio.PushAudioInputStream(stream_format=fmt)
+        audio_config = speechsdk.audio.AudioConfig(stream=self._push_stream)
+        self._recognizer = speechsdk.SpeechRecognizer(speech_config=speech_config, audio_config=audio_config)
+
+        def recognizing(evt):
+            if on_partial:
+                on_partial(" ".join(self._segments + [evt.result.text]).strip())
+
+        def recognized(evt):
+            if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech and evt.result.text:
+                self._segments.append(evt.result.text)
+                if on_partial:
+                    on_partial(" ".join(self._segments))
+
+        def canceled(evt):
+            details = evt.cancellation_details
+            if details.reason == speechsdk.CancellationReason.Error:
+                self._error = details.error_details
+            self._done.set()
+
+        self._recognizer.recognizing.connect(recognizing)
+        self._recognizer.recognized.connect(recognized)
+        self._recognizer.canceled.connect(canceled)
+        self._recognizer.session_stopped.connect(lambda evt: self._done.set())
+        self._recognizer.start_continuous_recognition_async().get()
+
+    def push(self, frame: bytes) -> None:
+        self._push_stream.write(frame)
+
+    def finish(self) -> str:
+        self._push_stream.close()
+        self._done.wait(self._finish_timeout)
+        self._recognizer.stop_continuous_recognition_async().get()
+        if self._error:
+            raise RuntimeError(f"Speech recognition failed: {self._error}")
+        return " ".join(self._segments).strip()
+
+    def close(self) -> None:
+        self._push_stream.close()
+        self._recognizer.stop_continuous_recognition_async()
+
+
+class AzureSTTEngine(STTEngine):
+    """Continuous recognition through the Azure Speech SDK push stream."""
+
+    name = "azure"
+
+    def __init__(self, finish_timeout: float = 10.0):
+        import azure.cognitiveservices.speech as speechsdk
+
+        key = os.getenv("AZURE_SPEECH_KEY")
+        if not key:
+            raise ValueError("Azure Speech API key not configured. Set AZURE_SPEECH_KEY environment variable.")
+        self._sdk = speechsdk
+        self._key = key
+        self._region = os.getenv("AZURE_SPEECH_REGION", "eastus")
+        self._finish_timeout = finish_timeout
+
+    def start_stream(self, on_partial=None, language=DEFAULT_STT_LANGUAGE) -> RecognitionStream:
+        speech_config = self._sdk.SpeechConfig(subscription=self._key, region=self._region)
+        speech_config.speech_recognition_language = language
+        return _AzureStream(self._sdk, speech_config, on_partial, self._finish_timeout)
+
+
+# --------------------------------------------------
+# Vosk (local CPU)
+# --------------------------------------------------
+
+class _VoskStream(RecognitionStream):
+    def __init__(self, recognizer, on_partial):
+        self._recognizer = recognizer
+        self._on_partial = on_partial
+        self._segments = []
+
+    def push(self, frame: bytes) -> None:
+        if self._recognizer.AcceptWaveform(frame):
+            text = json.loads(self._recognizer.Result()).get("text", "")
+            if text:
+                self._segments.append(text)
+            partial = ""
+        else:
+            partial = json.loads(self._recognizer.PartialResult()).get("partial", "")
+        if self._on_partial:
+            self._on_partial(" ".join(self._segments + ([partial] if partial else [])))
+
+    def finish(self) -> str:
+        text = json.loads(self._recognizer.FinalResult()).get("text", "")
+        if text:
+            self._segments.append(text)
+        return " ".join(self._segments).strip()
+
+
+class VoskSTTEngine(STTEngine):
+    """Offline recognition on CPU with a Vosk model directory (VOSK_MODEL_PATH)."""
+
+    name = "vosk"
+
+    def __init__(self, model_path: Optional[str] = None):
+        import vosk
+
+        path = model_path or VOSK_MODEL_PATH
+        if not path:
+            raise ValueError("Vosk model not configured. Set VOSK_MODEL_PATH environment variable.")
+        self._vosk = vosk
+        self._model = vosk.Model(path)
+
+    def start_stream(self, on_partial=None, language=DEFAULT_STT_LANGUAGE) -> RecognitionStream:
+        # Vosk models are single-language; `language` is decided by the model
+        return _VoskStream(self._vosk.KaldiRecognizer(self._model, STT_SAMPLE_RATE), on_partial)
+
+
+# --------------------------------------------------
+# Fake (tests and load runs)
+# --------------------------------------------------
+
+class _FakeStream(RecognitionStream):
+    def __init__(self, on_partial):
+        self._on_partial = on_partial
+        self._words = []
+
+    def push(self, frame: bytes) -> None:
+        self._words.extend(frame.decode("utf-8", errors="ignore").split())
+        if self._on_partial:
+            self._on_partial(" ".join(self._words))
+
+    def finish(self) -> str:
+        return " ".join(self._words)
+
+
+class FakeSTTEngine(STTEngine):
+    """Treats each frame as UTF-8 text; the transcript is the words received so far."""
+
+    name = "fake"
+
+    def start_stream(self, on_partial=None, language=DEFAULT_STT_LANGUAGE) -> RecognitionStream:
+        return _FakeStream(on_partial)
+
+
+ENGINES = {
+    "azure": AzureSTTEngine,
+    "vosk": VoskSTTEngine,
+    "fake": FakeSTTEngine,
+}
+
+
+def create_stt_engine(name: Optional[str] = None) -> STTEngine:
+    """Instantiate the engine selected by `name` or the STT_ENGINE setting."""
+    name = (name or STT_ENGINE).lower()
+    if name not in ENGINES:
+        raise ValueError(f"Unknown STT engine '{name}'. Must be one of: {list(ENGINES)}")
+    return ENGINES[name]()
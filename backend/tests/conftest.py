@@ -0,0 +1,5 @@
+import os
+
+# Read by backend.config on import: keep test sessions out of the working tree's transcript log and results store
+os.environ["TRANSCRIPT_LOG_DIR"] = ""
+os.environ["RESULTS_STORE_DIR"] = ""
@@ -0,0 +1,71 @@
+import os
+
+from backend.analytics import ResultsStore
+from backend.models import Evaluation
+
+
+def _interview(n: int):
+    scores = [3.0 + n % 5, 6.0, 8.0]
+    state = {
+        "evaluations_history": [Evaluation(score=s, topic="Caching", strengths=[], weaknesses=[]) for s in scores],
+        "summary": {"verdict": "Good performance", "average_score": sum(scores) / len(scores),
+                    "weak_topics": ["Caching"] if n % 2 else []},
+    }
+    return {"role": f"Role {n % 3}", "experience": "3 years", "persona": "strict"}, state
+
+
+def _store(directory, **kwargs):
+    store = ResultsStore(directory, flush_interval=3600, **kwargs)
+    store.close()  # Stop the background writer; flushes happen explicitly in the tests
+    return store
+
+
+def _fill(store, count, per_flush):
+    for n in range(count):
+        store.record(*_interview(n))
+        if (n + 1) % per_flush == 0:
+            store.flush()
+    store.flush()
+
+
+def _results(store):
+    return (store.score_percentiles("role"), store.weak_topic_frequencies(),
+            store.difficulty_transitions(), store.interviews.rows)
+
+
+def test_compaction_bounds_files_and_keeps_results(tmp_path):
+    store = _store(str(tmp_path), compact_after=4)
+    _fill(store, 50, per_flush=3)
+    expected = _results(store)
+
+    files = [n for n in os.listdir(tmp_path) if n.endswith(".npz")]
+    assert len(files) <= 4
+    assert any(n.startswith("base-") for n in files)
+    assert _results(_store(str(tmp_path), compact_after=4)) == expected
+
+
+def test_torn_segment_is_skipped_on_load(tmp_path):
+    store = _store(str(tmp_path))
+    _fill(store, 9, per_flush=3)
+    segments = sorted(n for n in os.listdir(tmp_path) if n.startswith("segment-"))
+    assert len(segments) == 3
+    with open(tmp_path / segments[1], "r+b") as f:
+        f.truncate(100)
+    (tmp_path / "segment-000009.npz.tmp").write_bytes(b"partial")
+
+    reloaded = _store(str(tmp_path))
+    assert reloaded.interviews.rows == 6
+    assert reloaded.turns.rows == 18
+    # Rows of the segment after the torn one still point at their own interviews
+    assert reloaded.turns.view()["interview"].max() == 5
+    assert not (tmp_path / "segment-000009.npz.tmp").exists()
+
+
+def test_dictionaries_are_rewritten_only_when_they_grow(tmp_path):
+    store = _store(str(tmp_path))
+    _fill(store, 3, per_flush=3)
+    path = tmp_path / "dictionaries.json"
+    os.utime(path, (0, 0))
+    store.record(*_interview(0))
+    store.flush()
+    assert os.stat(path).st_mtime == 0
@@ -0,0 +1,139 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from backend import llm
+from backend.batching import CompletionsClient, MicroBatcher, _Pending, render_prompt
+from backend.models import Question
+
+MESSAGES = [SystemMessage(content="You are an interviewer."), HumanMessage(content="Ask one question.")]
+
+
+@pytest.fixture(autouse=True)
+def batching_off():
+    yield
+    llm.configure_batching(None)
+
+
+def test_prompts_use_the_named_chat_template():
+    assert render_prompt(MESSAGES, "chatml") == (
+        "<|im_start|>system\nYou are an interviewer.<|im_end|>\n"
+        "<|im_start|>user\nAsk one question.<|im_end|>\n"
+        "<|im_start|>assistant\n"
+    )
+    assert render_prompt(MESSAGES, "llama3") == (
+        "<|start_header_id|>system<|end_header_id|>\n\nYou are an interviewer.<|eot_id|>"
+        "<|start_header_id|>user<|end_header_id|>\n\nAsk one question.<|eot_id|>"
+        "<|start_header_id|>assistant<|end_header_id|>\n\n"
+    )
+    assert render_prompt(MESSAGES, "gemma").endswith("Ask one question.<end_of_turn>\n<start_of_turn>model\n")
+
+
+def test_batching_requires_a_model_and_a_known_template():
+    with pytest.raises(ValueError, match="LLM_BATCH_MODEL"):
+        llm.configure_batching("http://localhost:8000", model=None, template="chatml")
+    with pytest.raises(ValueError, match="LLM_BATCH_TEMPLATE"):
+        llm.configure_batching("http://localhost:8000", model="qwen2.5-7b-instruct", template=None)
+    with pytest.raises(ValueError, match="LLM_BATCH_TEMPLATE"):
+        llm.configure_batching("http://localhost:8000", model="qwen2.5-7b-instruct", template="alpaca")
+
+
+def test_batches_go_to_the_batch_model_in_its_template(monkeypatch):
+    sent = []
+
+    def complete(self, model, prompts, temperature, max_tokens, json_schema=None):
+        sent.append((model, prompts))
+        return ['{"question": "How would you shard a users table?"}'] * len(prompts)
+
+    monkeypatch.setattr(CompletionsClient, "complete", complete)
+    llm.configure_batching("http://localhost:8000", routes=["question"], model="llama-3.1-8b-instruct",
+                           template="llama3", window_ms=1)
+
+    result = llm.RoutedLLM("question", Question).invoke(MESSAGES)
+
+    assert result.question == "How would you shard a users table?"
+    assert sent == [("llama-3.1-8b-instruct", [render_prompt(MESSAGES, "llama3")])]
+
+
+class Dispatch:
+    """Fake dispatch: upper-cases each item, recording the batches it was given."""
+
+    def __init__(self):
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def __call__(self, key, items):
+        with self.lock:
+            self.batches.append(list(items))
+        return [ValueError(f"bad item {item}") if item == "bad" else item.upper() for item in items]
+
+
+def submit_all(batcher, items, timeout=5):
+    with ThreadPoolExecutor(max_workers=len(items)) as pool:
+        futures = [pool.submit(batcher.submit, "k", item, timeout) for item in items]
+    return futures
+
+
+def test_concurrent_calls_share_one_batch():
+    dispatch = Dispatch()
+    batcher = MicroBatcher(dispatch, window_ms=2000, max_batch=3)
+
+    futures = submit_all(batcher, ["a", "b", "c"])
+
+    assert [f.result() for f in futures] == ["A", "B", "C"]
+    assert len(dispatch.batches) == 1
+    assert sorted(dispatch.batches[0]) == ["a", "b", "c"]
+
+
+def test_batches_are_split_at_max_batch():
+    dispatch = Dispatch()
+    batcher = MicroBatcher(dispatch, window_ms=20, max_batch=2)
+
+    futures = submit_all(batcher, ["a", "b", "c"])
+
+    assert [f.result() for f in futures] == ["A", "B", "C"]
+    assert sorted(len(batch) for batch in dispatch.batches) == [1, 2]
+
+
+def test_an_exception_result_fails_only_its_call():
+    batcher = MicroBatcher(Dispatch(), window_ms=2000, max_batch=2)
+
+    good, bad = submit_all(batcher, ["a", "bad"])
+
+    assert good.result() == "A"
+    with pytest.raises(ValueError, match="bad item"):
+        bad.result()
+
+
+def test_a_result_count_mismatch_fails_every_call():
+    batcher = MicroBatcher(lambda key, items: items[:1], window_ms=2000, max_batch=2)
+
+    for future in submit_all(batcher, ["a", "b"]):
+        with pytest.raises(ValueError, match="1 results for a batch of 2"):
+            future.result()
+
+
+def test_a_timed_out_call_is_not_dispatched():
+    dispatch = Dispatch()
+    batcher = MicroBatcher(dispatch, window_ms=100, max_batch=8)
+
+    with pytest.raises(FutureTimeout):
+        batcher.submit("k", "late", timeout=0.01)
+    assert batcher.submit("k", "b") == "B"
+
+    assert dispatch.batches == [["b"]]
+
+
+def test_a_call_that_timed_out_after_leaving_the_queue_is_dropped():
+    dispatch = Dispatch()
+    batcher = MicroBatcher(dispatch)
+    late, waiting = _Pending("late"), _Pending("b")
+    late.future.cancel()
+
+    batcher._slots.acquire()
+    batcher._run("k", [late, waiting])
+
+    assert dispatch.batches == [["b"]]
+    assert waiting.future.result() == "B"
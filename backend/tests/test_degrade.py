@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import pytest
+
+from backend import degrade
+from backend.degrade import LEVELS, DegradationController
+
+SLO_MS = 1000
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(degrade, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+@pytest.fixture
+def controller(clock):
+    return DegradationController(
+        slo_ms={"evaluation": SLO_MS}, max_inflight=8, window_seconds=10, step_seconds=2,
+        recover_seconds=5, recover_ratio=0.7, hold_seconds=20,
+    )
+
+
+def run(controller, clock, latency_ms, seconds, calls_per_second=4):
+    """A fake LLM answering back-to-back calls in `latency_ms`; returns the levels seen, one per call."""
+    levels = []
+    for _ in range(int(seconds * calls_per_second)):
+        with controller.track("evaluation"):
+            clock.now += latency_ms / 1000
+        clock.now += max(1 / calls_per_second - latency_ms / 1000, 0)
+        levels.append(controller.level)
+    return levels
+
+
+def test_slow_model_escalates_one_level_per_step(controller, clock):
+    assert max(run(controller, clock, 0.2 * SLO_MS, 10)) == 0
+    levels = run(controller, clock, 2 * SLO_MS, 12, calls_per_second=1)
+    assert levels[-1] == len(LEVELS) - 1
+    # Never more than one level per step_seconds
+    assert all(b - a <= 1 for a, b in zip(levels, levels[1:]))
+
+
+def test_recovers_to_normal_once_latency_is_back(controller, clock):
+    run(controller, clock, 2 * SLO_MS, 12, calls_per_second=1)
+    assert controller.level == len(LEVELS) - 1
+    levels = run(controller, clock, 0.2 * SLO_MS, 60)
+    assert levels[-1] == 0
+    assert levels == sorted(levels, reverse=True)
+
+
+def test_level_is_not_held_inside_the_dead_band(controller, clock):
+    run(controller, clock, 2 * SLO_MS, 8, calls_per_second=1)
+    escalated = controller.level
+    assert escalated >= 1
+    # Within the SLO but above recover_ratio: held for a while, then released one level per hold_seconds
+    levels = run(controller, clock, 0.85 * SLO_MS, 15, calls_per_second=1)
+    assert min(levels) == escalated
+    levels += run(controller, clock, 0.85 * SLO_MS, 20 * escalated + 10, calls_per_second=1)
+    assert levels[-1] == 0
+
+
+def test_slo_is_configurable_from_the_environment(monkeypatch):
+    import importlib
+
+    from backend import config
+
+    monkeypatch.setenv("DEGRADE_SLO_MS_EVALUATION", "20000")
+    try:
+        assert importlib.reload(config).DEGRADE_SLO_MS["evaluation"] == 20000
+    finally:
+        monkeypatch.delenv("DEGRADE_SLO_MS_EVALUATION")
+        importlib.reload(config)
@@ -0,0 +1,29 @@
+import pytest
+
+from backend import agents
+from backend.benchmarks.engine_parity import FLOWS, SCENARIOS, first_difference, install_scripted_llms, run_scenario
+
+_SCRIPTED = ("question_llm", "evaluation_with_feedback_llm", "fused_turn_llm", "transition_llm", "closing_llm")
+
+
+@pytest.fixture(scope="module")
+def engines():
+    saved = {name: getattr(agents, name) for name in _SCRIPTED}
+    install_scripted_llms()
+    try:
+        yield {flow: (build_graph(), build_native()) for flow, (build_graph, build_native) in FLOWS.items()}
+    finally:
+        for name, llm in saved.items():
+            setattr(agents, name, llm)
+
+
+@pytest.mark.parametrize("scenario", list(SCENARIOS))
+@pytest.mark.parametrize("flow", list(FLOWS))
+def test_native_engine_matches_langgraph(engines, flow, scenario):
+    graph, machine = engines[flow]
+    persona = "coach" if flow == "coach" else "strict"
+
+    expected = run_scenario(graph, persona, SCENARIOS[scenario])
+    actual = run_scenario(machine, persona, SCENARIOS[scenario])
+
+    assert first_difference(expected, actual) is None
@@ -0,0 +1,39 @@
+import pytest
+
+from backend.prescreen import prescreen_answer
+
+
+@pytest.mark.parametrize("answer", ["", "   \n", None])
+def test_empty_answer_is_scored_locally(answer):
+    result = prescreen_answer(answer)
+    assert result["action"] == "score"
+    assert result["reason"] == "empty"
+    assert result["evaluation"].score == 0.0
+
+
+@pytest.mark.parametrize("answer", ["I don't know", "Um, honestly no idea.", "skip", "Next question", "N/A"])
+def test_explicit_non_answer_is_scored_locally(answer):
+    result = prescreen_answer(answer)
+    assert result["action"] == "score"
+    assert result["reason"] == "non_answer"
+
+
+@pytest.mark.parametrize("answer", ["O(1)", "42", "[1, 2, 3]", "None", "Nothing, it is thread-safe",
+                                    "使用哈希表", "Используйте хеш-таблицу", "λx.x"])
+def test_short_and_symbolic_answers_go_to_the_evaluator(answer):
+    result = prescreen_answer(answer)
+    assert result["action"] == "evaluate"
+    assert result["answer"] == answer
+
+
+@pytest.mark.parametrize("answer", ["", "I don't know"])
+def test_prescreened_answer_is_not_a_weak_topic(answer):
+    from backend.nodes import _decision_updates
+
+    state = {"difficulty": "medium", "question_count": 1, "score_history": [6.0], "weak_topics": {"Caching"},
+             "evaluation": prescreen_answer(answer)["evaluation"]}
+
+    updates = _decision_updates(state)
+
+    assert updates["difficulty"] == "easy"
+    assert updates["weak_topics"] == {"Caching"}
@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+from backend.ratelimit import RateLimiter, client_key, parse_networks
+
+PROXIES = parse_networks(["10.0.0.0/8", "127.0.0.1"])
+
+
+def _request(host, **headers):
+    return SimpleNamespace(client=SimpleNamespace(host=host), headers={k.replace("_", "-"): v for k, v in headers.items()})
+
+
+def test_unknown_api_keys_do_not_get_their_own_bucket():
+    limiter = RateLimiter({"/interview/start": {"capacity": 2, "per_seconds": 60}})
+    results = [
+        limiter.check("/interview/start", client_key(_request("203.0.113.7", x_api_key=f"random-{n}"), {"good"}))
+        for n in range(3)
+    ]
+    assert results[:2] == [None, None]
+    assert results[2] is not None
+
+
+def test_configured_api_key_is_keyed_by_digest():
+    key = client_key(_request("203.0.113.7", x_api_key="good"), {"good"})
+    assert key.startswith("key:") and "good" not in key
+    assert key == client_key(_request("198.51.100.1", x_api_key="good"), {"good"})
+
+
+def test_forwarded_for_is_used_only_behind_trusted_proxies():
+    forwarded = {"x_forwarded_for": "1.2.3.4, 198.51.100.9, 10.0.0.5"}
+    assert client_key(_request("10.0.0.2", **forwarded), trusted_proxies=PROXIES) == "ip:198.51.100.9"
+    assert client_key(_request("203.0.113.7", **forwarded), trusted_proxies=PROXIES) == "ip:203.0.113.7"
+    assert client_key(_request("10.0.0.2"), trusted_proxies=PROXIES) == "ip:10.0.0.2"
+    assert client_key(_request("10.0.0.2", **forwarded)) == "ip:10.0.0.2"
+
+
+def test_users_behind_one_proxy_get_separate_buckets():
+    limiter = RateLimiter({"/interview/start": {"capacity": 1, "per_seconds": 60}})
+    first = client_key(_request("127.0.0.1", x_forwarded_for="198.51.100.1"), trusted_proxies=PROXIES)
+    second = client_key(_request("127.0.0.1", x_forwarded_for="198.51.100.2"), trusted_proxies=PROXIES)
+    assert limiter.check("/interview/start", first) is None
+    assert limiter.check("/interview/start", second) is None
+    assert limiter.check("/interview/start", first) is not None
@@ -0,0 +1,70 @@
+import threading
+import time
+
+from backend.speculation import SpeculativeEvaluator
+
+
+class BlockingEvaluator:
+    """Evaluation that runs until released, recording every text it was started for."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.texts = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, state):
+        with self._lock:
+            self.texts.append(state["last_answer_text"])
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        self.release.wait(5)
+        with self._lock:
+            self.running -= 1
+        return {"text": state["last_answer_text"]}
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def _speculator(evaluate, **kwargs):
+    return SpeculativeEvaluator(evaluate, stable_ms=20, threshold=0.95, **kwargs)
+
+
+def test_newer_text_waits_for_the_running_speculation():
+    evaluate = BlockingEvaluator()
+    speculator = _speculator(evaluate)
+    speculator.observe("s", "Q1", "I would use a cache")
+    _wait_for(lambda: evaluate.texts == ["I would use a cache"])
+
+    for text in ("I would use a cache with", "I would use a cache with a TTL", "I would use a cache with a short TTL"):
+        speculator.observe("s", "Q1", text)
+        time.sleep(0.08)
+    assert evaluate.texts == ["I would use a cache"]
+
+    evaluate.release.set()
+    _wait_for(lambda: len(evaluate.texts) == 2)
+    # Only the newest text is evaluated once the running one finishes
+    assert evaluate.texts[1] == "I would use a cache with a short TTL"
+    assert evaluate.max_running == 1
+    assert speculator.take("s", "Q1", "I would use a cache with a short TTL.") == {"text": evaluate.texts[1]}
+
+
+def test_speculations_per_answer_are_capped():
+    evaluate = BlockingEvaluator()
+    evaluate.release.set()
+    speculator = _speculator(evaluate, max_per_answer=2)
+    for n in range(5):
+        speculator.observe("s", "Q1", "answer " + "word " * n)
+        _wait_for(lambda: len(evaluate.texts) == min(n + 1, 2))
+        time.sleep(0.05)
+    assert len(evaluate.texts) == 2
+
+    # A new question starts a new budget
+    speculator.observe("s", "Q2", "another answer")
+    _wait_for(lambda: len(evaluate.texts) == 3)
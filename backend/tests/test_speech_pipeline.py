@@ -0,0 +1,125 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from backend import llm
+from backend.models import EvaluationWithFeedback
+from backend.tts.pipeline import SpeechChannel, field_feeder, pipelined_speech
+from backend.tts.tts_engine import FakeTTSEngine
+
+STREAMED = EvaluationWithFeedback(
+    score=7.0,
+    topic="Caching",
+    feedback="You explained eviction clearly. Mention how you would size the cache next time.",
+    strengths=["Clear"],
+    weaknesses=["Sizing"],
+)
+FALLBACK = EvaluationWithFeedback(
+    score=6.5,
+    topic="Caching",
+    feedback="Good grasp of eviction policies. Add numbers when you discuss capacity.",
+    strengths=["Eviction"],
+    weaknesses=["Capacity"],
+)
+
+
+class FakeStreamingRoute:
+    """Streams `text` in small chunks, raising after `fail_after` characters when set."""
+
+    def __init__(self, text, fail_after=None):
+        self.text = text
+        self.fail_after = fail_after
+
+    def stream(self, messages, **kwargs):
+        for start in range(0, len(self.text), 7):
+            if self.fail_after is not None and start >= self.fail_after:
+                raise ConnectionError("stream dropped")
+            yield SimpleNamespace(content=self.text[start:start + 7])
+
+
+class FakeRoute:
+    def __init__(self, result):
+        self.result = result
+
+    def invoke(self, messages, **kwargs):
+        return self.result
+
+
+class RecordingTTSEngine(FakeTTSEngine):
+    """Fast fake engine that records the sentences it was asked to speak."""
+
+    def __init__(self):
+        super().__init__(first_chunk_ms=0, realtime_factor=1000)
+        self.spoken = []
+
+    def stream(self, text, audio_format="mp3", **kwargs):
+        self.spoken.append(text)
+        yield from super().stream(text, audio_format, **kwargs)
+
+
+@pytest.fixture
+def routed(monkeypatch):
+    def install(stream_route, fallback_result):
+        monkeypatch.setattr(llm, "_build_stream_route", lambda version, route, schema: stream_route)
+        monkeypatch.setattr(llm, "_build_route", lambda version, route, schema: FakeRoute(fallback_result))
+        monkeypatch.setattr(llm, "_batcher", None)
+        return llm.RoutedLLM("evaluation", EvaluationWithFeedback)
+    return install
+
+
+def _speak(routed_llm, engine):
+    channel = SpeechChannel(1)
+    result = routed_llm.invoke_streaming([], field_feeder(channel, "feedback"))
+    channel.finish(result.feedback)
+    audio = b"".join(pipelined_speech(channel.sentences(timeout=2), engine, "mp3"))
+    return result, audio
+
+
+def test_streamed_reply_is_spoken_once(routed):
+    engine = RecordingTTSEngine()
+    routed_llm = routed(FakeStreamingRoute(json.dumps(STREAMED.model_dump())), FALLBACK)
+
+    result, audio = _speak(routed_llm, engine)
+
+    assert result == STREAMED
+    assert " ".join(engine.spoken) == STREAMED.feedback
+    assert audio
+
+
+def test_stream_failing_before_a_sentence_speaks_the_fallback_text(routed):
+    engine = RecordingTTSEngine()
+    # Dies inside the first sentence of the feedback field
+    routed_llm = routed(FakeStreamingRoute(json.dumps(STREAMED.model_dump()), fail_after=56), FALLBACK)
+
+    result, _ = _speak(routed_llm, engine)
+
+    assert result == FALLBACK
+    assert " ".join(engine.spoken) == FALLBACK.feedback
+
+
+def test_stream_failing_after_a_sentence_speaks_the_rest_of_the_fallback_text(routed):
+    engine = RecordingTTSEngine()
+    text = json.dumps(STREAMED.model_dump())
+    first_sentence = STREAMED.feedback.split(". ")[0] + "."
+    # Dies once the first sentence has been published, before the second is complete
+    fail_after = text.index(first_sentence) + len(first_sentence) + 14
+    routed_llm = routed(FakeStreamingRoute(text, fail_after=fail_after), FALLBACK)
+
+    result, _ = _speak(routed_llm, engine)
+
+    assert result == FALLBACK
+    # The streamed sentence was already spoken; the fallback reply is then spoken in full
+    assert engine.spoken[0] == first_sentence
+    assert " ".join(engine.spoken[1:]) == FALLBACK.feedback
+
+
+def test_fallback_with_the_same_opening_is_spoken_from_where_it_differs():
+    channel = SpeechChannel()
+    channel.feed("You explained eviction clearly. Mention how")
+    channel.finish("You explained eviction clearly. Then talk about sizing the cache.")
+
+    assert list(channel.sentences(timeout=1)) == [
+        "You explained eviction clearly.",
+        "Then talk about sizing the cache.",
+    ]
@@ -0,0 +1,87 @@
+import pytest
+
+from backend import stopping
+from backend.config import SCORE_EXCELLENT, SCORE_GOOD, SCORE_NEEDS_IMPROVEMENT
+from backend.stopping import check_settings, likely_to_stop, mean_interval, should_stop, verdict_band
+
+
+def stop(scores, **kwargs):
+    settings = dict(min_questions=3, max_questions=5, confidence=0.9, prior_sd=1.5, prior_weight=2)
+    settings.update(kwargs)
+    return should_stop(scores, **settings)
+
+
+@pytest.mark.parametrize("avg, band", [
+    (10.0, 0),
+    (SCORE_EXCELLENT, 0),
+    (SCORE_EXCELLENT - 0.01, 1),
+    (SCORE_GOOD, 1),
+    (SCORE_NEEDS_IMPROVEMENT, 3),
+    (SCORE_NEEDS_IMPROVEMENT - 0.01, 4),
+    (0.0, 4),
+])
+def test_verdict_band_edges(avg, band):
+    assert verdict_band(avg) == band
+
+
+def test_interval_is_centred_and_shrinks_with_more_scores():
+    low3, high3 = mean_interval([6.0, 6.0, 6.0], 0.9, 1.5, 2)
+    low5, high5 = mean_interval([6.0] * 5, 0.9, 1.5, 2)
+
+    assert (low3 + high3) / 2 == pytest.approx(6.0)
+    assert high5 - low5 < high3 - low3
+
+
+def test_identical_scores_do_not_look_certain():
+    # With no prior, two equal scores would give a zero-width interval
+    low, high = mean_interval([9.0, 9.0], 0.9, 1.5, 2)
+    assert high - low > 1.0
+
+
+def test_never_stops_before_the_minimum():
+    assert not stop([2.0, 2.0])
+    assert stop([2.0, 2.0], min_questions=2)
+
+
+def test_always_stops_at_the_maximum():
+    assert stop([2.0, 9.0, 5.0, 8.0, 3.0])
+
+
+@pytest.mark.parametrize("scores", [[2.0, 2.0, 2.0], [9.5, 9.5, 9.5]])
+def test_settled_history_stops(scores):
+    assert stop(scores)
+
+
+@pytest.mark.parametrize("scores", [[6.5, 6.5, 6.5], [2.0, 9.0, 5.0], [8.0, 8.0, 8.0]])
+def test_history_near_a_band_edge_or_spread_out_continues(scores):
+    assert not stop(scores)
+
+
+def test_likely_to_stop_assumes_the_next_score_is_the_mean(monkeypatch):
+    monkeypatch.setattr(stopping, "ADAPTIVE_STOPPING", True)
+
+    assert likely_to_stop([2.0, 2.0])
+    assert not likely_to_stop([6.5, 6.5])
+    assert not likely_to_stop([])
+
+
+def test_likely_to_stop_is_off_without_adaptive_stopping(monkeypatch):
+    monkeypatch.setattr(stopping, "ADAPTIVE_STOPPING", False)
+    assert not likely_to_stop([2.0, 2.0])
+
+
+@pytest.mark.parametrize("settings", [
+    dict(min_questions=1, max_questions=5, confidence=0.9, prior_weight=0),
+    dict(min_questions=0, max_questions=5, confidence=0.9, prior_weight=2),
+    dict(min_questions=4, max_questions=3, confidence=0.9, prior_weight=2),
+    dict(min_questions=3, max_questions=5, confidence=1.0, prior_weight=2),
+    dict(min_questions=3, max_questions=5, confidence=0.9, prior_weight=-1),
+])
+def test_invalid_settings_are_rejected(settings):
+    with pytest.raises(ValueError):
+        check_settings(**settings)
+
+
+def test_undefined_spread_raises_instead_of_dividing_by_zero():
+    with pytest.raises(ValueError):
+        mean_interval([7.0], 0.9, 1.5, 0)
@@ -0,0 +1,68 @@
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from backend import agents, main
+from backend.benchmarks.engine_parity import STRONG, install_scripted_llms
+from backend.stt import stt_engine
+
+_SCRIPTED = ("question_llm", "evaluation_with_feedback_llm", "fused_turn_llm", "transition_llm", "closing_llm")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    for name in _SCRIPTED:
+        monkeypatch.setattr(agents, name, getattr(agents, name))
+    install_scripted_llms()
+    monkeypatch.setattr(stt_engine, "STT_ENGINE", "fake")
+    monkeypatch.setattr(main, "_stt_engine", None)
+    monkeypatch.setattr(main.rate_limiter, "enabled", False)
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture
+def session_id(client):
+    response = client.post("/interview/start", json={"role": "Backend Engineer", "experience": "3 years",
+                                                     "persona": "strict"})
+    assert response.status_code == 200
+    return response.json()["session_id"]
+
+
+def test_partials_then_final_result(client, session_id):
+    words = STRONG.split()
+    with client.websocket_connect(f"/interview/answer/stream?session_id={session_id}") as ws:
+        ws.send_bytes(" ".join(words[:4]).encode())
+        assert ws.receive_json() == {"type": "partial", "text": " ".join(words[:4])}
+        ws.send_bytes(" ".join(words[4:]).encode())
+        assert ws.receive_json() == {"type": "partial", "text": STRONG}
+        ws.send_json({"type": "end"})
+
+        final = ws.receive_json()
+
+    assert final["type"] == "final"
+    assert final["transcript"] == STRONG
+    assert final["result"]["evaluation"]["score"] == 8.5
+    assert main.get_stt_engine().name == "fake"
+
+
+def test_cancel_discards_the_utterance(client, session_id):
+    with client.websocket_connect(f"/interview/answer/stream?session_id={session_id}") as ws:
+        ws.send_bytes(b"half an answer")
+        assert ws.receive_json()["type"] == "partial"
+        ws.send_json({"type": "cancel"})
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+    assert closed.value.code == 1000
+
+    # Nothing was submitted: the session still waits for its first answer
+    state = client.get(f"/interview/{session_id}/state").json()
+    assert state["question_count"] == 0
+
+
+def test_unknown_session_is_closed_with_4404(client):
+    with client.websocket_connect("/interview/answer/stream?session_id=no-such-session") as ws:
+        assert ws.receive_json()["type"] == "error"
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+    assert closed.value.code == 4404
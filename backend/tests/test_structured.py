@@ -0,0 +1,61 @@
+import json
+
+import pytest
+from langchain_core.exceptions import OutputParserException
+
+from backend.models import EvaluationWithFeedback
+from backend.structured import parse_structured, repair_json
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Cut inside a string value
+    ('{"topic": "Cach', {"topic": "Cach"}),
+    # Cut inside a key, after a key, and after its colon
+    ('{"score": 7, "top', {"score": 7}),
+    ('{"score": 7, "topic"', {"score": 7}),
+    ('{"score": 7, "topic": ', {"score": 7}),
+    # Cut inside a list and after a trailing comma
+    ('{"strengths": ["Clear", "Conc', {"strengths": ["Clear", "Conc"]}),
+    ('{"strengths": ["Clear",', {"strengths": ["Clear"]}),
+    # Cut inside a number
+    ('{"score": 7.', {"score": 7}),
+    ('{"score": 7.5e', {"score": 7.5}),
+    ('{"score": -', {}),
+    # Cut inside a literal
+    ('{"ok": tru', {}),
+    ('{"flags": [true, nul', {"flags": [True]}),
+    # Escape split at the cut
+    ('{"topic": "a \\', {"topic": "a "}),
+])
+def test_truncated_output_is_repaired(text, expected):
+    assert json.loads(repair_json(text)) == expected
+
+
+def test_fenced_output_with_prose_is_unwrapped():
+    text = 'Here you go:\n```json\n{"score": 8, "topic": "Caching"}\n```\nHope that helps.'
+
+    assert json.loads(repair_json(text)) == {"score": 8, "topic": "Caching"}
+
+
+def test_text_without_an_object_is_not_repaired():
+    assert repair_json("I cannot answer that.") is None
+
+
+def test_truncated_reply_parses_with_missing_lists_defaulted():
+    text = '{"score": 6.5, "topic": "Caching", "feedback": "Mention eviction.", "strengths": ["Cle'
+
+    result = parse_structured(text, EvaluationWithFeedback)
+
+    assert result.score == 6.5
+    assert result.strengths == ["Cle"]
+    assert result.weaknesses == []
+
+
+@pytest.mark.parametrize("text", [
+    "I cannot answer that.",
+    '{"score": "high", "topic": "Caching", "feedback": "", "strengths": [], "weaknesses": []}',
+    '{"score": 7, "topic": "Caching"',  # Required feedback field lost to truncation
+])
+def test_unrecoverable_output_raises(text):
+    with pytest.raises(OutputParserException):
+        parse_structured(text, EvaluationWithFeedback)
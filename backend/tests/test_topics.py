@@ -0,0 +1,61 @@
+import pytest
+
+from backend.topics import TopicIndex
+
+
+@pytest.fixture
+def index():
+    return TopicIndex()
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("RESTful API design", "api_design"),
+    ("Designing REST endpoints", "api_design"),
+    ("Redis caching", "caching"),
+    ("Indexing strategies", "sql"),
+    ("Unit tests", "testing"),
+    ("Conflict with a coworker", "conflict"),
+    ("Memory leaks in Java", "memory_management"),
+])
+def test_spellings_map_onto_their_taxonomy_entry(index, raw, expected):
+    assert index.canonicalize(raw).id == expected
+
+
+@pytest.mark.parametrize("raw", [
+    "Garbage collection in Go",
+    "Garbage collection",
+    "Memory management",
+    "Memory management in C++",
+    "Reference counting in Python",
+])
+def test_runtime_concepts_are_not_filed_under_one_language(index, raw):
+    assert index.canonicalize(raw).id == "memory_management"
+
+
+@pytest.mark.parametrize("raw, wrong", [
+    ("Memory management in C++", "project_management"),
+    ("Team conflict", "version_control"),
+    ("Compiler design", "api_design"),
+])
+def test_a_shared_generic_word_is_not_a_match(index, raw, wrong):
+    assert index.canonicalize(raw).id != wrong
+
+
+def test_team_conflict_is_conflict_resolution(index):
+    assert index.canonicalize("Team conflict").id == "conflict"
+
+
+def test_learned_topics_do_not_absorb_subjects_sharing_a_head_noun(index):
+    bits = index.canonicalize("Bit manipulation")
+    strings = index.canonicalize("String manipulation")
+
+    assert bits.id.startswith("learned:")
+    assert strings.id.startswith("learned:")
+    assert strings.id != bits.id
+
+
+def test_later_spellings_join_a_learned_topic(index):
+    first = index.canonicalize("Internationalization")
+
+    assert first.id.startswith("learned:")
+    assert index.canonicalize("Internationalisation").id == first.id
@@ -0,0 +1,28 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.transcripts import TranscriptLog
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    log = TranscriptLog(str(tmp_path), fsync=False)
+    log.append("s1", "answer", {"answer": "A token bucket per client."})
+    assert log.flush()
+    monkeypatch.setattr(main, "transcript_log", log)
+    monkeypatch.setattr(main.profiler, "admin_token", "secret")
+    yield TestClient(main.app)
+    log.close()
+
+
+@pytest.mark.parametrize("headers", [{}, {"X-Admin-Token": "wrong"}])
+def test_transcript_export_requires_the_admin_token(client, headers):
+    assert client.get("/interview/s1/transcript", headers=headers).status_code == 403
+
+
+def test_admin_can_export_a_transcript(client):
+    response = client.get("/interview/s1/transcript", headers={"X-Admin-Token": "secret"})
+
+    assert response.status_code == 200
+    assert [e["event"] for e in response.json()["events"]] == ["answer"]
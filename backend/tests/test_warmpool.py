@@ -0,0 +1,217 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from backend import warmpool
+from backend.warmpool import WarmPool
+
+ROLE, EXPERIENCE, PERSONA = "Backend Engineer", "3 years", "strict"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class QueuedExecutor:
+    """Runs submitted jobs only when told to, so in-flight fills can be observed."""
+
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, fn, *args):
+        self.jobs.append((fn, args))
+
+    def run(self):
+        jobs, self.jobs = self.jobs, []
+        for fn, args in jobs:
+            fn(*args)
+
+
+class Threads:
+    """Stub fill/discard: numbered thread ids, recording what was filled and discarded."""
+
+    def __init__(self):
+        self.filled = []
+        self.discarded = []
+        self.fail = False
+
+    def fill(self, role, experience, persona):
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        self.filled.append((role, experience, persona))
+        thread_id = f"t{len(self.filled)}"
+        return thread_id, f"Question for {thread_id}"
+
+    def discard(self, persona, thread_id):
+        self.discarded.append((persona, thread_id))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    # The background loop sleeps forever; tests drive _tick directly
+    monkeypatch.setattr(warmpool, "time", SimpleNamespace(monotonic=clock, sleep=lambda s: threading.Event().wait()))
+    return clock
+
+
+@pytest.fixture
+def degradation(monkeypatch):
+    state = SimpleNamespace(level=0)
+    monkeypatch.setattr(warmpool, "degradation", state)
+    return state
+
+
+@pytest.fixture
+def threads():
+    return Threads()
+
+
+@pytest.fixture
+def make_pool(clock, degradation, threads):
+    def make(**kwargs):
+        settings = dict(max_per_key=3, max_total=10, ttl_seconds=300, demand_window=60, lead_seconds=30)
+        settings.update(kwargs)
+        pool = WarmPool(threads.fill, threads.discard, **settings)
+        pool._executor = QueuedExecutor()
+        return pool
+    return make
+
+
+def tick(pool, clock):
+    pool._tick(clock.now)
+    pool._executor.run()
+
+
+def test_pool_size_follows_demand(make_pool, clock, threads):
+    pool = make_pool()
+
+    assert pool.claim(ROLE, EXPERIENCE, PERSONA) is None
+    tick(pool, clock)
+    assert threads.filled == []  # Below min_demand
+
+    for _ in range(3):
+        pool.claim(ROLE, EXPERIENCE, PERSONA)
+    tick(pool, clock)
+    # 4 starts per 60 s cover 2 arrivals over the 30 s lead time
+    assert len(threads.filled) == 2
+
+    for _ in range(8):
+        pool.claim(ROLE, EXPERIENCE, PERSONA)
+    tick(pool, clock)
+    assert pool.stats()["keys"]["backend engineer / 3 years / strict"]["target"] == 3  # max_per_key
+
+
+def test_claim_takes_the_oldest_entry_under_the_requested_labels(make_pool, clock, threads):
+    pool = make_pool()
+    pool.claim("  Backend  Engineer ", EXPERIENCE, PERSONA)
+    pool.claim(ROLE, EXPERIENCE, PERSONA)
+    tick(pool, clock)
+
+    entry = pool.claim("backend engineer", "3 YEARS", PERSONA)
+
+    assert entry.thread_id == "t1"
+    assert entry.question == "Question for t1"
+    assert threads.filled[0] == (ROLE, EXPERIENCE, PERSONA)
+
+
+def test_expired_entries_are_discarded_and_replaced(make_pool, clock, threads):
+    pool = make_pool(ttl_seconds=30, demand_window=120)
+    pool.claim(ROLE, EXPERIENCE, PERSONA)
+    pool.claim(ROLE, EXPERIENCE, PERSONA)
+    tick(pool, clock)
+    assert len(threads.filled) == 1
+
+    clock.now += 30
+    tick(pool, clock)
+
+    assert threads.discarded == [(PERSONA, "t1")]
+    assert len(threads.filled) == 2
+    assert pool.claim(ROLE, EXPERIENCE, PERSONA).thread_id == "t2"
+
+
+def test_claim_skips_an_expired_entry(make_pool, clock, threads):
+    pool = make_pool(ttl_seconds=30)
+    pool.claim(ROLE, EXPERIENCE, PERSONA)
+    pool.claim(ROLE, EXPERIENCE, PERSONA)
+    tick(pool, clock)
+
+    clock.now += 31
+    assert pool.claim(ROLE, EXPERIENCE, PERSONA) is None
+    pool._executor.run()
+    assert threads.discarded == [(PERSONA, "t1")]
+
+
+def test_idle_combinations_are_forgotten(make_pool, clock):
+    pool = make_pool(ttl_seconds=30)
+    pool.claim(ROLE, EXPERIENCE, PERSONA)
+
+    clock.now += 61
+    tick(pool, clock)
+
+    assert pool.stats()["keys"] == {}
+
+
+def test_global_cap_limits_entries_across_combinations(make_pool, clock, threads):
+    pool = make_pool(max_total=4)
+    for role in ("Backend Engineer", "Frontend Engineer"):
+        for _ in range(12):
+            pool.claim(role, EXPERIENCE, PERSONA)
+
+    tick(pool, clock)
+    tick(pool, clock)
+
+    assert len(threads.filled) == 4
+    assert pool.stats()["ready"] == 4
+
+
+def test_filling_pauses_while_degraded(make_pool, clock, threads, degradation):
+    pool = make_pool(ttl_seconds=30, demand_window=120)
+    pool.claim(ROLE, EXPERIENCE, PERSONA)
+    pool.claim(ROLE, EXPERIENCE, PERSONA)
+    tick(pool, clock)
+
+    degradation.level = 1
+    clock.now += 30
+    tick(pool, clock)
+    # Expiry still runs; refilling waits
+    assert threads.discarded == [(PERSONA, "t1")]
+    assert len(threads.filled) == 1
+
+    degradation.level = 0
+    tick(pool, clock)
+    assert len(threads.filled) == 2
+
+
+def test_in_flight_fills_count_towards_the_target(make_pool, clock, threads):
+    pool = make_pool()
+    for _ in range(4):
+        pool.claim(ROLE, EXPERIENCE, PERSONA)
+
+    pool._tick(clock.now)
+    pool._tick(clock.now)  # Fills from the first tick have not finished
+    assert len(pool._executor.jobs) == 2
+    assert pool.stats()["filling"] == 2
+
+    pool._executor.run()
+    assert pool.stats()["filling"] == 0
+    assert pool.stats()["ready"] == 2
+
+
+def test_a_failed_fill_is_retried_on_the_next_tick(make_pool, clock, threads):
+    pool = make_pool()
+    pool.claim(ROLE, EXPERIENCE, PERSONA)
+    pool.claim(ROLE, EXPERIENCE, PERSONA)
+
+    threads.fail = True
+    tick(pool, clock)
+    assert pool.stats()["filling"] == 0
+    assert pool.stats()["ready"] == 0
+
+    threads.fail = False
+    tick(pool, clock)
+    assert pool.stats()["ready"] == 1
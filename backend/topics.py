@@ -0,0 +1,305 @@
+"""
+Canonical interview topics.
+
+`Evaluation.topic` is free text from the model, so one subject comes back as
+"REST APIs", "RESTful API design" or "rest api". `TopicIndex` maps each raw
+topic onto an entry of a fixed taxonomy by nearest neighbour over hashed
+word and character-trigram vectors. A topic with no close entry becomes a
+learned entry of its own, so later spellings of it map onto the first one.
+
+Words are weighted by how few taxonomy entries use them, and a match must
+share a word other than generic ones like "design" or "management": a
+shared head noun alone does not make "Compiler design" API design.
+Weak topics, summaries and analytics then hold one label per subject, and
+the question prompt's weak-topic line stays short and repeatable.
+"""
+
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+from backend.config import TOPIC_CANONICALIZE, TOPIC_MATCH_THRESHOLD, TOPIC_MAX_LEARNED
+from backend.metrics import metrics
+import logging
+import math
+import re
+import threading
+import zlib
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# id: (label, aliases). The label is what prompts, summaries and analytics show.
+TAXONOMY: Dict[str, Tuple[str, Sequence[str]]] = {
+    "api_design": ("API design", ["REST API design", "REST APIs", "RESTful services", "HTTP APIs",
+                                  "API versioning", "GraphQL", "gRPC", "endpoint design",
+                                  "API integration"]),
+    "http_networking": ("HTTP and networking", ["HTTP", "TCP/IP", "DNS", "networking fundamentals",
+                                                "websockets", "network protocols"]),
+    "system_design": ("System design", ["system architecture", "architecture design", "designing scalable systems",
+                                        "high level design"]),
+    "scalability": ("Scalability", ["horizontal scaling", "load balancing", "sharding", "partitioning",
+                                    "capacity planning", "rate limiting", "backpressure"]),
+    "distributed_systems": ("Distributed systems", ["consensus", "CAP theorem", "eventual consistency",
+                                                    "replication", "distributed transactions", "idempotency"]),
+    "caching": ("Caching", ["cache invalidation", "Redis", "CDN", "caching strategies", "memoization"]),
+    "databases": ("Databases", ["database design", "data modeling", "schema design", "NoSQL",
+                                "relational databases"]),
+    "sql": ("SQL and query optimization", ["SQL queries", "query optimization", "database indexing", "joins",
+                                           "indexes"]),
+    "transactions": ("Transactions and consistency", ["ACID", "isolation levels", "database transactions",
+                                                      "locking"]),
+    "messaging": ("Messaging and event-driven design", ["message queues", "Kafka", "pub/sub", "event driven architecture",
+                                                        "event sourcing", "RabbitMQ",
+                                                        "asynchronous messaging"]),
+    "microservices": ("Microservices", ["service oriented architecture", "monolith vs microservices",
+                                        "service boundaries", "inter-service communication",
+                                        "microservice communication"]),
+    "concurrency": ("Concurrency", ["multithreading", "race conditions", "deadlocks", "parallelism",
+                                    "thread safety", "synchronization"]),
+    "async_programming": ("Asynchronous programming", ["async/await", "event loop", "promises", "non-blocking IO"]),
+    "data_structures": ("Data structures", ["hash maps", "trees", "graphs", "linked lists", "heaps", "arrays"]),
+    "algorithms": ("Algorithms", ["sorting", "searching", "dynamic programming", "recursion", "graph algorithms"]),
+    "complexity": ("Time and space complexity", ["Big O notation", "algorithmic complexity", "performance analysis"]),
+    "performance": ("Performance optimization", ["profiling", "latency optimization", "memory optimization",
+                                                 "performance tuning"]),
+    # Runtime concepts shared by many languages stay out of the language entries
+    "memory_management": ("Memory management and GC", ["memory management", "garbage collection", "memory leaks",
+                                                       "reference counting", "memory allocation",
+                                                       "manual memory management"]),
+    "debugging": ("Debugging and troubleshooting", ["debugging", "troubleshooting", "root cause analysis"]),
+    "testing": ("Testing", ["unit testing", "integration testing", "test driven development", "TDD",
+                            "test automation", "mocking"]),
+    "code_quality": ("Code quality", ["code review", "clean code", "refactoring", "technical debt",
+                                      "maintainability"]),
+    "oop_design": ("Object-oriented design", ["OOP", "SOLID principles", "design patterns", "inheritance",
+                                              "encapsulation"]),
+    "version_control": ("Version control", ["Git", "branching strategies", "merge conflicts"]),
+    "ci_cd": ("CI/CD", ["continuous integration", "continuous deployment", "deployment pipelines",
+                        "release management"]),
+    "containers": ("Containers and orchestration", ["Docker", "Kubernetes", "containerization", "container orchestration"]),
+    "cloud": ("Cloud infrastructure", ["AWS", "Azure", "GCP", "cloud services", "serverless",
+                                       "infrastructure as code", "Terraform"]),
+    "observability": ("Monitoring and observability", ["monitoring", "logging", "metrics", "tracing",
+                                                       "alerting"]),
+    "reliability": ("Reliability and incident response", ["incident management", "on-call", "fault tolerance",
+                                                          "SRE", "disaster recovery", "high availability"]),
+    "security": ("Security", ["authentication", "authorization", "OAuth", "encryption", "web security",
+                              "OWASP", "input validation"]),
+    "frontend": ("Frontend development", ["React", "state management", "JavaScript", "TypeScript", "CSS",
+                                          "browser rendering", "UI components",
+                                          "design systems"]),
+    "web_performance": ("Web performance", ["page load performance", "bundle size", "lazy loading",
+                                            "core web vitals"]),
+    "accessibility": ("Accessibility", ["a11y", "WCAG", "screen readers"]),
+    "mobile": ("Mobile development", ["iOS", "Android", "React Native", "mobile apps"]),
+    "python": ("Python", ["Python programming", "Python internals", "GIL", "Python generators"]),
+    "java_jvm": ("Java and the JVM", ["Java", "JVM", "JVM internals", "Spring"]),
+    "data_engineering": ("Data pipelines", ["ETL", "data engineering", "batch processing", "stream processing",
+                                            "Spark", "data warehousing"]),
+    "machine_learning": ("Machine learning", ["ML", "model training", "feature engineering", "model evaluation",
+                                              "overfitting", "deep learning"]),
+    "statistics": ("Statistics and experimentation", ["A/B testing", "hypothesis testing", "probability",
+                                                      "statistical analysis"]),
+    "product_sense": ("Product sense", ["product thinking", "prioritization", "user needs", "product metrics"]),
+    "project_management": ("Project management", ["planning", "estimation", "agile", "scrum",
+                                                  "deadlines", "stakeholder management", "time management"]),
+    "communication": ("Communication", ["explaining technical concepts", "written communication",
+                                        "presentation skills"]),
+    "teamwork": ("Teamwork and collaboration", ["collaboration", "cross-functional work", "working with others"]),
+    "leadership": ("Leadership", ["mentoring", "team leadership", "decision making", "ownership",
+                                  "giving feedback"]),
+    "conflict": ("Conflict resolution", ["handling disagreements", "difficult conversations",
+                                         "conflict management", "conflict with a coworker"]),
+    "problem_solving": ("Problem solving", ["analytical thinking", "problem decomposition", "critical thinking"]),
+    "unanswered": ("Unanswered question", ["no answer", "skipped question"]),
+}
+
+_STOPWORDS = {"a", "an", "and", "the", "of", "in", "for", "with", "to", "on", "vs", "versus", "basics",
+              "fundamentals", "concepts", "understanding", "knowledge", "principles", "best", "practices", "strategy",
+              "strategies", "approach", "approaches", "techniques"}
+# Head nouns that many unrelated subjects share; a match needs a word besides these
+_GENERIC_WORDS = {"design", "management", "manipulation", "development", "programming", "engineering",
+                  "optimization", "analysis", "handling", "skill", "system", "architecture", "interview",
+                  "concept", "problem"}
+_WORD = re.compile(r"[a-z0-9]+")
+_DIMENSIONS = 4096
+_WORD_WEIGHT = 2.0  # A shared word counts for more than a shared trigram
+
+
+class Topic(NamedTuple):
+    id: str
+    label: str
+    score: float  # Cosine similarity to the matched alias; 1.0 for learned entries
+
+
+def _words(text: str) -> List[str]:
+    words = []
+    for word in _WORD.findall(text.lower().replace("restful", "rest")):
+        if word in _STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]  # "apis" -> "api", "queues" -> "queue"
+        words.append(word)
+    return words
+
+
+def _stem(word: str) -> str:
+    # Crude, but joins "design"/"designing" and "-isation"/"-ization" spellings
+    return word[:6]
+
+
+_GENERIC_STEMS = {_stem(word) for word in _GENERIC_WORDS}
+
+
+def _bucket(feature: str) -> int:
+    # crc32 rather than hash(): vectors must be the same in every process
+    return zlib.crc32(feature.encode()) % _DIMENSIONS
+
+
+def _idf(taxonomy: Dict[str, Tuple[str, Sequence[str]]]) -> Dict[str, float]:
+    """Inverse document frequency of each word stem, counting each taxonomy entry as one document."""
+    counts: Dict[str, int] = {}
+    for label, aliases in taxonomy.values():
+        for stem in {_stem(word) for alias in (label, *aliases) for word in _words(alias)}:
+            counts[stem] = counts.get(stem, 0) + 1
+    return {stem: math.log((len(taxonomy) + 1) / (count + 1)) + 1 for stem, count in counts.items()}
+
+
+def embed(text: str, idf: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    Unit-length hashed vector of the text's words and per-word character trigrams.
+
+    With `idf`, each word's features are scaled by its weight; words not in
+    it get the weight of a word used by no entry.
+    """
+    vector = np.zeros(_DIMENSIONS, dtype=np.float32)
+    unseen = max(idf.values()) if idf else 1.0
+    for word in _words(text):
+        weight = idf.get(_stem(word), unseen) if idf else 1.0
+        vector[_bucket("w:" + word)] += _WORD_WEIGHT * weight
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            vector[_bucket(padded[i:i + 3])] += weight
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+class TopicIndex:
+    """
+    Nearest-neighbour index from raw topic strings to canonical topics.
+
+    Every alias (and label) of every entry is a row of a unit-vector matrix,
+    so a lookup is one matrix-vector product. The best-scoring row that
+    shares a non-generic word with the topic wins. Results are cached per raw
+    string. Unmatched topics are learned as new entries, up to `max_learned`;
+    after that they go to their nearest entry, however far, so the set of
+    topics stays bounded.
+    """
+
+    def __init__(self, taxonomy: Dict[str, Tuple[str, Sequence[str]]] = TAXONOMY,
+                 threshold: float = TOPIC_MATCH_THRESHOLD, max_learned: int = TOPIC_MAX_LEARNED,
+                 cache_size: int = 8192):
+        self.threshold = threshold
+        self.max_learned = max_learned
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._labels: Dict[str, str] = {}
+        self._idf = _idf(taxonomy)
+        self._row_ids: List[str] = []
+        self._row_stems: List[FrozenSet[str]] = []
+        self._matrix = np.zeros((0, _DIMENSIONS), dtype=np.float32)
+        self._rows = 0
+        self._learned = 0
+        self._cache: Dict[str, Topic] = {}
+
+        for topic_id, (label, aliases) in taxonomy.items():
+            self._labels[topic_id] = label
+            for alias in (label, *aliases):
+                self._add_row(topic_id, alias, embed(alias, self._idf))
+
+    def canonicalize(self, raw: Optional[str]) -> Topic:
+        key = " ".join((raw or "").split())
+        cached = self._cache.get(key)
+        if cached is not None:
+            metrics.incr("topics.cache_hits")
+            return cached
+
+        vector = embed(key, self._idf)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+            topic = self._nearest(key, vector)
+            if len(self._cache) >= self.cache_size:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = topic
+        return topic
+
+    def label(self, raw: Optional[str]) -> str:
+        return self.canonicalize(raw).label
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "topics": len(self._labels),
+                "learned": self._learned,
+                "max_learned": self.max_learned,
+                "aliases": self._rows,
+                "cached": len(self._cache),
+                "cache_hits": metrics.counter("topics.cache_hits"),
+                "matched": metrics.counter("topics.matched"),
+                "overflow": metrics.counter("topics.overflow"),
+            }
+
+    def _nearest(self, key: str, vector: np.ndarray) -> Topic:
+        best, score = None, 0.0
+        if self._rows and vector.any():
+            # Only the query's few non-zero features contribute to the dot products
+            features = np.flatnonzero(vector)
+            scores = self._matrix[:self._rows, features] @ vector[features]
+            row = int(np.argmax(scores))
+            best, score = self._row_ids[row], float(scores[row])
+
+            stems = {_stem(word) for word in _words(key)}
+            required = (stems - _GENERIC_STEMS) or stems
+            candidates = np.flatnonzero(scores >= self.threshold)
+            for row in candidates[np.argsort(-scores[candidates], kind="stable")]:
+                if required & self._row_stems[row]:
+                    metrics.incr("topics.matched")
+                    topic_id = self._row_ids[row]
+                    return Topic(topic_id, self._labels[topic_id], round(float(scores[row]), 4))
+
+        if not key or not vector.any():
+            return Topic("unknown", key or "Unknown", 0.0)
+        if self._learned >= self.max_learned:
+            metrics.incr("topics.overflow")
+            return Topic(best, self._labels[best], round(score, 4))
+
+        # New subject: learned under its first spelling
+        topic_id = "learned:" + "_".join(_words(key))
+        if topic_id not in self._labels:
+            self._labels[topic_id] = key
+            self._learned += 1
+            metrics.incr("topics.learned")
+            logger.info(f"Learned new topic '{key}' (nearest was '{best}' at {score:.2f})")
+        self._add_row(topic_id, key, vector)
+        return Topic(topic_id, self._labels[topic_id], 1.0)
+
+    def _add_row(self, topic_id: str, text: str, vector: np.ndarray):
+        if self._rows == len(self._matrix):
+            grown = np.zeros((max(64, 2 * len(self._matrix)), _DIMENSIONS), dtype=np.float32)
+            grown[:self._rows] = self._matrix[:self._rows]
+            self._matrix = grown
+        self._matrix[self._rows] = vector
+        self._row_ids.append(topic_id)
+        self._row_stems.append(frozenset(_stem(word) for word in _words(text)))
+        self._rows += 1
+
+
+topic_index = TopicIndex()
+
+
+def canonical_topic(raw: Optional[str]) -> str:
+    """Canonical label for a model-reported topic (the raw text when canonicalization is off)."""
+    if not TOPIC_CANONICALIZE:
+        return raw
+    return topic_index.label(raw)
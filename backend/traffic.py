@@ -0,0 +1,208 @@
+"""
+Opt-in capture of anonymized request traces for load-test replay.
+
+Each /interview/* and /speech/* request is recorded as one JSON line in a
+gzip file: arrival offset, endpoint, payload sizes, status, latency, persona
+and a salted hash of the session id. Session ids in paths are replaced by a
+placeholder. No answer text, spoken text or role details are stored.
+"""
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+from urllib.parse import parse_qs
+from backend.config import SESSION_TTL_MINUTES
+import atexit
+import gzip
+import hashlib
+import json
+import logging
+import queue
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CAPTURED_PREFIXES = ("/interview/", "/speech/")
+FLUSH_INTERVAL_SECONDS = 1.0
+MAX_TRACKED_SESSIONS = 100000  # Personas remembered for sessions whose later requests omit it
+
+_SESSION_PATH_RE = re.compile(r"^/interview/([^/]+)/(.+)$")  # e.g. /interview/{session_id}/speech/feedback
+
+
+def anonymize(session_id: Optional[str], salt: str) -> Optional[str]:
+    if not session_id:
+        return None
+    return hashlib.sha256(f"{salt}:{session_id}".encode()).hexdigest()[:16]
+
+
+class TraceWriter:
+    """Background writer appending trace records to a gzip JSONL file."""
+
+    def __init__(self, path: str, max_queue: int = 10000):
+        self.path = path
+        self._queue: "queue.Queue[Optional[dict]]" = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+        self._thread.start()
+        self.dropped = 0
+        atexit.register(self.close)
+
+    def write(self, record: dict):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            # Never block the request path for tracing
+            self.dropped += 1
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        with gzip.open(self.path, "at", encoding="utf-8") as out:
+            last_flush = time.monotonic()
+            while True:
+                try:
+                    record = self._queue.get(timeout=FLUSH_INTERVAL_SECONDS)
+                except queue.Empty:
+                    out.flush()
+                    last_flush = time.monotonic()
+                    continue
+                if record is None:
+                    break
+                out.write(json.dumps(record, separators=(",", ":")) + "\n")
+                if time.monotonic() - last_flush >= FLUSH_INTERVAL_SECONDS:
+                    out.flush()
+                    last_flush = time.monotonic()
+
+
+class TrafficCaptureMiddleware:
+    """
+    ASGI middleware recording request traces for /interview/* and /speech/* endpoints.
+
+    Request bodies are inspected only for session id, persona and text
+    lengths; response bodies only for the session id issued by /interview/start.
+    Personas are remembered per session for `ttl_seconds` after its last
+    request, for at most MAX_TRACKED_SESSIONS sessions.
+    """
+
+    def __init__(self, app, path: str, salt: str = "", ttl_seconds: float = SESSION_TTL_MINUTES * 60):
+        self.app = app
+        self.salt = salt
+        self.ttl = ttl_seconds
+        self.writer = TraceWriter(path)
+        self.started = time.monotonic()
+        # anonymized session → (persona, last seen), least recently seen first
+        self._personas: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        logger.info(f"Traffic capture enabled: {path}")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(CAPTURED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        arrival = time.monotonic()
+        request_body = bytearray()
+        response_body = bytearray()
+        response = {"status": 0, "bytes": 0}
+        is_start = scope["path"] == "/interview/start"
+
+        async def capture_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                request_body.extend(message.get("body", b""))
+            return message
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                response["bytes"] += len(chunk)
+                if is_start:
+                    response_body.extend(chunk)
+            await send(message)
+
+        try:
+            await self.app(scope, capture_receive, capture_send)
+        finally:
+            self._record(scope, arrival, bytes(request_body), bytes(response_body), response)
+
+    def _record(self, scope, arrival: float, request_body: bytes, response_body: bytes, response: dict):
+        try:
+            payload = json.loads(request_body) if request_body else {}
+        except ValueError:
+            payload = {}
+        if not isinstance(payload, dict):
+            payload = {}
+
+        endpoint = scope["path"]
+        session_id = payload.get("session_id")
+        persona = payload.get("persona")
+        in_path = _SESSION_PATH_RE.match(endpoint)
+        if in_path:
+            session_id = in_path.group(1)
+            endpoint = f"/interview/{{session_id}}/{in_path.group(2)}"
+        if endpoint == "/interview/start" and response_body:
+            try:
+                session_id = json.loads(response_body).get("session_id")
+            except ValueError:
+                pass
+
+        session = anonymize(session_id, self.salt)
+        if session:
+            persona = self._remember_persona(session, persona, arrival)
+
+        record = {
+            "t": round(arrival - self.started, 4),
+            "method": scope["method"],
+            "endpoint": endpoint,
+            "status": response["status"],
+            "session": session,
+            "persona": persona,
+            "req_bytes": len(request_body),
+            "resp_bytes": response["bytes"],
+            "latency_ms": round((time.monotonic() - arrival) * 1000, 2),
+        }
+        if "answer" in payload:
+            record["answer_chars"] = len(payload.get("answer") or "")
+        if "role_description" in payload:
+            record["role_description_chars"] = len(payload.get("role_description") or "")
+        if "text" in payload:
+            record["text_chars"] = len(payload.get("text") or "")
+        number = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("number")
+        if number and number[0].isdigit():
+            record["number"] = int(number[0])
+        self.writer.write(record)
+
+    def _remember_persona(self, session: str, persona: Optional[str], now: float) -> Optional[str]:
+        """Record or look up a session's persona, evicting sessions idle past the TTL."""
+        while self._personas:
+            oldest, (_, seen) = next(iter(self._personas.items()))
+            if now - seen <= self.ttl:
+                break
+            del self._personas[oldest]
+        if not persona:
+            persona = self._personas.get(session, (None, 0.0))[0]
+        if persona:
+            self._personas[session] = (persona, now)
+            self._personas.move_to_end(session)
+            if len(self._personas) > MAX_TRACKED_SESSIONS:
+                self._personas.popitem(last=False)
+        return persona
+
+
+def load_traces(path: str):
+    """Read trace records from a gzip (or plain) JSONL file, ordered by arrival."""
+    opener = gzip.open if path.endswith(".gz") else open
+    records = []
+    with opener(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                if line.strip():
+                    records.append(json.loads(line))
+        except (EOFError, ValueError):
+            # File still being written: keep the complete lines read so far
+            pass
+    return sorted(records, key=lambda r: r["t"])
@@ -0,0 +1,215 @@
+"""
+Durable, append-only transcript log of interview events.
+
+Questions, answers, evaluations and summaries are appended from the graph
+nodes as JSON lines. `append` only enqueues: a background writer drains the
+queue in batches (group commit), writes each batch with one write() and one
+fsync, and rolls to a new segment file once the current one is large. The
+queue is bounded, so a disk that cannot keep up slows producers down
+(backpressure) instead of growing memory without limit.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from backend.metrics import metrics
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PATTERN = re.compile(r"^segment-(\d{6})\.log$")
+
+
+class TranscriptLog:
+    """
+    Segment-based event log with a background group-commit writer.
+
+    A None `directory` disables logging (append is a no-op). Each session's
+    events are indexed by (segment, offset) as they are committed, so
+    `export_session` reads only that session's lines.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str],
+        segment_bytes: int = 64 * 1024 * 1024,
+        max_queue: int = 10000,
+        max_batch: int = 1024,
+        fsync: bool = True,
+        backpressure_timeout: float = 1.0,
+    ):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_batch = max_batch
+        self.fsync = fsync
+        self.backpressure_timeout = backpressure_timeout
+        self._queue: "queue.Queue[Optional[dict]]" = queue.Queue(maxsize=max_queue)
+        self._index: Dict[str, List[Tuple[int, int, int]]] = {}  # session → [(segment, offset, length)]
+        self._index_lock = threading.Lock()
+        self._committed = threading.Condition()
+        self._enqueued_seq = 0
+        self._committed_seq = 0
+        self._seq_lock = threading.Lock()
+        self._segment = 0
+        self._file = None
+        self._thread = None
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._recover()
+            self._thread = threading.Thread(target=self._run, name="transcript-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    @property
+    def enabled(self) -> bool:
+        return self._thread is not None
+
+    # ----- producer side -----
+
+    def append(self, session_id: Optional[str], event: str, data: dict):
+        """Enqueue one event; blocks up to `backpressure_timeout` when the writer is behind."""
+        if not self.enabled or not session_id:
+            return
+        # Sequence numbers follow queue order so flush() can wait on a single counter
+        with self._seq_lock:
+            record = {"seq": self._enqueued_seq + 1, "t": time.time(), "session": session_id, "event": event, "data": data}
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                metrics.incr("transcripts.backpressure")
+                try:
+                    self._queue.put(record, timeout=self.backpressure_timeout)
+                except queue.Full:
+                    metrics.incr("transcripts.dropped")
+                    logger.warning(f"Transcript queue full, dropped {event} event for session {session_id}")
+                    return
+            self._enqueued_seq = record["seq"]
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything enqueued so far is committed to disk."""
+        if not self.enabled:
+            return True
+        target = self._enqueued_seq
+        with self._committed:
+            return self._committed.wait_for(lambda: self._committed_seq >= target, timeout)
+
+    def close(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+    # ----- reader side -----
+
+    def export_session(self, session_id: str) -> List[dict]:
+        """All committed events for a session, in append order."""
+        if not self.enabled:
+            return []
+        self.flush()
+        with self._index_lock:
+            entries = list(self._index.get(session_id, ()))
+
+        events = []
+        handles = {}
+        try:
+            for segment, offset, length in entries:
+                f = handles.get(segment)
+                if f is None:
+                    f = handles[segment] = open(self._segment_path(segment), "rb")
+                f.seek(offset)
+                events.append(json.loads(f.read(length)))
+        finally:
+            for f in handles.values():
+                f.close()
+        return events
+
+    def sessions(self) -> List[str]:
+        with self._index_lock:
+            return list(self._index)
+
+    # ----- writer side -----
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"segment-{segment:06d}.log")
+
+    def _recover(self):
+        """Rebuild the session index from existing segments; new writes go to a fresh segment."""
+        segments = sorted(
+            int(m.group(1)) for m in (SEGMENT_PATTERN.match(name) for name in os.listdir(self.directory)) if m
+        )
+        for segment in segments:
+            offset = 0
+            with open(self._segment_path(segment), "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # Torn final write from a crash
+                    try:
+                        session = json.loads(line)["session"]
+                    except (ValueError, KeyError):
+                        logger.warning(f"Skipping corrupt transcript record in segment {segment} at {offset}")
+                    else:
+                        self._index.setdefault(session, []).append((segment, offset, len(line)))
+                    offset += len(line)
+        self._segment = (segments[-1] if segments else 0) + 1
+        if segments:
+            logger.info(f"Transcript log: {len(self._index)} sessions in {len(segments)} segments")
+
+    def _open_segment(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self._segment_path(self._segment), "ab")
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            # Group commit: take whatever else is already waiting
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                stop = True
+                batch = [r for r in batch if r is not None]
+            if batch:
+                try:
+                    self._commit(batch)
+                except Exception as e:
+                    metrics.incr("transcripts.write_errors")
+                    logger.error(f"Transcript write failed, {len(batch)} events lost: {e}")
+                # Release flush() waiters even after a failed write
+                with self._committed:
+                    self._committed_seq = batch[-1]["seq"]
+                    self._committed.notify_all()
+        if self._file is not None:
+            self._file.close()
+
+    def _commit(self, batch: List[dict]):
+        start = time.perf_counter()
+        if self._file is None:
+            self._open_segment()  # Opened on first write so idle restarts leave no empty segments
+        elif self._file.tell() >= self.segment_bytes:
+            self._segment += 1
+            self._open_segment()
+
+        offset = self._file.tell()
+        lines = [(json.dumps(r, separators=(",", ":"), default=str) + "\n").encode() for r in batch]
+        self._file.write(b"".join(lines))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+        with self._index_lock:
+            for record, line in zip(batch, lines):
+                self._index.setdefault(record["session"], []).append((self._segment, offset, len(line)))
+                offset += len(line)
+
+        metrics.incr("transcripts.events", len(batch))
+        metrics.incr("transcripts.commits")
+        metrics.observe("transcripts.commit_ms", (time.perf_counter() - start) * 1000)
@@ -0,0 +1,356 @@
+"""
+Sentence-pipelined speech for text that is still being generated.
+
+Coach feedback and the spoken closing are multi-sentence. Instead of waiting
+for the whole LLM reply and then the whole synthesis, the node streams the
+reply's JSON into a `SpeechChannel`: the spoken field is extracted as it
+arrives (`JsonFieldStream`), cut into sentences (`SentenceSplitter`), and
+`pipelined_speech` synthesizes each sentence as soon as it is complete,
+yielding audio segments in order. Time to first audio is about one sentence
+of generation plus one short synthesis.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from backend.config import SENTENCE_MIN_CHARS, TTS_PIPELINE_LOOKAHEAD, TTS_PIPELINE_WORKERS
+from backend.metrics import metrics
+import logging
+import queue
+import re
+import struct
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class JsonFieldStream:
+    """
+    Incrementally decode one top-level string field of a streamed JSON object.
+
+    `feed` takes raw output as it arrives and returns the newly decoded text
+    of the field's value (escapes resolved, including ones split across chunks).
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self.done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = ""  # Pending escape sequence, starting with the backslash
+        self._high_surrogate = None
+        self._expect_key = False
+        self._key: Optional[List[str]] = None  # Characters of the key being read
+        self._last_key = None
+        self._capture = False
+
+    def feed(self, chunk: str) -> str:
+        out = []
+        for ch in chunk:
+            if self._in_string:
+                if self._escape:
+                    self._escape += ch
+                    if self._escape[1] == "u" and len(self._escape) < 6:
+                        continue
+                    self._string_char(self._decode_escape(), out)
+                    self._escape = ""
+                elif ch == "\\":
+                    self._escape = ch
+                elif ch == '"':
+                    self._end_string()
+                else:
+                    self._string_char(ch, out)
+            elif ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._key = []
+                elif self._depth == 1 and self._last_key == self.field and not self.done:
+                    self._capture = True
+            elif ch in "{[":
+                self._depth += 1
+                self._expect_key = ch == "{" and self._depth == 1
+            elif ch in "}]":
+                self._depth -= 1
+            elif self._depth == 1 and ch == ",":
+                self._expect_key = True
+                self._last_key = None
+            elif self._depth == 1 and ch == ":":
+                self._expect_key = False
+        return "".join(out)
+
+    def _decode_escape(self) -> str:
+        kind = self._escape[1]
+        if kind != "u":
+            return _ESCAPES.get(kind, kind)
+        try:
+            code = int(self._escape[2:], 16)
+        except ValueError:
+            return ""
+        if 0xD800 <= code < 0xDC00:
+            self._high_surrogate = code
+            return ""
+        if 0xDC00 <= code < 0xE000 and self._high_surrogate is not None:
+            code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+        self._high_surrogate = None
+        return chr(code) if not 0xD800 <= code < 0xE000 else ""
+
+    def _string_char(self, text: str, out: List[str]):
+        if self._key is not None:
+            self._key.append(text)
+        elif self._capture:
+            out.append(text)
+
+    def _end_string(self):
+        self._in_string = False
+        if self._key is not None:
+            self._last_key = "".join(self._key)
+            self._key = None
+            self._expect_key = False
+        elif self._capture:
+            self._capture = False
+            self.done = True
+
+
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+")
+_ABBREVIATIONS = {"e.g", "i.e", "etc", "vs", "approx", "mr", "mrs", "ms", "dr"}
+
+
+class SentenceSplitter:
+    """Cut streamed text into sentences; fragments shorter than `min_chars` join the next one."""
+
+    def __init__(self, min_chars: int = SENTENCE_MIN_CHARS):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        self._buffer += text
+        sentences, start = [], 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            candidate = self._buffer[start:match.end()].strip()
+            last_word = candidate.rstrip(".!?\"')] ").rsplit(None, 1)[-1].lower() if candidate else ""
+            if len(candidate) < self.min_chars or last_word in _ABBREVIATIONS:
+                continue
+            sentences.append(candidate)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> List[str]:
+        rest, self._buffer = self._buffer.strip(), ""
+        return [rest] if rest else []
+
+
+class SpeechChannel:
+    """
+    Sentences of one utterance, published by the graph node as they are generated.
+
+    `finish` is given the final text, which covers replies that were not
+    streamed (speculative evaluations, pre-screened answers, canned closings)
+    and replies from a fallback model after the stream failed part-way.
+    """
+
+    def __init__(self, number: int = 0):
+        self.number = number
+        self.producing = False
+        self._cond = threading.Condition()
+        self._splitter = SentenceSplitter()
+        self._streamed: List[str] = []
+        self._sentences: List[str] = []
+        self._closed = False
+
+    def feed(self, delta: str):
+        if not delta:
+            return
+        with self._cond:
+            self._streamed.append(delta)
+            self._sentences.extend(self._splitter.feed(delta))
+            self._cond.notify_all()
+
+    def finish(self, final_text: Optional[str]):
+        with self._cond:
+            streamed = "".join(self._streamed)
+            if final_text and final_text.startswith(streamed):
+                self._sentences.extend(self._splitter.feed(final_text[len(streamed):]))
+            elif final_text and final_text.strip() != streamed.strip():
+                # A fallback model answered after the primary had streamed part of a reply
+                self._restart(final_text)
+            self._sentences.extend(self._splitter.flush())
+            self._closed = True
+            self._cond.notify_all()
+
+    def _restart(self, final_text: str):
+        """
+        Publish `final_text` in place of the streamed text.
+
+        Published sentences may already have been spoken, so the final text
+        is spoken from the first sentence where it differs from them; streamed
+        text not yet cut into a sentence is dropped.
+        """
+        splitter = SentenceSplitter(self._splitter.min_chars)
+        final = splitter.feed(final_text) + splitter.flush()
+        spoken = 0
+        while spoken < min(len(self._sentences), len(final)) and self._sentences[spoken] == final[spoken]:
+            spoken += 1
+        self._splitter = SentenceSplitter(self._splitter.min_chars)
+        self._sentences.extend(final[spoken:])
+        metrics.incr("speech.pipeline.restarts")
+        logger.warning(f"Final text differs from the streamed text; speaking it from sentence {spoken + 1}")
+
+    def fail(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def sentences(self, timeout: float) -> Iterator[str]:
+        """Yield sentences as they are published; TimeoutError if the producer stalls."""
+        index = 0
+        while True:
+            with self._cond:
+                if not self._cond.wait_for(lambda: len(self._sentences) > index or self._closed, timeout):
+                    raise TimeoutError("No speech text produced in time")
+                ready = self._sentences[index:]
+                closed = self._closed
+            index += len(ready)
+            yield from ready
+            if closed and not ready:
+                return
+
+
+def field_feeder(channel: SpeechChannel, field: str) -> Callable[[str], None]:
+    """Callback for streamed JSON output that publishes `field`'s text to the channel."""
+    extractor = JsonFieldStream(field)
+    return lambda delta: channel.feed(extractor.feed(delta))
+
+
+class SpeechChannels:
+    """
+    Per-session utterance channels, keyed by kind ("feedback", "closing").
+
+    The node producing an utterance and the request streaming it can arrive
+    in either order: whichever comes first creates the channel for that
+    utterance `number` (the question number for feedback), the other one
+    joins it. A newer utterance of the same kind replaces an older one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels: Dict[Tuple[str, str], SpeechChannel] = {}
+
+    def open(self, session_id: str, kind: str, number: int = 0) -> SpeechChannel:
+        """Channel for the node about to generate an utterance."""
+        with self._lock:
+            channel = self._channels.get((session_id, kind))
+            if channel is None or channel.producing or channel.number != number:
+                channel = SpeechChannel(number)
+                self._channels[(session_id, kind)] = channel
+            channel.producing = True
+            return channel
+
+    def attach(self, session_id: str, kind: str, number: int = 0) -> Optional[SpeechChannel]:
+        """Channel for a listener; None if a newer utterance has already replaced it."""
+        with self._lock:
+            channel = self._channels.get((session_id, kind))
+            if channel is not None and channel.number > number:
+                return None
+            if channel is None or channel.number < number:
+                channel = SpeechChannel(number)
+                self._channels[(session_id, kind)] = channel
+            return channel
+
+    def release(self, session_id: str, kind: str, channel: SpeechChannel):
+        with self._lock:
+            if self._channels.get((session_id, kind)) is channel:
+                del self._channels[(session_id, kind)]
+
+    def discard(self, session_id: str):
+        with self._lock:
+            for key in [k for k in self._channels if k[0] == session_id]:
+                self._channels.pop(key).fail()
+
+
+speech_channels = SpeechChannels()
+
+_executor = ThreadPoolExecutor(max_workers=TTS_PIPELINE_WORKERS, thread_name_prefix="tts-pipeline")
+
+WAV_HEADER_BYTES = 44
+
+
+def pipelined_speech(sentences: Iterable[str], engine, audio_format: str,
+                     lookahead: int = TTS_PIPELINE_LOOKAHEAD) -> Iterator[bytes]:
+    """
+    Synthesize sentences as they arrive and yield the audio in sentence order.
+
+    Up to `lookahead` sentences are synthesized ahead of the one being sent.
+    Ogg and MP3 segments are concatenated as they are (chained Ogg streams,
+    MP3 frames); for WAV a single streaming header is sent and each segment's
+    own header is dropped.
+    """
+    from backend.tts.tts_engine import wav_header
+
+    segments: "queue.Queue" = queue.Queue()  # One chunk queue per sentence, in order; None at the end
+    slots = threading.Semaphore(lookahead)
+    stopped = threading.Event()
+
+    def synthesize(sentence: str, out: "queue.Queue"):
+        try:
+            for chunk in engine.stream(sentence, audio_format):
+                if stopped.is_set():
+                    break
+                out.put(chunk)
+        except Exception as e:
+            out.put(e)
+        finally:
+            out.put(None)
+
+    def feed():
+        try:
+            for sentence in sentences:
+                slots.acquire()
+                if stopped.is_set():
+                    return
+                out = queue.Queue()
+                segments.put(out)
+                _executor.submit(synthesize, sentence, out)
+                metrics.incr("speech.pipeline.sentences")
+        except Exception as e:
+            segments.put(e)
+        finally:
+            segments.put(None)
+
+    threading.Thread(target=feed, name="tts-pipeline-feed", daemon=True).start()
+
+    start = time.perf_counter()
+    first_segment = True
+    try:
+        while True:
+            out = segments.get()
+            if out is None:
+                return
+            if isinstance(out, Exception):
+                raise out
+            skip = WAV_HEADER_BYTES if audio_format == "wav" else 0
+            while True:
+                chunk = out.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+                if skip:
+                    if first_segment and len(chunk) >= 28:
+                        # Same sample rate as the engine, with an open-ended data size
+                        yield wav_header(struct.unpack("<I", chunk[24:28])[0])
+                    dropped = min(skip, len(chunk))
+                    chunk, skip = chunk[dropped:], skip - dropped
+                    if not chunk:
+                        continue
+                if first_segment:
+                    metrics.observe("speech.pipeline.first_audio_ms", (time.perf_counter() - start) * 1000)
+                    first_segment = False
+                yield chunk
+            first_segment = False
+            slots.release()
+    finally:
+        stopped.set()
+        slots.release()  # Unblock the feeder if the listener went away
@@ -1,9 +1,26 @@
-import azure.cognitiveservices.speech as speechsdk
+"""
+Text-to-speech engines with output format negotiation and chunked output.
+
+Azure synthesizes Opus/OGG, MP3 or WAV natively and streams audio as it is
+produced. Offline engines produce PCM that is encoded locally with ffmpeg.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional
 import os
-from io import BytesIO
+import shutil
+import struct
+import subprocess
+import threading
+import time
 
 from dotenv import load_dotenv
-from backend.config import DEFAULT_TTS_VOICE
+from backend.config import DEFAULT_TTS_VOICE, DEFAULT_AUDIO_FORMAT, TTS_ENGINE, TTS_CHUNK_BYTES
+
+try:
+    import azure.cognitiveservices.speech as speechsdk
+except ImportError:  # Only needed for the Azure engine
+    speechsdk = None
 
 load_dotenv()
 
@@ -18,48 +35,262 @@ if not AZURE_SPEECH_KEY:
     print("WARNING: AZURE_SPEECH_KEY not set. TTS will fail.")
     print("Set it with: $env:AZURE_SPEECH_KEY='your_key_here' (PowerShell)")
 
+# format → media type, Azure output format, ffmpeg encoder args, nominal bytes/second
+AUDIO_FORMATS = {
+    "ogg": {
+        "media_type": "audio/ogg",
+        "azure": "Ogg24Khz16BitMonoOpus",
+        "ffmpeg": ["-c:a", "libopus", "-b:a", "24k", "-f", "ogg"],
+        "bytes_per_second": 3000,
+    },
+    "mp3": {
+        "media_type": "audio/mpeg",
+        "azure": "Audio24Khz48KBitRateMonoMp3",
+        "ffmpeg": ["-c:a", "libmp3lame", "-b:a", "48k", "-f", "mp3"],
+        "bytes_per_second": 6000,
+    },
+    "wav": {
+        "media_type": "audio/wav",
+        "azure": "Riff24Khz16BitMonoPcm",
+        "ffmpeg": None,
+        "bytes_per_second": 48000,
+    },
+}
+_MEDIA_TYPES = {
+    "audio/ogg": "ogg",
+    "audio/opus": "ogg",
+    "audio/mpeg": "mp3",
+    "audio/mp3": "mp3",
+    "audio/wav": "wav",
+    "audio/x-wav": "wav",
+    "audio/wave": "wav",
+}
+
 
-def synthesize_speech(text: str) -> bytes:
+def negotiate_audio_format(accept: Optional[str], requested: Optional[str] = None) -> str:
     """
-    Convert text to natural-sounding interviewer speech using Azure AI Speech.
-    Returns WAV audio bytes.
+    Pick an output format from an explicit request or an Accept header.
+
+    Explicit `requested` wins; otherwise the highest-q supported media type,
+    with DEFAULT_AUDIO_FORMAT for wildcards or a missing header.
     """
-    if not text or not text.strip():
-        raise ValueError("Empty text passed to TTS")
-    
-    if not AZURE_SPEECH_KEY:
-        raise ValueError(
-            "Azure Speech API key not configured. "
-            "Set AZURE_SPEECH_KEY environment variable."
-        )
+    if requested:
+        requested = requested.lower()
+        if requested not in AUDIO_FORMATS:
+            raise ValueError(f"Unsupported audio format '{requested}'. Must be one of: {list(AUDIO_FORMATS)}")
+        return requested
+
+    best, best_q = None, 0.0
+    for part in (accept or "").split(","):
+        fields = [f.strip() for f in part.split(";")]
+        media = fields[0].lower()
+        q = 1.0
+        for param in fields[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        fmt = _MEDIA_TYPES.get(media) or (DEFAULT_AUDIO_FORMAT if media in ("*/*", "audio/*") else None)
+        if fmt and q > best_q:
+            best, best_q = fmt, q
+    return best or DEFAULT_AUDIO_FORMAT
 
-    # Configure Azure Speech
-    speech_config = speechsdk.SpeechConfig(
-        subscription=AZURE_SPEECH_KEY,
-        region=AZURE_SPEECH_REGION
+
+def wav_header(sample_rate: int, data_bytes: int = 0xFFFFFFFF - 36) -> bytes:
+    """RIFF header for 16-bit mono PCM (streaming size placeholder by default)."""
+    return (
+        b"RIFF" + struct.pack("<I", (data_bytes + 36) & 0xFFFFFFFF) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16)
+        + b"data" + struct.pack("<I", data_bytes & 0xFFFFFFFF)
     )
-    
-    # Set voice and audio format
-    speech_config.speech_synthesis_voice_name = INTERVIEWER_VOICE
-    
-    # Create synthesizer without audio output (we'll get audio data directly from result)
-    speech_synthesizer = speechsdk.SpeechSynthesizer(
-        speech_config=speech_config,
-        audio_config=None  # None means we get the audio data in the result
+
+
+def encode_pcm_stream(pcm_chunks: Iterator[bytes], sample_rate: int, audio_format: str,
+                      chunk_size: int = TTS_CHUNK_BYTES) -> Iterator[bytes]:
+    """Encode 16-bit mono PCM chunks with a local ffmpeg, yielding encoded chunks as they appear."""
+    args = AUDIO_FORMATS[audio_format]["ffmpeg"]
+    if args is None:
+        yield wav_header(sample_rate)
+        yield from pcm_chunks
+        return
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        raise RuntimeError(f"ffmpeg is required to encode '{audio_format}' audio locally")
+
+    proc = subprocess.Popen(
+        [ffmpeg, "-loglevel", "error", "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0", *args, "pipe:1"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
     )
-    
-    # Synthesize speech
-    result = speech_synthesizer.speak_text_async(text).get()
-    
-    # Check result
-    if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
-        # Return audio data as bytes
-        return result.audio_data
-    elif result.reason == speechsdk.ResultReason.Canceled:
-        cancellation = result.cancellation_details
-        error_msg = f"Speech synthesis canceled: {cancellation.reason}"
-        if cancellation.reason == speechsdk.CancellationReason.Error:
-            error_msg += f" Error details: {cancellation.error_details}"
-        raise RuntimeError(error_msg)
-    else:
-        raise RuntimeError(f"Speech synthesis failed with reason: {result.reason}")
+
+    def feed():
+        try:
+            for chunk in pcm_chunks:
+                proc.stdin.write(chunk)
+        finally:
+            proc.stdin.close()
+
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+    try:
+        while True:
+            data = proc.stdout.read1(chunk_size)
+            if not data:
+                break
+            yield data
+    finally:
+        feeder.join()
+        proc.wait()
+
+
+class TTSEngine(ABC):
+    """Synthesizes text to audio in one of AUDIO_FORMATS."""
+
+    name = "base"
+
+    @abstractmethod
+    def stream(self, text: str, audio_format: str = DEFAULT_AUDIO_FORMAT,
+               chunk_size: int = TTS_CHUNK_BYTES) -> Iterator[bytes]:
+        """Yield encoded audio chunks as soon as they are available."""
+
+    def synthesize(self, text: str, audio_format: str = DEFAULT_AUDIO_FORMAT) -> bytes:
+        return b"".join(self.stream(text, audio_format))
+
+
+class AzureTTSEngine(TTSEngine):
+    """Azure AI Speech with native compressed output formats."""
+
+    name = "azure"
+
+    def stream(self, text, audio_format=DEFAULT_AUDIO_FORMAT, chunk_size=TTS_CHUNK_BYTES):
+        if not text or not text.strip():
+            raise ValueError("Empty text passed to TTS")
+        if speechsdk is None:
+            raise RuntimeError("azure-cognitiveservices-speech is not installed")
+        if not AZURE_SPEECH_KEY:
+            raise ValueError(
+                "Azure Speech API key not configured. "
+                "Set AZURE_SPEECH_KEY environment variable."
+            )
+
+        speech_config = speechsdk.SpeechConfig(subscription=AZURE_SPEECH_KEY, region=AZURE_SPEECH_REGION)
+        speech_config.speech_synthesis_voice_name = INTERVIEWER_VOICE
+        speech_config.set_speech_synthesis_output_format(
+            getattr(speechsdk.SpeechSynthesisOutputFormat, AUDIO_FORMATS[audio_format]["azure"])
+        )
+        # No audio output device: audio is read from the result stream
+        synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config, audio_config=None)
+
+        # start_speaking returns once synthesis has started, so the first chunk
+        # can be sent while the rest is still being generated
+        result = synthesizer.start_speaking_text_async(text).get()
+        audio_stream = speechsdk.AudioDataStream(result)
+        buffer = bytes(chunk_size)
+        while True:
+            filled = audio_stream.read_data(buffer)
+            if filled == 0:
+                break
+            yield buffer[:filled]
+
+        if audio_stream.status == speechsdk.StreamStatus.Canceled:
+            cancellation = audio_stream.cancellation_details
+            error_msg = f"Speech synthesis canceled: {cancellation.reason}"
+            if cancellation.reason == speechsdk.CancellationReason.Error:
+                error_msg += f" Error details: {cancellation.error_details}"
+            raise RuntimeError(error_msg)
+
+
+class CoquiTTSEngine(TTSEngine):
+    """Offline Coqui TTS on CPU; PCM output is encoded locally with ffmpeg."""
+
+    name = "coqui"
+
+    def __init__(self, model_name: str = "tts_models/en/ljspeech/tacotron2-DDC"):
+        from TTS.api import TTS
+
+        self._tts = TTS(model_name=model_name, gpu=False)
+        self._sample_rate = self._tts.synthesizer.output_sample_rate
+
+    def stream(self, text, audio_format=DEFAULT_AUDIO_FORMAT, chunk_size=TTS_CHUNK_BYTES):
+        if not text or not text.strip():
+            raise ValueError("Empty text passed to TTS")
+        samples = self._tts.tts(text=text)
+        pcm = b"".join(struct.pack("<h", int(max(-1.0, min(1.0, s)) * 32767)) for s in samples)
+        chunks = (pcm[i:i + chunk_size] for i in range(0, len(pcm), chunk_size))
+        yield from encode_pcm_stream(chunks, self._sample_rate, audio_format, chunk_size)
+
+
+class FakeTTSEngine(TTSEngine):
+    """
+    Timing- and size-faithful stand-in for tests and benchmarks.
+
+    Audio lasts about `words_per_second` per word; output is emitted at
+    `realtime_factor` times real time after `first_chunk_ms`, with the
+    nominal byte rate of the requested format. Bytes are silence, not audio.
+    """
+
+    name = "fake"
+
+    def __init__(self, first_chunk_ms: float = 150.0, realtime_factor: float = 10.0, words_per_second: float = 2.5):
+        self.first_chunk_ms = first_chunk_ms
+        self.realtime_factor = realtime_factor
+        self.words_per_second = words_per_second
+
+    def duration(self, text: str) -> float:
+        return max(len(text.split()), 1) / self.words_per_second
+
+    def stream(self, text, audio_format=DEFAULT_AUDIO_FORMAT, chunk_size=TTS_CHUNK_BYTES):
+        if not text or not text.strip():
+            raise ValueError("Empty text passed to TTS")
+        rate = AUDIO_FORMATS[audio_format]["bytes_per_second"]
+        total = int(self.duration(text) * rate)
+        time.sleep(self.first_chunk_ms / 1000)
+        if audio_format == "wav":
+            yield wav_header(24000, total)
+        # Engines emit roughly every 100 ms of audio regardless of bitrate
+        step = min(chunk_size, max(rate // 10, 1))
+        sent = 0
+        while sent < total:
+            n = min(step, total - sent)
+            time.sleep(n / rate / self.realtime_factor)
+            sent += n
+            yield bytes(n)
+
+
+ENGINES = {
+    "azure": AzureTTSEngine,
+    "coqui": CoquiTTSEngine,
+    "fake": FakeTTSEngine,
+}
+
+_default_engine: Optional[TTSEngine] = None
+
+
+def create_tts_engine(name: Optional[str] = None) -> TTSEngine:
+    """Instantiate the engine selected by `name` or the TTS_ENGINE setting."""
+    name = (name or TTS_ENGINE).lower()
+    if name not in ENGINES:
+        raise ValueError(f"Unknown TTS engine '{name}'. Must be one of: {list(ENGINES)}")
+    return ENGINES[name]()
+
+
+def get_tts_engine() -> TTSEngine:
+    """Shared engine instance, created on first use."""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = create_tts_engine()
+    return _default_engine
+
+
+def synthesize_speech(text: str, audio_format: str = "wav") -> bytes:
+    """
+    Convert text to natural-sounding interviewer speech.
+    Returns the complete audio in `audio_format` (WAV by default).
+    """
+    return get_tts_engine().synthesize(text, audio_format)
+
+
+def synthesize_speech_stream(text: str, audio_format: str = DEFAULT_AUDIO_FORMAT) -> Iterator[bytes]:
+    """Yield interviewer speech in chunks so playback can start on the first one."""
+    return get_tts_engine().stream(text, audio_format)
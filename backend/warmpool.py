@@ -0,0 +1,190 @@
+"""
+Warm pool of interview threads already advanced to their first question.
+
+`/interview/start` otherwise blocks on question generation. For popular
+(role, experience, persona) combinations, a background filler keeps a few
+graph threads parked at the first `await_answer` interrupt; starting an
+interview claims one atomically and returns its question immediately.
+
+Pool size per combination follows observed demand: starts over the last
+WARM_POOL_DEMAND_WINDOW seconds, scaled to cover WARM_POOL_LEAD_SECONDS of
+arrivals, capped per key and overall. Entries older than WARM_POOL_TTL_SECONDS
+are discarded so questions don't go stale. A miss falls back to live
+generation.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Dict, NamedTuple, Optional, Tuple
+from backend.metrics import metrics
+from backend.degrade import degradation
+import logging
+import math
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, str, str]  # (role, experience, persona), normalized
+
+FILL_INTERVAL_SECONDS = 1.0
+
+
+class WarmEntry(NamedTuple):
+    thread_id: str
+    question: str
+    created_at: float
+
+
+def pool_key(role: str, experience: str, persona: str) -> PoolKey:
+    return (" ".join(role.split()).casefold(), " ".join(experience.split()).casefold(), persona)
+
+
+class WarmPool:
+    """
+    Demand-sized pools of pre-started interview threads.
+
+    `fill(role, experience, persona)` starts a thread and returns
+    (thread_id, question); `discard(persona, thread_id)` drops an expired one.
+    """
+
+    def __init__(
+        self,
+        fill: Callable[[str, str, str], Tuple[str, str]],
+        discard: Callable[[str, str], None],
+        max_per_key: int,
+        max_total: int,
+        ttl_seconds: float,
+        demand_window: float,
+        lead_seconds: float,
+        min_demand: int = 2,
+        workers: int = 2,
+        enabled: bool = True,
+    ):
+        self.fill = fill
+        self.discard = discard
+        self.max_per_key = max_per_key
+        self.max_total = max_total
+        self.ttl_seconds = ttl_seconds
+        self.demand_window = demand_window
+        self.lead_seconds = lead_seconds
+        self.min_demand = min_demand
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._entries: Dict[PoolKey, Deque[WarmEntry]] = {}
+        self._demand: Dict[PoolKey, Deque[float]] = {}
+        self._labels: Dict[PoolKey, Tuple[str, str]] = {}  # Role/experience as last requested
+        self._filling: Dict[PoolKey, int] = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="warm-pool")
+        self._thread = None
+        if enabled:
+            self._thread = threading.Thread(target=self._run, name="warm-pool", daemon=True)
+            self._thread.start()
+
+    # ----- request path -----
+
+    def claim(self, role: str, experience: str, persona: str) -> Optional[WarmEntry]:
+        """Record demand for the combination and take its oldest fresh entry, if any."""
+        if not self.enabled:
+            return None
+        key = pool_key(role, experience, persona)
+        now = time.monotonic()
+        with self._lock:
+            self._demand.setdefault(key, deque()).append(now)
+            self._labels[key] = (role.strip(), experience.strip())
+            entries = self._entries.get(key)
+            while entries:
+                entry = entries.popleft()
+                if now - entry.created_at < self.ttl_seconds:
+                    metrics.incr("warm_pool.hits")
+                    return entry
+                self._expire(persona, entry)
+        metrics.incr("warm_pool.misses")
+        return None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            hits = metrics.counter("warm_pool.hits")
+            misses = metrics.counter("warm_pool.misses")
+            return {
+                "enabled": self.enabled,
+                "ready": sum(len(e) for e in self._entries.values()),
+                "filling": sum(self._filling.values()),
+                "keys": {
+                    " / ".join(key): {"ready": len(self._entries.get(key, ())), "target": self._target(key)}
+                    for key in self._demand
+                },
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            }
+
+    # ----- background filler -----
+
+    def _target(self, key: PoolKey) -> int:
+        """Entries to keep ready: expected arrivals over the lead time, for keys with enough demand."""
+        starts = len(self._demand.get(key, ()))
+        if starts < self.min_demand:
+            return 0
+        expected = starts / self.demand_window * self.lead_seconds
+        return min(self.max_per_key, max(1, math.ceil(expected)))
+
+    def _expire(self, persona: str, entry: WarmEntry):
+        metrics.incr("warm_pool.expired")
+        self._executor.submit(self.discard, persona, entry.thread_id)
+
+    def _run(self):
+        while True:
+            time.sleep(FILL_INTERVAL_SECONDS)
+            try:
+                self._tick(time.monotonic())
+            except Exception as e:
+                logger.error(f"Warm pool maintenance failed: {e}")
+
+    def _tick(self, now: float):
+        # Pre-starting interviews is optional work: pause it while anything is being shed
+        paused = degradation.level > 0
+        jobs = []
+        with self._lock:
+            for key in list(self._demand):
+                demand = self._demand[key]
+                while demand and now - demand[0] > self.demand_window:
+                    demand.popleft()
+                entries = self._entries.setdefault(key, deque())
+                while entries and now - entries[0].created_at >= self.ttl_seconds:
+                    self._expire(key[2], entries.popleft())
+                if not demand and not entries and not self._filling.get(key):
+                    # Idle combination: forget it
+                    del self._demand[key]
+                    self._entries.pop(key, None)
+                    self._labels.pop(key, None)
+
+            if paused:
+                return
+            total = sum(len(e) for e in self._entries.values()) + sum(self._filling.values())
+            for key in list(self._demand):
+                missing = self._target(key) - len(self._entries.get(key, ())) - self._filling.get(key, 0)
+                for _ in range(max(0, min(missing, self.max_total - total))):
+                    self._filling[key] = self._filling.get(key, 0) + 1
+                    total += 1
+                    jobs.append(key)
+
+        for key in jobs:
+            self._executor.submit(self._fill_one, key)
+
+    def _fill_one(self, key: PoolKey):
+        role, experience = self._labels.get(key, key[:2])
+        entry = None
+        try:
+            thread_id, question = self.fill(role, experience, key[2])
+            entry = WarmEntry(thread_id, question, time.monotonic())
+            metrics.incr("warm_pool.filled")
+        except Exception as e:
+            metrics.incr("warm_pool.fill_errors")
+            logger.warning(f"Warm pool fill failed for {key}: {e}")
+        # One critical section, so the key can't be dropped as idle in between
+        with self._lock:
+            self._filling[key] -= 1
+            if entry is not None:
+                self._entries.setdefault(key, deque()).append(entry)
@@ -1,5 +1,6 @@
 // API Client for Backend Communication
-const API_BASE_URL = 'http://localhost:8000';
+// Same origin as the page; set window.API_BASE_URL to target another backend
+const API_BASE_URL = window.API_BASE_URL || '';
 
 export const api = {
     // Start a new interview session
@@ -55,7 +56,10 @@ export const api = {
     // Health check
     async healthCheck() {
         try {
-            const response = await fetch(`${API_BASE_URL}/`);
+            const response = await fetch(`${API_BASE_URL}/health`);
+            if (!response.ok) {
+                return null;
+            }
             return await response.json();
         } catch (error) {
             console.error('Health check failed:', error);
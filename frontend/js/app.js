@@ -665,7 +665,7 @@ document.addEventListener('DOMContentLoaded', async () => {
         } else {
             appState.backendAvailable = false;
             console.error('❌ Backend not available');
-            alert('Warning: Backend not connected. Please ensure backend is running on http://localhost:8000');
+            alert('Warning: Backend not connected. Please ensure the backend is running.');
         }
     } catch (error) {
         appState.backendAvailable = false;
@@ -0,0 +1,51 @@
+// Post-build step: write brotli (.br) and gzip (.gz) siblings for text assets in dist/
+// so the backend can serve them precompressed without compressing per request.
+import { readdirSync, readFileSync, statSync, writeFileSync } from 'node:fs';
+import { extname, join, relative } from 'node:path';
+import { fileURLToPath } from 'node:url';
+import { brotliCompressSync, constants, gzipSync } from 'node:zlib';
+
+const DIST_DIR = fileURLToPath(new URL('../dist/', import.meta.url));
+const COMPRESSIBLE = new Set(['.html', '.js', '.mjs', '.css', '.json', '.svg', '.txt', '.xml', '.map', '.wasm', '.ico']);
+const MIN_BYTES = 1024; // Smaller files are not worth the extra request header work
+
+function* walk(dir) {
+    for (const name of readdirSync(dir)) {
+        const path = join(dir, name);
+        if (statSync(path).isDirectory()) {
+            yield* walk(path);
+        } else {
+            yield path;
+        }
+    }
+}
+
+let original = 0;
+let brotli = 0;
+let gzip = 0;
+
+for (const file of walk(DIST_DIR)) {
+    if (!COMPRESSIBLE.has(extname(file))) continue;
+    const data = readFileSync(file);
+    if (data.length < MIN_BYTES) continue;
+
+    const br = brotliCompressSync(data, {
+        params: {
+            [constants.BROTLI_PARAM_QUALITY]: constants.BROTLI_MAX_QUALITY,
+            [constants.BROTLI_PARAM_SIZE_HINT]: data.length,
+        },
+    });
+    const gz = gzipSync(data, { level: constants.Z_BEST_COMPRESSION });
+
+    // Only keep variants that are actually smaller
+    if (br.length < data.length) writeFileSync(`${file}.br`, br);
+    if (gz.length < data.length) writeFileSync(`${file}.gz`, gz);
+
+    original += data.length;
+    brotli += Math.min(br.length, data.length);
+    gzip += Math.min(gz.length, data.length);
+    console.log(`${relative(DIST_DIR, file)}: ${data.length} -> br ${br.length}, gz ${gz.length}`);
+}
+
+const kb = (n) => (n / 1024).toFixed(1);
+console.log(`Precompressed ${kb(original)} KB -> br ${kb(brotli)} KB, gz ${kb(gzip)} KB`);
@@ -1,5 +1,6 @@
 // API Client for Backend Communication
-const API_BASE_URL = 'http://localhost:8000';
+// Same origin by default (served by the backend, or proxied by the Vite dev server)
+const API_BASE_URL = import.meta.env.VITE_API_URL || '';
 
 export const api = {
     // Start a new interview session
@@ -129,7 +130,10 @@ export const api = {
     // Health check
     async healthCheck() {
         try {
-            const response = await fetch(`${API_BASE_URL}/`);
+            const response = await fetch(`${API_BASE_URL}/health`);
+            if (!response.ok) {
+                return null;
+            }
             return await response.json();
         } catch (error) {
             console.error('Health check failed:', error);
@@ -14,7 +14,7 @@ async function getAzureSpeechToken() {
     }
 
     try {
-        const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+        const API_BASE_URL = import.meta.env.VITE_API_URL || '';
         const response = await fetch(`${API_BASE_URL}/speech/token`);
         
         if (!response.ok) {
@@ -1,6 +1,19 @@
 import { defineConfig } from 'vite'
 import react from '@vitejs/plugin-react'
 
+// Backend routes proxied in dev so the app always talks to its own origin
+const BACKEND_URL = process.env.VITE_BACKEND_URL || 'http://localhost:8000'
+const BACKEND_ROUTES = ['/interview', '/speech', '/analytics', '/metrics', '/health']
+
 export default defineConfig({
   plugins: [react()],
+  server: {
+    proxy: Object.fromEntries(
+      BACKEND_ROUTES.map((route) => [route, { target: BACKEND_URL, ws: true }])
+    ),
+  },
+  build: {
+    // Lets the backend send preload Link headers for the entry chunks
+    manifest: true,
+  },
 })